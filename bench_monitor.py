@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the DesoMonitor hot paths, run against a local mock node.
+
+Cases: one post_measurement call, a full measurement cycle over N nodes,
+load_measurements / save_measurements at 1k, 100k and 1M stored samples,
+on-chain comment ingestion, the comment parse on its own, each
+matplotlib render inline, and the whole daily chart set in the render pool. Every case runs in a fresh subprocess so peak RSS is
+per case; the mock node (mock_deso_node.py) runs in this process and its
+request counters are reset around each timed region.
+
+    python bench_monitor.py --output bench_results.json
+    python bench_monitor.py --baseline bench_results.json   # compare against an earlier run
+
+Results are JSON: wall and CPU seconds, peak RSS, and requests per endpoint.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import requests
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from mock_deso_node import start_mock_node, make_handler, measurement_body, DEFAULT_PUBLIC_KEY, TIMESTAMP_FORMAT
+
+CONFIG_POST_HASH = "bench-config"
+STORE_SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+CASES = ["post_measurement", "measurement_cycle"] + [f"store_{label}" for label in STORE_SIZES] + \
+        ["ingest_onchain", "parse_comments", "render_daily_graph", "render_gauge", "render_daily_charts"]
+
+
+# --- Resource accounting (child side) ---
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class Timer:
+    """Times one region and collects the mock node's request counters for it."""
+
+    def __init__(self, mock_url):
+        self.mock_url = mock_url
+        self.results = []
+
+    def measure(self, name, fn):
+        requests.post(f"{self.mock_url}/mock/reset")
+        rss_before = current_rss_mb()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        value = fn()
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+        stats = requests.get(f"{self.mock_url}/mock/stats").json()
+        self.results.append({
+            "case": name,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "rss_before_mb": rss_before,
+            "peak_rss_mb": peak_rss_mb(),
+            "requests": stats["total_requests"],
+            "requests_by_endpoint": stats["requests"],
+        })
+        return value
+
+
+# --- Cases (child side, inside a scratch working directory) ---
+
+def run_child(case, args):
+    import deso_monitor as dm
+    timer = Timer(args.mock_url)
+
+    if case == "post_measurement":
+        timer.measure(case, lambda: dm.post_measurement(dm.NODES[0], args.parent_hash))
+    elif case == "measurement_cycle":
+        timer.measure(f"{case}_{len(dm.NODES)}_nodes", lambda: dm.run_measurement_cycle(list(dm.NODES), args.parent_hash, 1))
+    elif case.startswith("store_"):
+        label = case.split("_", 1)[1]
+        dm.store = dm.open_measurement_store(dm.MEASUREMENT_BACKEND, args.journal, "bench_measurements.db",
+                                             dm.JOURNAL_BATCH_SIZE, dm.JOURNAL_FLUSH_INTERVAL)
+        loaded = timer.measure(f"load_measurements_{label}", dm.load_measurements)
+        dm.measurements = loaded
+        timer.measure(f"save_measurements_{label}", lambda: dm.save_measurements(force_compact=True))
+    elif case == "ingest_onchain":
+        dm.comment_cache = dm.CommentCache()
+        timer.measure(case, lambda: dm.load_onchain_dataset(dm.GRAPH_DAYS))
+    elif case == "parse_comments":
+        from measurement_parser import parse_comments
+        now = datetime.datetime.utcnow()
+        bodies = [measurement_body(dm.NODES[i % len(dm.NODES)],
+                                   (now - datetime.timedelta(seconds=i)).strftime(TIMESTAMP_FORMAT),
+                                   0.5, 2.5, dm.POST_TAG)
+                  for i in range(args.parse_count)]
+        timer.measure(f"{case}_{args.parse_count}", lambda: parse_comments(bodies))
+    elif case in ("render_daily_graph", "render_gauge"):
+        dataset = dm.load_onchain_dataset(dm.GRAPH_DAYS)
+        jobs = dm.daily_graph_jobs(dataset) if case == "render_daily_graph" else dm.gauge_jobs(dataset)
+        # One result per image, rendered inline (figure build + savefig)
+        for func, render_args in jobs:
+            fname = render_args[0]
+            timer.measure(f"render_{os.path.splitext(os.path.basename(fname))[0]}", lambda: func(*render_args))
+            timer.results[-1]["bytes"] = os.path.getsize(fname) if os.path.exists(fname) else None
+    elif case == "render_daily_charts":
+        dataset = dm.load_onchain_dataset(dm.GRAPH_DAYS)
+        dm.render_pool.warm()
+        timer.measure(f"{case}_{dm.RENDER_WORKERS}_workers", lambda: dm.generate_daily_charts(dataset))
+    else:
+        raise ValueError(f"Unknown case: {case}")
+
+    with open(args.result_file, "w", encoding="utf-8") as f:
+        json.dump(timer.results, f)
+
+
+# --- Orchestration (parent side) ---
+
+def prepare_journal(path, nodes, samples, graph_days):
+    """Write `samples` measurements spread over the last graph_days into a fresh journal."""
+    from measurement_store import MeasurementJournal
+    journal = MeasurementJournal(path, batch_size=10_000, flush_interval=3600)
+    end = time.time()
+    step = graph_days * 86400 * 0.95 / samples
+    for i in range(samples):
+        timestamp = time.strftime(TIMESTAMP_FORMAT, time.gmtime(end - i * step))
+        journal.append(nodes[i % len(nodes)], timestamp, {"post": 0.4, "confirm": 2.1, "confirm_err": 0.1, "total": 2.5})
+    journal.flush()
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["case"]: r for r in json.load(f)["results"]}
+    print(f"\n{'case':<40} {'wall':>10} {'Δwall':>8} {'cpu':>10} {'Δcpu':>8} {'peak MB':>9}")
+    for r in results:
+        old = baseline.get(r["case"])
+
+        def delta(key):
+            if not old or not old.get(key):
+                return "-"
+            return f"{(r[key] - old[key]) / old[key] * 100:+.0f}%"
+
+        peak = f"{r['peak_rss_mb']:.0f}" if r.get("peak_rss_mb") else "-"
+        print(f"{r['case']:<40} {r['wall_s']:>9.3f}s {delta('wall_s'):>8} {r['cpu_s']:>9.3f}s {delta('cpu_s'):>8} {peak:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DesoMonitor hot paths against a local mock node")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--nodes", type=int, default=8, help="nodes probed in the measurement cycle")
+    parser.add_argument("--graph-days", type=int, default=7)
+    parser.add_argument("--schedule-interval", type=int, default=600)
+    parser.add_argument("--parse-count", type=int, default=50_000, help="comment bodies for parse_comments")
+    parser.add_argument("--backend", choices=("journal", "sqlite"), default="journal", help="MEASUREMENT_BACKEND")
+    parser.add_argument("--latency", default="lognormal:0.03:0.4", help="mock per-request delay spec")
+    parser.add_argument("--commit-delay", default="uniform:0.5:1.5", help="mock submit-to-commit delay spec")
+    parser.add_argument("--legacy-comments", action="store_true",
+                        help="seed on-chain history without structured PostExtraData (body parsing only)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    # Internal: run one case in this process
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--mock-url", help=argparse.SUPPRESS)
+    parser.add_argument("--parent-hash", help=argparse.SUPPRESS)
+    parser.add_argument("--journal", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args)
+        return
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    node, server, mock_url = start_mock_node(latency=args.latency, commit_delay=args.commit_delay, seed=1)
+    # One listening port per monitored node, all backed by the same chain state
+    servers = [server]
+    node_urls = [mock_url]
+    for _ in range(args.nodes - 1):
+        extra = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(node))
+        extra.daemon_threads = True
+        threading.Thread(target=extra.serve_forever, daemon=True).start()
+        servers.append(extra)
+        node_urls.append(f"http://127.0.0.1:{extra.server_address[1]}")
+    config = {"NODES": node_urls, "SCHEDULE_INTERVAL": args.schedule_interval, "GRAPH_DAYS": args.graph_days}
+    node.set_config(config, CONFIG_POST_HASH)
+    node.seed_history(node_urls, args.graph_days, len(node_urls) * int(86400 / args.schedule_interval),
+                      legacy=args.legacy_comments)
+    parent_hash = node.top_level[DEFAULT_PUBLIC_KEY][-1]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="desomonitor-bench-") as scratch:
+        for case in cases:
+            workdir = os.path.join(scratch, case)
+            os.makedirs(workdir)
+            journal = os.path.join(workdir, "bench_journal.jsonl")
+            if case.startswith("store_"):
+                samples = STORE_SIZES[case.split("_", 1)[1]]
+                print(f"📝 Preparing journal with {samples} samples...")
+                prepare_journal(journal, node_urls, samples, args.graph_days)
+            env = dict(
+                os.environ,
+                DESO_SEED_HEX=os.urandom(32).hex(),
+                DESO_PUBLIC_KEY=DEFAULT_PUBLIC_KEY,
+                DESO_API_NODE=mock_url,
+                DESO_NODES=",".join(node_urls),
+                CONFIG_POST_HASH=CONFIG_POST_HASH,
+                MEASUREMENT_BACKEND=args.backend,
+                MPLBACKEND="Agg",
+            )
+            result_file = os.path.join(workdir, "result.json")
+            cmd = [sys.executable, os.path.abspath(__file__), "--child", case, "--mock-url", mock_url,
+                   "--parent-hash", parent_hash, "--journal", journal, "--result-file", result_file,
+                   "--parse-count", str(args.parse_count)]
+            print(f"⏱️ Running {case}...")
+            proc = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True)
+            if proc.returncode != 0 or not os.path.exists(result_file):
+                print(f"❌ {case} failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+                continue
+            with open(result_file, "r", encoding="utf-8") as f:
+                for r in json.load(f):
+                    results.append(r)
+                    print(f"   {r['case']}: wall {r['wall_s']:.3f}s, cpu {r['cpu_s']:.3f}s, "
+                          f"peak RSS {r['peak_rss_mb'] or 0:.0f} MB, {r['requests']} requests")
+
+    for s in servers:
+        s.shutdown()
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": datetime.datetime.utcnow().strftime(TIMESTAMP_FORMAT),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "nodes": args.nodes,
+            "graph_days": args.graph_days,
+            "schedule_interval": args.schedule_interval,
+            "backend": args.backend,
+            "latency": args.latency,
+            "commit_delay": args.commit_delay,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"📊 Wrote {len(results)} results to {args.output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for transaction and JWT signing.
+
+Compares the old signing path (a new pure-Python ecdsa.SigningKey per call)
+with the cached libsecp256k1 key now used by DeSoDexClient, and checks that
+both produce signatures the other side verifies.
+"""
+
+import argparse
+import hashlib
+import os
+import time
+
+from ecdsa import SigningKey, VerifyingKey, SECP256k1
+from ecdsa.util import sigencode_der, sigdecode_der, sigdecode_string
+
+from deso_sdk_fork.deso_sdk import DeSoDexClient
+
+
+def sign_txn_ecdsa(private_key, digest):
+    """Pre-change sign_single_txn: rebuild the ecdsa key and DER-sign."""
+    signing_key = SigningKey.from_string(private_key, curve=SECP256k1)
+    return signing_key.sign_digest(digest, sigencode=sigencode_der)
+
+
+def sign_jwt_ecdsa(private_key, digest):
+    """Pre-change upload_image JWT signing: rebuild the ecdsa key, raw r||s."""
+    signing_key = SigningKey.from_string(private_key, curve=SECP256k1)
+    return signing_key.sign_digest(digest)
+
+
+def rate(fn, iterations):
+    """Run fn() `iterations` times and return signatures per second."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DeSo signing paths")
+    parser.add_argument("-n", "--iterations", type=int, default=2000, help="signatures per measurement")
+    args = parser.parse_args()
+
+    client = DeSoDexClient(seed_phrase_or_hex=os.urandom(32).hex(), node_url="http://localhost")
+    keypair = client.deso_keypair
+    verifying_key = VerifyingKey.from_string(keypair.public_key, curve=SECP256k1)
+    txn_hex = os.urandom(250).hex()
+    digest = hashlib.sha256(hashlib.sha256(bytes.fromhex(txn_hex)).digest()).digest()
+
+    # Sanity check: the new path must stay verifiable in the old formats
+    verifying_key.verify_digest(bytes.fromhex(client.sign_single_txn(txn_hex)), digest, sigdecode=sigdecode_der)
+    verifying_key.verify_digest(keypair.sign_digest_rs(digest), digest, sigdecode=sigdecode_string)
+    print("✅ Signatures verify (DER for txns, r||s for ES256)")
+
+    results = [
+        ("txn DER   ecdsa (before)", rate(lambda: sign_txn_ecdsa(keypair.private_key, digest), args.iterations)),
+        ("txn DER   coincurve (after)", rate(lambda: client.sign_single_txn(txn_hex), args.iterations)),
+        ("JWT r||s  ecdsa (before)", rate(lambda: sign_jwt_ecdsa(keypair.private_key, digest), args.iterations)),
+        ("JWT r||s  coincurve (after)", rate(lambda: keypair.sign_digest_rs(digest), args.iterations)),
+    ]
+    print(f"\n{'path':<30}{'sigs/sec':>12}")
+    for name, sigs_per_sec in results:
+        print(f"{name:<30}{sigs_per_sec:>12,.0f}")
+    print(f"\nTxn signing speedup: {results[1][1] / results[0][1]:.1f}x")
+    print(f"JWT signing speedup: {results[3][1] / results[2][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Cached on-chain configuration for DesoMonitor.
+
+The config lives in the body of CONFIG_POST_HASH. Instead of fetching it at
+the start of every measurement cycle, ConfigService keeps the parsed config
+in memory with a TTL, refreshes it in the background once it goes stale, and
+keeps the last-known-good body on disk so a restart or a node outage never
+drops back to the .env defaults. A new config is only applied when the post
+body hash changes; `version` increases on every applied change so callers
+can skip work when nothing changed.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+
+class ConfigService:
+    """
+    TTL cache with last-known-good persistence around an on-chain config post.
+
+    Args:
+        fetch_body: Callable returning the raw config post body (str); may raise.
+        parse: Callable turning the decoded JSON dict into the config value.
+        fallback: Callable returning the config value used when no config was ever loaded.
+        cache_path: JSON file holding the last-known-good body, or None for memory only.
+        ttl: Seconds after which get() triggers a background refresh.
+        background: If False, get() serves the cached config without starting refresh
+            threads until start_background_refresh() is called (e.g. before forking workers).
+    """
+
+    def __init__(self, fetch_body, parse, fallback, cache_path=None, ttl=300, background=True):
+        self.fetch_body = fetch_body
+        self.parse = parse
+        self.fallback = fallback
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.background = background
+        self.version = 0
+        self._value = None
+        self._body_hash = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._load_cached()
+
+    def _load_cached(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            self._apply(cached["body"])
+            logging.info(f"⚙️ Loaded last-known-good config from {self.cache_path} (hash {self._body_hash[:12]})")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"⚠️ Ignoring unreadable config cache {self.cache_path}: {e}")
+
+    def _save_cached(self, body):
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"body": body, "body_hash": self._body_hash, "saved_at": time.time()}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _apply(self, body):
+        """Parse `body` and make it current if its hash differs. Returns True if the config changed."""
+        body_hash = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        if body_hash == self._body_hash:
+            return False
+        value = self.parse(json.loads(body))
+        self._value = value
+        self._body_hash = body_hash
+        self.version += 1
+        return True
+
+    def refresh(self):
+        """
+        Fetch the config post now. Keeps the current config on any failure.
+
+        Returns:
+            True if a new config was applied.
+        """
+        try:
+            body = self.fetch_body()
+            with self._lock:
+                changed = self._apply(body)
+                self._checked_at = time.monotonic()
+                if changed:
+                    self._save_cached(body)
+            if changed:
+                logging.info(f"⚙️ Config changed on-chain (hash {self._body_hash[:12]}, version {self.version})")
+            return changed
+        except Exception as e:
+            with self._lock:
+                # Retry after another TTL instead of on every get()
+                self._checked_at = time.monotonic()
+                have_config = self._value is not None
+            if have_config:
+                logging.warning(f"⚠️ Config refresh failed, keeping last-known-good config: {e}")
+            else:
+                print(f"Error loading config from chain: {e}. Falling back to .env config.")
+            return False
+
+    def start_background_refresh(self):
+        """Let get() start background refreshes from now on."""
+        self.background = True
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self):
+        # Only the background thread clears the flag, so a synchronous refresh() cannot let a second one start
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self):
+        """
+        Current config value, without waiting on the network once one has been loaded.
+
+        The very first call fetches synchronously (falling back to `fallback()`
+        if that fails); later calls return the cached value and start a
+        background refresh when it is older than the TTL.
+        """
+        if self._value is None and self._checked_at == 0.0:
+            self.refresh()
+        elif self.background and time.monotonic() - self._checked_at > self.ttl:
+            self._refresh_in_background()
+        value = self._value
+        return value if value is not None else self.fallback()
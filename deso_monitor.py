@@ -5,18 +5,20 @@ import time
 import logging
 import threading
 from threading import Lock
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import datetime
-import requests
-import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
 from dotenv import load_dotenv
-from deso_sdk_fork.deso_sdk import DeSoDexClient
+from deso_sdk_fork.deso_sdk import get_client, close_pooled_sessions, PhaseTimer, timed_phase
+from measurement_store import open_measurement_store, load_legacy_measurements, STATUS_OK, STATUS_TIMEOUT, STATUS_ERROR
+from measurement_series import NodeSeries, series_capacity
+from config_service import ConfigService
+from onchain_data import fetch_measurement_dataset, CommentCache
+from measurement_parser import decode_timestamp, measurement_extra_data, PHASES
+from rollups import RollupStore, ROLLUP_FIELDS
+import metrics
+from graph_render import RenderPool, render_timeseries, render_median_bars, render_gauge, render_phase_breakdown, node_label, gauge_status, load_artifact, save_artifact, output_profile
 
-# --- Consistent image file name ---
-MAIN_GRAPH_IMAGE = "daily_performance_stacked.png"
-
-matplotlib.use('Agg')  # Use non-interactive backend
 load_dotenv()
 
 # --- Logging setup (moved to top for immediate effect) ---
@@ -36,6 +38,16 @@ logging.info(f"DesoMonitor version {DESOMONITOR_VERSION} starting up...")
 SEED_HEX = os.getenv("DESO_SEED_HEX", "").replace('"','').replace("'",'').strip()  # from .env: DESO_SEED_HEX
 PUBLIC_KEY = os.getenv("DESO_PUBLIC_KEY", "").replace('"','').replace("'",'').strip()  # from .env: DESO_PUBLIC_KEY
 CONFIG_POST_HASH = os.getenv("CONFIG_POST_HASH", "91522722c35f6b38588f059723ae3a401a92ae7a09826c6a987bf511d02f21aa")
+# Pooled keep-alive HTTP sessions (one per node, shared by all clients)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+# Node used for config and on-chain graph reads (SDK default node.deso.org if unset)
+API_NODE_URL = os.getenv("DESO_API_NODE", "").strip() or None
+# Prometheus-style /metrics endpoint (0 disables it)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
 print(f"DEBUG: PUBLIC_KEY loaded: {PUBLIC_KEY}")
 required_env = {
     'DESO_SEED_HEX': SEED_HEX,
@@ -48,43 +60,83 @@ if missing:
     import sys
     sys.exit(1)
 
+# --- Shared DeSo clients ---
+def get_deso_client(node_url=None):
+    """Return the cached client for node_url (API_NODE_URL if None), signing with SEED_HEX."""
+    client = get_client(
+        node_url=node_url or API_NODE_URL,
+        seed_phrase_or_hex=SEED_HEX,  # SEED_HEX from DESO_SEED_HEX
+        is_testnet=False,
+        pool_size=HTTP_POOL_SIZE,
+        timeout=HTTP_TIMEOUT,
+    )
+    # Count and time every SDK request on this node's pooled session
+    metrics.instrument_session(client.session)
+    return client
+
+# Derive the signing key once at startup; every later client reuses it
+try:
+    get_deso_client()
+except ValueError as e:
+    print(f"FATAL: Could not derive key pair from DESO_SEED_HEX: {e}")
+    import sys
+    sys.exit(1)
+
 # --- On-chain config support ---
-def fetch_config_from_post(post_hash):
-    client = DeSoDexClient(is_testnet=False, seed_phrase_or_hex=SEED_HEX)  # SEED_HEX from DESO_SEED_HEX
+def fetch_config_body(post_hash):
+    client = get_deso_client()
     url = f"{client.node_url}/api/v0/get-single-post"
     payload = {"PostHashHex": post_hash}
-    resp = requests.post(url, json=payload)
+    resp = client.session.post(url, json=payload)
     resp.raise_for_status()
     post = resp.json().get("PostFound")
     if not post:
         raise Exception("Config post not found")
-    body = post.get("Body", "")
-    config = json.loads(body)
-    return config
+    return post.get("Body", "")
 
-# --- Config loader and initial config ---
-def load_config():
-    try:
-        config = fetch_config_from_post(CONFIG_POST_HASH)
-        nodes = config.get("NODES", ["https://node.deso.org"])
-        schedule_interval = int(config.get("SCHEDULE_INTERVAL", 3600))
-        daily_post_time = config.get("DAILY_POST_TIME", "00:00")
-        post_tag = config.get("POST_TAG", "#desomonitormeasurement")
-        graph_days = int(config.get("GRAPH_DAYS", 7))
-        mode = config.get("MODE", os.getenv("MODE", "DAILY-CYCLE"))
-        if isinstance(nodes, str):
-            nodes = [n.strip() for n in nodes.split(",") if n.strip()]
-        return nodes, schedule_interval, daily_post_time, post_tag, graph_days, mode
-    except Exception as e:
-        print(f"Error loading config from chain: {e}. Falling back to .env config.")
-        nodes = os.getenv("DESO_NODES", "https://node.deso.org,https://desocialworld.desovalidator.net,https://safetynet.social")
+def fetch_config_from_post(post_hash):
+    return json.loads(fetch_config_body(post_hash))
+
+def parse_config(config):
+    nodes = config.get("NODES", ["https://node.deso.org"])
+    schedule_interval = int(config.get("SCHEDULE_INTERVAL", 3600))
+    daily_post_time = config.get("DAILY_POST_TIME", "00:00")
+    post_tag = config.get("POST_TAG", "#desomonitormeasurement")
+    graph_days = int(config.get("GRAPH_DAYS", 7))
+    mode = config.get("MODE", os.getenv("MODE", "DAILY-CYCLE"))
+    if isinstance(nodes, str):
         nodes = [n.strip() for n in nodes.split(",") if n.strip()]
-        schedule_interval = int(os.getenv("SCHEDULE_INTERVAL", "3600"))
-        daily_post_time = os.getenv("DAILY_POST_TIME", "00:00")
-        post_tag = os.getenv("POST_TAG", "#desomonitormeasurement")
-        graph_days = int(os.getenv("GRAPH_DAYS", "7"))
-        mode = os.getenv("MODE", "DAILY-CYCLE")
-        return nodes, schedule_interval, daily_post_time, post_tag, graph_days, mode
+    return nodes, schedule_interval, daily_post_time, post_tag, graph_days, mode
+
+def env_config():
+    nodes = os.getenv("DESO_NODES", "https://node.deso.org,https://desocialworld.desovalidator.net,https://safetynet.social")
+    nodes = [n.strip() for n in nodes.split(",") if n.strip()]
+    schedule_interval = int(os.getenv("SCHEDULE_INTERVAL", "3600"))
+    daily_post_time = os.getenv("DAILY_POST_TIME", "00:00")
+    post_tag = os.getenv("POST_TAG", "#desomonitormeasurement")
+    graph_days = int(os.getenv("GRAPH_DAYS", "7"))
+    mode = os.getenv("MODE", "DAILY-CYCLE")
+    return nodes, schedule_interval, daily_post_time, post_tag, graph_days, mode
+
+# Parsed config cached with a TTL; the last-known-good body is kept on disk.
+# Background refreshes start only once the render workers are forked (see __main__).
+CONFIG_CACHE_FILE = os.getenv("CONFIG_CACHE_FILE", "config_cache.json")
+CONFIG_TTL = int(os.getenv("CONFIG_TTL", "300"))
+config_service = ConfigService(
+    lambda: fetch_config_body(CONFIG_POST_HASH),
+    parse_config,
+    env_config,
+    cache_path=CONFIG_CACHE_FILE,
+    ttl=CONFIG_TTL,
+    background=False,
+)
+
+# --- Config loader and initial config ---
+def load_config(refresh=False):
+    """Current config tuple; refresh=True fetches the config post before returning."""
+    if refresh:
+        config_service.refresh()
+    return config_service.get()
 
 
 # Initial config load
@@ -96,98 +148,184 @@ else:
     MODE = "DAILY-CYCLE"
 
 # Data storage with persistence
-MEASUREMENTS_FILE = "measurements.json"
+MEASUREMENTS_FILE = "measurements.json"  # Legacy whole-file format, migrated into the store on first start
+MEASUREMENT_BACKEND = os.getenv("MEASUREMENT_BACKEND", "journal").strip().lower()  # "journal" or "sqlite"
+MEASUREMENTS_JOURNAL = os.getenv("MEASUREMENTS_JOURNAL", "measurements.jsonl")
+MEASUREMENTS_DB = os.getenv("MEASUREMENTS_DB", "measurements.db")
+JOURNAL_BATCH_SIZE = int(os.getenv("JOURNAL_BATCH_SIZE", "20"))
+JOURNAL_FLUSH_INTERVAL = float(os.getenv("JOURNAL_FLUSH_INTERVAL", "5"))
+JOURNAL_COMPACT_INTERVAL = int(os.getenv("JOURNAL_COMPACT_INTERVAL", "3600"))
+store = open_measurement_store(
+    MEASUREMENT_BACKEND, MEASUREMENTS_JOURNAL, MEASUREMENTS_DB,
+    batch_size=JOURNAL_BATCH_SIZE, flush_interval=JOURNAL_FLUSH_INTERVAL,
+)
+last_compaction = time.monotonic()
+# Serialises compaction: the measurement cycle and the daily post both call save_measurements()
+compaction_lock = Lock()
+
 def load_measurements():
-    if os.path.exists(MEASUREMENTS_FILE):
-        with open(MEASUREMENTS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        # Convert keys to current NODES and migrate old format
-        migrated = {}
-        for node in NODES:
-            entries = data.get(node, [])
-            migrated_entries = []
-            for entry in entries:
-                timestamp, measurement = entry
-                # Check if old format (float) or new format (dict)
-                if isinstance(measurement, (int, float)):
-                    # OLD FORMAT: Convert elapsed to estimated POST/CONFIRM split
-                    elapsed = float(measurement)
-                    migrated_entries.append((timestamp, {
-                        "post": elapsed * 0.1,  # Estimate 10% for POST
-                        "confirm": elapsed * 0.9,  # Estimate 90% for CONFIRM
-                        "total": elapsed
-                    }))
-                elif isinstance(measurement, dict):
-                    # NEW FORMAT: Keep as-is
-                    migrated_entries.append((timestamp, measurement))
-                # Skip invalid entries
-            migrated[node] = migrated_entries
-        return migrated
+    """Load the last GRAPH_DAYS of samples from the store (migrating a legacy measurements.json once)."""
+    if store.exists():
+        data = store.replay(since=datetime.datetime.utcnow() - datetime.timedelta(days=GRAPH_DAYS))
+    elif os.path.exists(MEASUREMENTS_FILE):
+        data = load_legacy_measurements(MEASUREMENTS_FILE)
+        store.write_all(data)
+        logging.info(f"📦 Migrated {MEASUREMENTS_FILE} into {MEASUREMENT_BACKEND} store")
     else:
-        return {node: [] for node in NODES}
+        data = {}
+    # Convert keys to current NODES, packing each node's samples into a columnar ring buffer
+    capacity = series_capacity(GRAPH_DAYS, SCHEDULE_INTERVAL)
+    loaded = {}
+    for node in NODES:
+        series = NodeSeries(capacity)
+        for timestamp, measurement, status in data.get(node, []):
+            try:
+                series.append(timestamp, measurement, status)
+            except ValueError:
+                logging.debug(f"⚠️ Skipping stored sample with invalid timestamp for {node}: {timestamp}")
+        loaded[node] = series
+    return loaded
 
 measurements = load_measurements()
 
-def save_measurements():
-    """Save measurements to JSON, keeping only last GRAPH_DAYS for each node."""
-    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=GRAPH_DAYS)
-    filtered = {}
-    for node, entries in measurements.items():
-        filtered_entries = []
-        for t, e in entries:
-            try:
-                dt = datetime.datetime.strptime(t, "%Y-%m-%d %H:%M:%S UTC")
-                if dt >= cutoff:
-                    filtered_entries.append((t, e))
-            except Exception:
-                # If timestamp is invalid, keep entry
-                filtered_entries.append((t, e))
-        filtered[node] = filtered_entries
-    with open(MEASUREMENTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(filtered, f, indent=2, ensure_ascii=False)
-    logging.info(f"💾 Measurements saved to {MEASUREMENTS_FILE} (clipped to {GRAPH_DAYS} days)")
+# Hourly / daily rollups per node (probes, timeouts, quantile sketch per field), kept longer than GRAPH_DAYS
+ROLLUP_FILE = os.getenv("ROLLUP_FILE", "measurement_rollups.json")
+ROLLUP_HOURLY_DAYS = int(os.getenv("ROLLUP_HOURLY_DAYS", "35"))
+ROLLUP_DAILY_DAYS = int(os.getenv("ROLLUP_DAILY_DAYS", "400"))
+rollups = RollupStore(ROLLUP_FILE, retention={"hour": ROLLUP_HOURLY_DAYS * 86400, "day": ROLLUP_DAILY_DAYS * 86400})
+
+def replay_rollups():
+    """Add loaded samples the rollup file does not have yet (all of them for a new file, else those after its last save)."""
+    replayed = 0
+    for node, series in measurements.items():
+        cols = series.columns()
+        for i in np.flatnonzero(cols["ts"] > rollups.latest.get(node, 0)):
+            measurement = {field: float(cols[field][i]) for field in ROLLUP_FIELDS} if cols["status"][i] == STATUS_OK else None
+            rollups.add(node, cols["ts"][i], measurement, int(cols["status"][i]))
+            replayed += 1
+    if replayed:
+        rollups.save()
+        logging.info(f"🧮 Replayed {replayed} stored samples into the rollups in {ROLLUP_FILE}")
+
+replay_rollups()
+# Guards `measurements` now that nodes are probed from several worker threads
+measurements_lock = Lock()
+
+# Upper bound on nodes probed in parallel during one measurement cycle
+MEASUREMENT_CONCURRENCY = max(1, int(os.getenv("MEASUREMENT_CONCURRENCY", "8")))
+
+STATUS_NAMES = {STATUS_OK: "ok", STATUS_TIMEOUT: "timeout", STATUS_ERROR: "error"}
+
+def record_measurement(node, timestamp, measurement, status=None):
+    """Append one sample for `node` and persist it; safe to call from probe worker threads.
+
+    `status` defaults to STATUS_OK for a timings dict and STATUS_ERROR for None.
+    """
+    if status is None:
+        status = STATUS_OK if measurement is not None else STATUS_ERROR
+    metrics.PROBE_RESULTS.labels(node=node, status=STATUS_NAMES.get(status, status)).inc()
+    if measurement is not None:
+        for phase in ("post", "confirm", "total") + PHASES:
+            if measurement.get(phase) is not None:
+                metrics.PROBE_SECONDS.labels(node=node, phase=phase).observe(measurement[phase])
+    with measurements_lock:
+        series = measurements.get(node)
+        if series is None:
+            series = measurements[node] = NodeSeries(series_capacity(GRAPH_DAYS, SCHEDULE_INTERVAL))
+        series.append(timestamp, measurement, status)
+    rollups.add(node, decode_timestamp(timestamp), measurement, status)
+    store.append(node, timestamp, measurement, status)
+
+def sync_measurement_nodes(nodes):
+    """Add empty series for new nodes, drop series for nodes no longer configured,
+    and resize buffers when GRAPH_DAYS / SCHEDULE_INTERVAL change."""
+    capacity = series_capacity(GRAPH_DAYS, SCHEDULE_INTERVAL)
+    with measurements_lock:
+        for node in nodes:
+            if node not in measurements:
+                measurements[node] = NodeSeries(capacity)
+            elif measurements[node].capacity != capacity:
+                measurements[node] = measurements[node].resized(capacity)
+        for node in list(measurements.keys()):
+            if node not in nodes:
+                del measurements[node]
+
+def save_measurements(force_compact=False):
+    """Flush pending store writes; prune entries older than GRAPH_DAYS and save the rollups once per JOURNAL_COMPACT_INTERVAL."""
+    global last_compaction
+    store.flush()
+    with compaction_lock:
+        if not force_compact and time.monotonic() - last_compaction < JOURNAL_COMPACT_INTERVAL:
+            return
+        cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=GRAPH_DAYS)
+        dropped = store.compact(cutoff)
+        # Samples added since the last rollup save are replayed from the store after a restart
+        rollups.prune(nodes=NODES)
+        rollups.save()
+        last_compaction = time.monotonic()
+    logging.info(f"💾 Measurements {MEASUREMENT_BACKEND} store compacted (clipped to {GRAPH_DAYS} days, dropped {dropped} entries)")
 
 def post_measurement(node, parent_post_hash):
     logging.info(f"🔄 DesoMonitor: Starting measurement post to {node}")
-    start = time.time()
+    start = time.monotonic()
     try:
         timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
         
         logging.info(f"📡 Connecting to {node}...")
-        client = DeSoDexClient(is_testnet=False, seed_phrase_or_hex=SEED_HEX, node_url=node)  # SEED_HEX from DESO_SEED_HEX
+        client = get_deso_client(node)
         
         # Create a temporary post first to measure response time
         logging.info(f"📝 Testing connection to {node}...")
         temp_comment = f"\U0001F310 Node check-in\nTesting connection...\nTimestamp: {timestamp}\nNode: {node}\n{POST_TAG}"
         
-        post_resp = client.submit_post(
-            updater_public_key_base58check=PUBLIC_KEY,  # PUBLIC_KEY from DESO_PUBLIC_KEY
-            body=temp_comment,
-            parent_post_hash_hex=parent_post_hash,
-            title="",
-            image_urls=[],
-            video_urls=[],
-            post_extra_data={"Node": node},
-            min_fee_rate_nanos_per_kb=1000,
-            is_hidden=False,
-            in_tutorial=False
-        )
-        submit_resp = client.sign_and_submit_txn(post_resp)
+        # Per-phase breakdown of the POST: connection setup (dns/connect/tls), construct, sign, submit
+        timer = PhaseTimer()
+        with timer.activate():
+            with timed_phase("construct"):
+                post_resp = client.submit_post(
+                    updater_public_key_base58check=PUBLIC_KEY,  # PUBLIC_KEY from DESO_PUBLIC_KEY
+                    body=temp_comment,
+                    parent_post_hash_hex=parent_post_hash,
+                    title="",
+                    image_urls=[],
+                    video_urls=[],
+                    post_extra_data={"Node": node},
+                    min_fee_rate_nanos_per_kb=1000,
+                    is_hidden=False,
+                    in_tutorial=False
+                )
+            submit_resp = client.sign_and_submit_txn(post_resp)
         txn_hash = submit_resp.get("TxnHashHex")
-        post_time = time.time() - start  # Time to POST (submit transaction)
+        post_time = time.monotonic() - start  # Time to POST (submit transaction)
+        phases = {phase: timer.phases.get(phase, 0.0) for phase in PHASES if phase not in ("mempool", "commit")}
         
         logging.info(f"⏳ Waiting for commitment from {node} (TxnHash: {txn_hash})")
         # Wait for commitment (confirmed reply) - increased timeout for slow networks
         try:
-            confirm_start = time.time()
-            client.wait_for_commitment_with_timeout(txn_hash, 120.0)  # Increased to 2 minutes
-            confirm_time = time.time() - confirm_start  # Time to CONFIRM
-            elapsed = time.time() - start
+            confirm_start = time.monotonic()
+            commit = client.wait_for_commitment_with_timeout(txn_hash, 120.0, track_mempool=True)  # Increased to 2 minutes
+            # The commit happened between the last "pending" poll and the first "committed" reply;
+            # report the midpoint with half the bracket width as the error bound
+            confirm_low = commit["pending_before"] - confirm_start
+            confirm_high = commit["committed_by"] - confirm_start
+            confirm_time = (confirm_low + confirm_high) / 2  # Time to CONFIRM
+            confirm_err = (confirm_high - confirm_low) / 2
+            elapsed = post_time + confirm_time
+            # CONFIRM splits into submit -> first seen in the mempool -> committed. The commit bracket
+            # neither starts nor ends before the mempool one, so the mempool midpoint is at most
+            # confirm_time and the two phases add up to CONFIRM
+            phases["mempool"] = (commit["mempool_pending_before"] + commit["mempool_seen_by"]) / 2 - confirm_start
+            phases["commit"] = confirm_time - phases["mempool"]
+            if phases["commit"] < 0:
+                logging.warning(f"⚠️ {node}: mempool phase {phases['mempool']:.2f}s exceeds CONFIRM {confirm_time:.2f}s, clamping")
+                phases["mempool"], phases["commit"] = confirm_time, 0.0
+            logging.info(f"🔁 {node}: commit bracketed in [{confirm_low:.2f}s, {confirm_high:.2f}s] after {commit['polls']} polls")
+            logging.info(f"🧩 {node}: " + ", ".join(f"{phase} {seconds * 1000:.0f}ms" for phase, seconds in phases.items()))
             
             # Now post the actual measurement with real timing as a reply
-            final_comment = f"\U0001F310 Node check-in RESULT\nPOST: {post_time:.2f} sec\nCONFIRM: {confirm_time:.2f} sec\nTotal: {elapsed:.2f} sec\nTimestamp: {timestamp}\nNode: {node}\n{POST_TAG}"
+            final_comment = f"\U0001F310 Node check-in RESULT\nPOST: {post_time:.2f} sec\nCONFIRM: {confirm_time:.2f} sec (±{confirm_err:.2f})\nTotal: {elapsed:.2f} sec\nTimestamp: {timestamp}\nNode: {node}\n{POST_TAG}"
             
-            logging.info(f"📝 Posting final result: POST {post_time:.2f}s, CONFIRM {confirm_time:.2f}s, Total {elapsed:.2f}s...")
+            logging.info(f"📝 Posting final result: POST {post_time:.2f}s, CONFIRM {confirm_time:.2f}s ±{confirm_err:.2f}s, Total {elapsed:.2f}s...")
             final_resp = client.submit_post(
                 updater_public_key_base58check=PUBLIC_KEY,  # PUBLIC_KEY from DESO_PUBLIC_KEY
                 body=final_comment,
@@ -195,7 +333,8 @@ def post_measurement(node, parent_post_hash):
                 title="",
                 image_urls=[],
                 video_urls=[],
-                post_extra_data={"Node": node, "Type": "measurement_result"},
+                # Timings also go into PostExtraData so chain readers can skip parsing the body
+                post_extra_data=measurement_extra_data(node, decode_timestamp(timestamp), post_time, confirm_time, confirm_err, elapsed, phases),
                 min_fee_rate_nanos_per_kb=1000,
                 is_hidden=False,
                 in_tutorial=False
@@ -204,340 +343,279 @@ def post_measurement(node, parent_post_hash):
             
             logging.info(f"✅ SUCCESS: {node} - POST: {post_time:.2f}s, CONFIRM: {confirm_time:.2f}s, Total: {elapsed:.2f}s")
             print(final_comment)
-            measurements[node].append((timestamp, {"post": post_time, "confirm": confirm_time, "total": elapsed}))
+            record_measurement(node, timestamp, {"post": post_time, "confirm": confirm_time, "confirm_err": confirm_err, "total": elapsed, **phases})
         except Exception as confirm_err:
-            elapsed = time.time() - start
+            elapsed = time.monotonic() - start
             logging.warning(f"⚠️ TIMEOUT: Reply txn not confirmed for {node} after {elapsed:.2f}s: {confirm_err}")
             print(f"Reply txn not confirmed for {node}: {confirm_err}")
-            measurements[node].append((timestamp, None))
+            record_measurement(node, timestamp, None, STATUS_TIMEOUT)
     except Exception as e:
-        elapsed = time.time() - start
+        elapsed = time.monotonic() - start
         logging.error(f"❌ ERROR: Failed to post to {node} after {elapsed:.2f}s: {e}")
         print(f"Error posting to {node}: {e}")
-        measurements[node].append((datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"), None))
-        save_measurements()
+        record_measurement(node, datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"), None, STATUS_ERROR)
 
-def scheduled_measurements(parent_post_hash):
-    logging.info(f"🚀 DesoMonitor: Starting scheduled measurements every {SCHEDULE_INTERVAL} seconds (thread started, parent_post_hash={parent_post_hash})")
-    print(f"[DesoMonitor] Measurement thread started. Parent post hash: {parent_post_hash}")
-    measurement_count = 0
-    try:
-        while True:
-            measurement_count += 1
-            logging.info(f"📊 DesoMonitor: Starting measurement cycle #{measurement_count} for {len(NODES)} nodes")
-            logging.info(f"DEBUG: Full NODES list for monitoring: {NODES}")
-            for i, node in enumerate(NODES, 1):
-                logging.info(f"🔍 DesoMonitor: Processing node {i}/{len(NODES)}: {node} (parent_post_hash={parent_post_hash})")
-                print(f"[DesoMonitor] Posting measurement for node {node} (parent_post_hash={parent_post_hash})")
-                try:
-                    post_measurement(node, parent_post_hash)
-                except Exception as e:
-                    logging.error(f"❌ ERROR: Exception during monitoring node {node}: {e}")
-                    print(f"[DesoMonitor] ERROR posting measurement for node {node}: {e}")
-                    # Still log the failed attempt for visibility
-                    measurements[node].append((datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"), None))
-            next_run = datetime.datetime.utcnow() + datetime.timedelta(seconds=SCHEDULE_INTERVAL)
-            logging.info(f"💤 DesoMonitor: Measurement cycle #{measurement_count} complete. Next run at {next_run.strftime('%H:%M:%S UTC')}")
-            print(f"[DesoMonitor] Measurement cycle #{measurement_count} complete. Next run at {next_run.strftime('%H:%M:%S UTC')}")
-            time.sleep(SCHEDULE_INTERVAL)
-    except Exception as thread_exc:
-        logging.error(f"❌ ERROR: Measurement thread crashed: {thread_exc}")
-        print(f"[DesoMonitor] FATAL: Measurement thread crashed: {thread_exc}")
-
-def generate_daily_graph(graph_days=7):
-    # --- Parse measurement comments from blockchain for last graph_days (revert to working logic) ---
-    import re
-    import numpy as np
-    client = DeSoDexClient(is_testnet=False, seed_phrase_or_hex=SEED_HEX)
-    url = f"{client.node_url}/api/v0/get-posts-for-public-key"
-    payload = {"PublicKeyBase58Check": PUBLIC_KEY, "NumToFetch": graph_days * 3 + 20}
-    resp = requests.post(url, json=payload)
-    resp.raise_for_status()
-    posts = resp.json().get("Posts", [])
-    from collections import defaultdict
-    daily_posts_by_date = defaultdict(list)
-    for post in posts:
-        if POST_TAG in post.get("Body", ""):
-            post_time = post.get("TimestampNanos")
-            if post_time:
-                t = datetime.datetime.utcfromtimestamp(int(post_time) / 1e9)
-                date_str = t.strftime("%Y-%m-%d")
-                daily_posts_by_date[date_str].append((t, post))
-    selected_daily_posts = []
-    today = datetime.datetime.utcnow().date()
-    for i in range(graph_days):
-        day = today - datetime.timedelta(days=i)
-        date_str = day.strftime("%Y-%m-%d")
-        posts_for_day = sorted(daily_posts_by_date.get(date_str, []), key=lambda x: x[0], reverse=True)
-        for t, post in posts_for_day:
-            daily_post_hash = post.get("PostHashHex")
-            url_single = f"{client.node_url}/api/v0/get-single-post"
-            payload_single = {"PostHashHex": daily_post_hash, "CommentOffset": 0, "CommentLimit": 100}
-            resp_single = requests.post(url_single, json=payload_single)
-            resp_single.raise_for_status()
-            comments = resp_single.json().get("PostFound", {}).get("Comments", [])
-            if comments:
-                selected_daily_posts.append((post, comments))
-                break
-    measurement_comments = []
-    for post, comments in selected_daily_posts:
-        measurement_comments.extend([c for c in comments if POST_TAG in c.get("Body", "")])
-    logging.info(f"🔎 Found {len(measurement_comments)} on-chain measurement comments for last {graph_days} days.")
-    node_times = {node: [] for node in NODES}
-    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=graph_days)
-    node_times_post = {node: [] for node in NODES}
-    node_times_confirm = {node: [] for node in NODES}
-    for c in measurement_comments:
-        body = c.get("Body", "")
-        node = None
-        post_time = None
-        confirm_time = None
-        timestamp = None
-        m_node = re.search(r"Node: (.+)", body)
-        m_post = re.search(r"POST: ([0-9.]+) sec", body)
-        m_confirm = re.search(r"CONFIRM: ([0-9.]+) sec", body)
-        m_elapsed = re.search(r"Elapsed: ([0-9.]+) sec", body)  # OLD FORMAT
-        m_time = re.search(r"Timestamp: ([0-9\-: ]+ UTC)", body)
-        if m_node:
-            node = m_node.group(1).strip()
-        if m_post:
-            post_time = float(m_post.group(1))
-        if m_confirm:
-            confirm_time = float(m_confirm.group(1))
-        # Backward compatibility: if no POST/CONFIRM but have Elapsed, estimate split
-        if m_elapsed and post_time is None and confirm_time is None:
-            elapsed_time = float(m_elapsed.group(1))
-            # Estimate: ~10% for POST, ~90% for CONFIRM (typical blockchain behavior)
-            post_time = elapsed_time * 0.1
-            confirm_time = elapsed_time * 0.9
-        if m_time:
-            timestamp = m_time.group(1).strip()
-        if node in node_times and timestamp is not None:
+def run_measurement_cycle(nodes, parent_post_hash, cycle_number):
+    """Probe all `nodes` in parallel (at most MEASUREMENT_CONCURRENCY at once).
+
+    Cycle wall time tracks the slowest single node instead of the sum of all of them.
+    """
+    cycle_start = time.time()
+    workers = min(MEASUREMENT_CONCURRENCY, len(nodes)) or 1
+    logging.info(f"📊 DesoMonitor: Measurement cycle #{cycle_number} probing {len(nodes)} nodes with {workers} workers (parent_post_hash={parent_post_hash})")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="probe") as pool:
+        futures = {pool.submit(post_measurement, node, parent_post_hash): node for node in nodes}
+        for future in as_completed(futures):
+            node = futures[future]
             try:
-                t = datetime.datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S UTC")
-                if t >= cutoff:
-                    if post_time is not None:
-                        node_times_post[node].append((t, post_time))
-                        node_times[node].append((t, post_time))  # Keep for backward compatibility
-                    if confirm_time is not None:
-                        node_times_confirm[node].append((t, confirm_time))
-                    logging.info(f"\U0001F4E5 Measurement used for graph: node={node}, timestamp={timestamp}, POST={post_time}s, CONFIRM={confirm_time}s")
-            except Exception as ex:
-                logging.debug(f"⚠️ Skipping invalid measurement comment: {body} (error: {ex})")
-    # --- Sort measurement points by timestamp for each node ---
-    for node in NODES:
-        node_times_post[node].sort(key=lambda x: x[0])
-        node_times_confirm[node].sort(key=lambda x: x[0])
-    # --- New: Stacked time series plots for POST and CONFIRM speeds ---
-    import matplotlib.dates as mdates
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
-    colors = plt.cm.tab10(np.linspace(0, 1, len(NODES)))
-    # POST Speed (top) - line+marker plot
-    for i, node in enumerate(NODES):
-        times = [t for t, e in node_times_post[node] if e is not None]
-        elapsed = [e for t, e in node_times_post[node] if e is not None]
-        node_name = node.replace('https://', '').replace('http://', '')
-        ax1.plot(times, elapsed, marker='o', linestyle='-', label=node_name, color=colors[i])
-        logging.info(f"📊 POST graph data for {node}: {len(elapsed)} measurements")
-    ax1.set_ylabel("POST Speed (seconds)", fontsize=12)
-    ax1.set_title("DeSo Node POST Speed (Transaction Submission)", fontsize=14, fontweight='bold')
-    ax1.grid(True, alpha=0.3)
-    ax1.legend(fontsize=10, ncol=2, loc='upper left', bbox_to_anchor=(1.02, 1))
-    ax1.spines['top'].set_visible(False)
-    ax1.spines['right'].set_visible(False)
-    # CONFIRM Speed (bottom) - line+marker plot
-    for i, node in enumerate(NODES):
-        times = [t for t, e in node_times_confirm[node] if e is not None]
-        elapsed = [e for t, e in node_times_confirm[node] if e is not None]
-        node_name = node.replace('https://', '').replace('http://', '')
-        ax2.plot(times, elapsed, marker='o', linestyle='-', label=node_name, color=colors[i])
-        logging.info(f"📊 CONFIRM graph data for {node}: {len(elapsed)} measurements")
-    ax2.set_ylabel("CONFIRMATION Speed (seconds)", fontsize=12)
-    ax2.set_title("DeSo Node CONFIRMATION Speed (Transaction Commitment - Full Nodes Only)", fontsize=14, fontweight='bold')
-    ax2.grid(True, alpha=0.3)
-    ax2.legend(fontsize=10, ncol=2, loc='upper left', bbox_to_anchor=(1.02, 1))
-    ax2.spines['top'].set_visible(False)
-    ax2.spines['right'].set_visible(False)
-    ax2.set_xlabel("Time (UTC)", fontsize=12)
-    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(MAIN_GRAPH_IMAGE, dpi=300, bbox_inches='tight')
-    plt.close(fig)
-    logging.info(f"📈 Stacked POST/CONFIRM graph saved as '{MAIN_GRAPH_IMAGE}' (line+marker plot)")
-
-    # --- Bar chart: POST vs CONFIRM Speed (Median) ---
+                future.result()
+            except Exception as e:
+                logging.error(f"❌ ERROR: Exception during monitoring node {node}: {e}")
+                print(f"[DesoMonitor] ERROR posting measurement for node {node}: {e}")
+                # Still log the failed attempt for visibility
+                record_measurement(node, datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"), None, STATUS_ERROR)
+    save_measurements()
+    cycle_time = time.time() - cycle_start
+    metrics.CYCLE_SECONDS.observe(cycle_time)
+    logging.info(f"⏱️ DesoMonitor: Measurement cycle #{cycle_number} took {cycle_time:.2f}s for {len(nodes)} nodes")
+    return cycle_time
+
+# Parsed on-chain measurement comments, synced incrementally between graph runs
+COMMENT_CACHE_FILE = os.getenv("COMMENT_CACHE_FILE", "comment_cache.json")
+COMMENT_PAGE_SIZE = int(os.getenv("COMMENT_PAGE_SIZE", "200"))
+comment_cache = CommentCache(COMMENT_CACHE_FILE)
+# Chart render processes (0 renders inline); warmed at startup
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "3"))
+render_pool = RenderPool(RENDER_WORKERS)
+# Chart encoding: full (300-dpi PNG), compact (palette PNG) or webp; CHART_DPI / CHART_WEBP_QUALITY override the profile
+CHART_PROFILE = output_profile(os.getenv("CHART_PROFILE", "full"),
+                               dpi=int(os.getenv("CHART_DPI", "0")) or None,
+                               quality=int(os.getenv("CHART_WEBP_QUALITY", "0")) or None)
+# --- Consistent image file names ---
+MAIN_GRAPH_IMAGE = f"daily_performance_stacked.{CHART_PROFILE.extension}"
+BAR_GRAPH_IMAGE = f"daily_performance_bar.{CHART_PROFILE.extension}"
+GAUGE_IMAGE = f"daily_gauge.{CHART_PROFILE.extension}"
+PHASE_GRAPH_IMAGE = f"daily_phase_breakdown.{CHART_PROFILE.extension}"
+# Fewest buckets per line before the stacked graph drops to a finer resolution (day -> hour -> raw samples)
+CHART_MIN_POINTS = int(os.getenv("CHART_MIN_POINTS", "60"))
+# Manifest of the last rendered charts (dataset digest + file hashes), reused while the dataset is unchanged
+RENDER_ARTIFACT_FILE = os.getenv("RENDER_ARTIFACT_FILE", "render_artifact.json")
+# Seconds before midnight for a catch-up render with the last samples (0 = post the T-5 min render as is)
+CATCHUP_RENDER_LEAD = int(os.getenv("CATCHUP_RENDER_LEAD", "0"))
+# Daily post image uploads: per-request timeout in seconds and retries per image
+UPLOAD_TIMEOUT = float(os.getenv("UPLOAD_TIMEOUT", "60"))
+UPLOAD_RETRIES = int(os.getenv("UPLOAD_RETRIES", "2"))
+
+def load_onchain_dataset(graph_days=None):
+    """Fetch and parse the last graph_days of on-chain measurement comments once, for all renderers."""
+    return fetch_measurement_dataset(
+        get_deso_client(),
+        PUBLIC_KEY,
+        POST_TAG,
+        NODES,
+        GRAPH_DAYS if graph_days is None else graph_days,
+        cache=comment_cache,
+        page_size=COMMENT_PAGE_SIZE,
+    )
+
+def daily_graph_jobs(dataset):
+    """Render jobs (func, args) for the stacked POST/CONFIRM graph and the median bar chart.
+
+    The stacked graph plots the coarsest rollups that still give CHART_MIN_POINTS
+    buckets over GRAPH_DAYS (raw samples for short ranges), so its render cost
+    does not grow with GRAPH_DAYS.
+    """
+    labels = [node_label(node) for node in NODES]
+    resolution = dataset.resolution(CHART_MIN_POINTS)
+    if resolution == "raw":
+        post_series = [dataset.values(node, "post") for node in NODES]
+        confirm_series = [dataset.values(node, "confirm") for node in NODES]
+    else:
+        post_series = [dataset.bucketed(node, "post", resolution) for node in NODES]
+        confirm_series = [dataset.bucketed(node, "confirm", resolution) for node in NODES]
+    for node, post, confirm in zip(NODES, post_series, confirm_series):
+        logging.info(f"📊 Graph data for {node}: {len(post[1])} POST / {len(confirm[1])} CONFIRM points ({resolution})")
     medians_post = []
     medians_confirm = []
-    node_labels = []
+    bar_labels = []
+    for node, label in zip(NODES, labels):
+        median_post = dataset.quantile(node, "post", 0.5)
+        median_confirm = dataset.quantile(node, "confirm", 0.5)
+        if median_post is not None or median_confirm is not None:
+            medians_post.append(median_post if median_post is not None else 0)
+            medians_confirm.append(median_confirm if median_confirm is not None else 0)
+            bar_labels.append(label)
+    return [
+        (render_timeseries, (MAIN_GRAPH_IMAGE, labels, post_series, confirm_series, CHART_PROFILE, resolution)),
+        (render_median_bars, (BAR_GRAPH_IMAGE, bar_labels, np.array(medians_post), np.array(medians_confirm), CHART_PROFILE)),
+    ]
+
+def gauge_jobs(dataset):
+    """Render job (func, args) for the median total-time gauge, with p90/p99 from the merged daily sketches."""
+    labels = []
+    medians = []
+    tails = []
+    for node in NODES:
+        median = dataset.quantile(node, "total", 0.5)
+        if median is not None:
+            labels.append(node_label(node))
+            medians.append(median)
+            tails.append((dataset.quantile(node, "total", 0.9), dataset.quantile(node, "total", 0.99)))
+            logging.info(f"🎯 Gauge for {node}: {median:.2f}s median, p90 {tails[-1][0]:.2f}s, p99 {tails[-1][1]:.2f}s ({gauge_status(median)[1]})")
+    return [(render_gauge, (GAUGE_IMAGE, labels, np.array(medians), CHART_PROFILE, np.array(tails).reshape(-1, 2)))]
+
+def phase_breakdown_jobs(dataset):
+    """Render job (func, args) for the per-phase latency breakdown (nodes without phase data are left out)."""
+    labels = []
+    rows = []
     for node in NODES:
-        post_times = [e for t, e in node_times_post[node] if e is not None]
-        confirm_times = [e for t, e in node_times_confirm[node] if e is not None]
-        if post_times or confirm_times:
-            medians_post.append(np.median(post_times) if post_times else 0)
-            medians_confirm.append(np.median(confirm_times) if confirm_times else 0)
-            node_labels.append(node.replace('https://', '').replace('http://', ''))
-    y_pos = np.arange(len(node_labels))
-    bar_height = 0.35
-    fig2, ax = plt.subplots(figsize=(13, max(5, len(node_labels) * 0.8)))
-    bars1 = ax.barh(y_pos - bar_height/2, medians_post, bar_height, label='POST Speed', color='#3498db')
-    bars2 = ax.barh(y_pos + bar_height/2, medians_confirm, bar_height, label='CONFIRM Speed', color='#27ae60')
-    for i, (bar, median) in enumerate(zip(bars1, medians_post)):
-        width = bar.get_width()
-        ax.text(width + 0.1, bar.get_y() + bar.get_height()/2, f'{median:.1f}s', ha='left', va='center', fontsize=10)
-    for i, (bar, median) in enumerate(zip(bars2, medians_confirm)):
-        width = bar.get_width()
-        ax.text(width + 0.1, bar.get_y() + bar.get_height()/2, f'{median:.1f}s', ha='left', va='center', fontsize=10)
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(node_labels, fontsize=12)
-    ax.set_xlabel('Response Time (seconds)', fontsize=12)
-    ax.set_title('DeSo Node Performance - POST vs CONFIRMATION Speed (Median)', fontsize=15, fontweight='bold', pad=20)
-    ax.legend(fontsize=12)
-    ax.grid(True, axis='x', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig("daily_performance_bar.png", dpi=300, bbox_inches='tight')
-    plt.close(fig2)
-    logging.info("📊 Bar chart saved as 'daily_performance_bar.png'")
-
-def generate_gauge():
+        medians = [dataset.median(node, phase) for phase in PHASES]
+        if any(median is not None for median in medians):
+            labels.append(node_label(node))
+            rows.append([median or 0.0 for median in medians])
+    medians = np.array(rows, dtype=np.float64).reshape(-1, len(PHASES))
+    return [(render_phase_breakdown, (PHASE_GRAPH_IMAGE, labels, PHASES, medians, CHART_PROFILE))]
+
+def run_render_jobs(jobs):
+    start = time.perf_counter()
+    durations = render_pool.render(jobs)
+    for (func, args), seconds in zip(jobs, durations):
+        metrics.RENDER_SECONDS.labels(chart=os.path.basename(args[0])).observe(seconds)
+        logging.info(f"📈 Saved '{args[0]}' ({os.path.getsize(args[0]) / 1024:.0f} KB, {CHART_PROFILE.name} @ {CHART_PROFILE.dpi} dpi) in {seconds:.2f}s")
+    logging.info(f"🎨 Rendered {len(jobs)} charts in {time.perf_counter() - start:.2f}s (slowest {max(durations, default=0):.2f}s)")
+
+def generate_daily_graph(graph_days=7, dataset=None):
+    # --- Measurement comments from blockchain for last graph_days (shared ingestion pass) ---
+    if dataset is None:
+        dataset = load_onchain_dataset(graph_days)
+    run_render_jobs(daily_graph_jobs(dataset))
+
+def generate_gauge(dataset=None):
     logging.info("🎯 Generating daily performance gauge from on-chain data only...")
-    import re
-    import numpy as np
-    client = DeSoDexClient(is_testnet=False, seed_phrase_or_hex=SEED_HEX)
-    url = f"{client.node_url}/api/v0/get-posts-for-public-key"
-    payload = {"PublicKeyBase58Check": PUBLIC_KEY, "NumToFetch": GRAPH_DAYS * 3 + 20}
-    resp = requests.post(url, json=payload)
-    resp.raise_for_status()
-    posts = resp.json().get("Posts", [])
-    from collections import defaultdict
-    daily_posts_by_date = defaultdict(list)
-    for post in posts:
-        if POST_TAG in post.get("Body", ""):
-            post_time = post.get("TimestampNanos")
-            if post_time:
-                t = datetime.datetime.utcfromtimestamp(int(post_time) / 1e9)
-                date_str = t.strftime("%Y-%m-%d")
-                daily_posts_by_date[date_str].append((t, post))
-    selected_daily_posts = []
-    today = datetime.datetime.utcnow().date()
-    # Dynamically determine expected number of measurement comments
-    nodes = NODES
-    schedule_interval = SCHEDULE_INTERVAL
-    per_node_per_day = int(24 * 60 * 60 / schedule_interval)
-    expected_comments = len(nodes) * per_node_per_day
-    comment_limit = int(expected_comments * 1.2)  # 20% buffer
-    for i in range(GRAPH_DAYS):
-        day = today - datetime.timedelta(days=i)
-        date_str = day.strftime("%Y-%m-%d")
-        posts_for_day = sorted(daily_posts_by_date.get(date_str, []), key=lambda x: x[0], reverse=True)
-        for t, post in posts_for_day:
-            daily_post_hash = post.get("PostHashHex")
-            url_single = f"{client.node_url}/api/v0/get-single-post"
-            payload_single = {"PostHashHex": daily_post_hash, "CommentOffset": 0, "CommentLimit": comment_limit}
-            resp_single = requests.post(url_single, json=payload_single)
-            resp_single.raise_for_status()
-            comments = resp_single.json().get("PostFound", {}).get("Comments", [])
-            if comments:
-                selected_daily_posts.append((post, comments))
-                break
-    measurement_comments = []
-    for post, comments in selected_daily_posts:
-        measurement_comments.extend([c for c in comments if POST_TAG in c.get("Body", "")])
-    logging.info(f"🔎 Found {len(measurement_comments)} on-chain measurement comments for last {GRAPH_DAYS} days (for gauge graph).")
-    node_times = {node: [] for node in NODES}
-    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=GRAPH_DAYS)
-    for c in measurement_comments:
-        body = c.get("Body", "")
-        node = None
-        total_time = None
-        timestamp = None
-        m_node = re.search(r"Node: (.+)", body)
-        m_total = re.search(r"Total: ([0-9.]+) sec", body)
-        m_time = re.search(r"Timestamp: ([0-9\-: ]+ UTC)", body)
-        if m_node:
-            node = m_node.group(1).strip()
-        if m_total:
-            total_time = float(m_total.group(1))
-        if m_time:
-            timestamp = m_time.group(1).strip()
-        if node in node_times and timestamp is not None and total_time is not None:
-            try:
-                t = datetime.datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S UTC")
-                if t >= cutoff:
-                    node_times[node].append((t, total_time))
-            except Exception as ex:
-                logging.debug(f"⚠️ Skipping invalid measurement comment: {body} (error: {ex})")
-    node_data = []
+    if dataset is None:
+        dataset = load_onchain_dataset(GRAPH_DAYS)
+    run_render_jobs(gauge_jobs(dataset))
+
+def generate_daily_charts(dataset):
+    """Render the stacked graph, the bar chart, the gauge and the phase breakdown in parallel in the render pool."""
+    run_render_jobs(daily_graph_jobs(dataset) + gauge_jobs(dataset) + phase_breakdown_jobs(dataset))
+
+def prepare_daily_charts(graph_days=None):
+    """
+    Daily charts for the current on-chain dataset, rendered only if that exact dataset was not rendered before.
+
+    Returns:
+        artifact dict from save_artifact/load_artifact ({"key", "files", "rendered_at"}).
+    """
+    dataset = load_onchain_dataset(graph_days)
+    # Same samples under a different output profile or resolution threshold are different charts
+    key = f"{dataset.digest()}-{CHART_PROFILE.name}-{CHART_PROFILE.dpi}-{CHART_PROFILE.quality}-{CHART_MIN_POINTS}"
+    artifact = load_artifact(RENDER_ARTIFACT_FILE, key)
+    if artifact is not None:
+        age = time.time() - artifact["rendered_at"]
+        logging.info(f"♻️ Dataset {key[:12]} unchanged, reusing charts rendered {age:.0f}s ago")
+        return artifact
+    generate_daily_charts(dataset)
+    return save_artifact(RENDER_ARTIFACT_FILE, key, [MAIN_GRAPH_IMAGE, BAR_GRAPH_IMAGE, GAUGE_IMAGE, PHASE_GRAPH_IMAGE])
+
+def upload_chart(client, path, jwt=None):
+    """
+    Upload one chart file from memory, retrying up to UPLOAD_RETRIES times, and log
+    its size and upload time. Returns the image URL; raises the last error if every attempt failed.
+    """
+    with open(path, "rb") as f:
+        image_bytes = f.read()
+    for attempt in range(1, UPLOAD_RETRIES + 2):
+        start = time.perf_counter()
+        try:
+            image_url = client.upload_image_bytes(image_bytes, os.path.basename(path), PUBLIC_KEY,
+                                                  jwt=jwt, timeout=UPLOAD_TIMEOUT)
+        except Exception as e:
+            metrics.UPLOAD_FAILURES.labels(chart=os.path.basename(path)).inc()
+            if attempt > UPLOAD_RETRIES:
+                raise
+            logging.warning(f"⚠️ Upload of '{path}' failed after {time.perf_counter() - start:.2f}s (attempt {attempt}), retrying: {e}")
+            time.sleep(min(2 ** attempt, 10))
+            continue
+        upload_time = time.perf_counter() - start
+        metrics.UPLOAD_SECONDS.labels(chart=os.path.basename(path)).observe(upload_time)
+        metrics.UPLOAD_BYTES.labels(chart=os.path.basename(path)).inc(len(image_bytes))
+        logging.info(f"🖼️ Uploaded '{path}' ({len(image_bytes) / 1024:.0f} KB) in {upload_time:.2f}s")
+        return image_url
+
+def upload_charts(client, paths):
+    """
+    Upload all `paths` concurrently, authenticated by one shared JWT.
+
+    Returns:
+        image URLs in `paths` order, once every upload finished ([] if there is nothing to upload).
+    """
+    if not paths:
+        logging.warning("⚠️ No charts to upload")
+        return []
+    jwt = client.create_jwt()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(paths), thread_name_prefix="upload") as pool:
+        image_urls = list(pool.map(lambda path: upload_chart(client, path, jwt), paths))
+    logging.info(f"📤 Uploaded {len(paths)} charts in {time.perf_counter() - start:.2f}s")
+    return image_urls
+
+def render_for_deadline(target):
+    """
+    Render the daily charts ahead of the `target` post time.
+
+    With CATCHUP_RENDER_LEAD set, ingests again that many seconds before `target`
+    and re-renders only if samples arrived since, so the upload at `target` includes them.
+    """
+    artifact = prepare_daily_charts(GRAPH_DAYS)
+    if CATCHUP_RENDER_LEAD > 0:
+        catchup_time = target - datetime.timedelta(seconds=CATCHUP_RENDER_LEAD)
+        sleep_time = (catchup_time - datetime.datetime.utcnow()).total_seconds()
+        if sleep_time > 0:
+            logging.info(f"⏰ DesoMonitor: Catch-up render in {int(sleep_time//60)}m {int(sleep_time%60)}s at {catchup_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+            time.sleep(sleep_time)
+            artifact = prepare_daily_charts(GRAPH_DAYS)
+        else:
+            logging.warning(f"⚠️ Skipping catch-up render: pre-render finished after {catchup_time.strftime('%H:%M:%S UTC')}")
+    return artifact
+
+def latency_summary_lines(since):
+    """One "node: p50 · p90 · p99 · max" line of total times per node, merged from the local daily rollups since `since` (epoch seconds)."""
+    lines = []
     for node in NODES:
-        elapsed = [e for t, e in node_times[node] if e is not None]
-        if elapsed:
-            median = np.median(elapsed)
-            node_name = node.replace('https://', '').replace('http://', '')
-            if median < 15:
-                color = '#28a745'
-                status = 'EXCELLENT'
-            elif median < 30:
-                color = '#ffc107'
-                status = 'GOOD'
-            else:
-                color = '#dc3545'
-                status = 'SLOW'
-            node_data.append({'name': node_name, 'median': median, 'color': color, 'status': status})
-            logging.info(f"🎯 Gauge for {node}: {median:.2f}s median ({status})")
-    node_data.sort(key=lambda x: x['median'])
-    fig, ax = plt.subplots(figsize=(12, max(6, len(node_data) * 0.8)))
-    if not node_data:
-        ax.text(0.5, 0.5, 'No data available', ha='center', va='center', fontsize=18, color='gray', transform=ax.transAxes)
-        ax.set_axis_off()
-        plt.title('DeSo Node Performance Ranking\nMedian Response Times (24h)', fontsize=14, fontweight='bold', pad=20)
-        plt.tight_layout()
-        plt.savefig("daily_gauge.png", dpi=300, bbox_inches='tight')
-        plt.close()
-        logging.info("📈 Daily gauge graph saved as 'daily_gauge.png' (no data)")
-        return
-    names = [d['name'] for d in node_data]
-    medians = [d['median'] for d in node_data]
-    colors = [d['color'] for d in node_data]
-    statuses = [d['status'] for d in node_data]
-    y_pos = np.arange(len(names))
-    bars = ax.barh(y_pos, medians, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
-    for i, (bar, median, status) in enumerate(zip(bars, medians, statuses)):
-        width = bar.get_width()
-        ax.text(width + max(medians) * 0.01, bar.get_y() + bar.get_height()/2, f'{median:.1f}s ({status})', ha='left', va='center', fontweight='bold', fontsize=10)
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(names, fontsize=11)
-    ax.set_xlabel('Median Response Time (seconds)', fontsize=12)
-    ax.set_title('DeSo Node Performance Ranking\nMedian Response Times (24h)', fontsize=14, fontweight='bold', pad=20)
-    ax.axvspan(0, 15, alpha=0.1, color='green', label='Excellent (< 15s)')
-    ax.axvspan(15, 30, alpha=0.1, color='yellow', label='Good (15-30s)')
-    ax.axvspan(30, max(medians) * 1.1, alpha=0.1, color='red', label='Slow (> 30s)')
-    ax.grid(True, axis='x', alpha=0.3)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.legend(loc='lower right', fontsize=10)
-    plt.tight_layout()
-    plt.savefig("daily_gauge.png", dpi=300, bbox_inches='tight')
-    plt.close()
-    logging.info("🎯 Daily performance gauge saved as 'daily_gauge.png'")
-
-def daily_post():
+        merged = rollups.merged(node, "day", since=since)
+        summary = merged.summary("total") if merged is not None else None
+        if summary is not None:
+            lines.append(f"{node_label(node)}: p50 {summary['p50']:.1f}s · p90 {summary['p90']:.1f}s · "
+                         f"p99 {summary['p99']:.1f}s · max {summary['max']:.1f}s "
+                         f"({summary['probes']} probes, {summary['timeouts']} timed out)")
+    return lines
+
+def daily_post(artifact=None):
     logging.info("📋 DesoMonitor: Starting daily summary post creation...")
-    generate_daily_graph(GRAPH_DAYS)
-    generate_gauge()
-    body = f"\U0001F4C8 Daily Node Performance Summary\n{POST_TAG}"
+    # Upload the pre-rendered charts if they are still intact, otherwise render now
+    if artifact is None or load_artifact(RENDER_ARTIFACT_FILE, artifact["key"]) is None:
+        artifact = prepare_daily_charts(GRAPH_DAYS)
+    since = (int(time.time()) // 86400 - 1) * 86400  # start of the previous UTC day
+    summary_lines = latency_summary_lines(since)
+    for line in summary_lines:
+        logging.info(f"📐 {line}")
+    body = "\U0001F4C8 Daily Node Performance Summary\n"
+    if summary_lines:
+        body += f"Total time since {time.strftime('%Y-%m-%d', time.gmtime(since))} (UTC):\n" + "\n".join(summary_lines) + "\n"
+    body += POST_TAG
     try:
-        save_measurements()
+        save_measurements(force_compact=True)
         logging.info("📤 Posting daily summary to DeSo...")
-        client = DeSoDexClient(is_testnet=False, seed_phrase_or_hex=SEED_HEX, node_url=NODES[0])  # SEED_HEX from DESO_SEED_HEX
-        # Upload all graph images and get their URLs
-        image_url1 = client.upload_image(MAIN_GRAPH_IMAGE, PUBLIC_KEY)
-        image_url2 = client.upload_image("daily_performance_bar.png", PUBLIC_KEY)
+        client = get_deso_client(NODES[0])
+        # Upload all graph images (stacked graph, bar chart, gauge, phase breakdown) in parallel and get their URLs
+        image_urls = upload_charts(client, artifact["files"])
         post_resp = client.submit_post(
             updater_public_key_base58check=PUBLIC_KEY,
             body=body,
             parent_post_hash_hex=None,
             title="",
-            image_urls=[image_url1, image_url2],
+            image_urls=image_urls,
             video_urls=[],
             post_extra_data={"Node": NODES[0]},
             min_fee_rate_nanos_per_kb=1000,
@@ -554,55 +632,18 @@ def daily_post():
         print(f"Error posting daily summary: {e}")
         return None
 
-def daily_scheduler():
-    global NODES, SCHEDULE_INTERVAL, DAILY_POST_TIME, POST_TAG, GRAPH_DAYS, measurements
-    logging.info("📅 DesoMonitor: Daily scheduler started")
-
-    # Wait until 5 minutes before the next daily post to generate the graph
-    while True:
-        now = datetime.datetime.utcnow()
-        target = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        if now > target:
-            target += datetime.timedelta(days=1)
-        graph_time = target - datetime.timedelta(minutes=5)
-        sleep_time = (graph_time - now).total_seconds()
-        if sleep_time > 0:
-            logging.info(f"⏰ DesoMonitor: Next graph generation in {int(sleep_time//60)}m {int(sleep_time%60)}s at {graph_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-            time.sleep(sleep_time)
-        # Generate the graph for the last GRAPH_DAYS days
-        generate_daily_graph(GRAPH_DAYS)
-        generate_gauge()
-        # Wait until 0:00 to post the daily summary
-        now = datetime.datetime.utcnow()
-        sleep_to_post = (target - now).total_seconds()
-        if sleep_to_post > 0:
-            logging.info(f"⏰ DesoMonitor: Waiting {int(sleep_to_post//60)}m {int(sleep_to_post%60)}s to post daily summary at {target.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-            time.sleep(sleep_to_post)
-        # Re-read config at daily restart
-        config_result = load_config()
-        if len(config_result) == 6:
-            NODES, SCHEDULE_INTERVAL, DAILY_POST_TIME, POST_TAG, GRAPH_DAYS, MODE = config_result
-        else:
-            NODES, SCHEDULE_INTERVAL, DAILY_POST_TIME, POST_TAG, GRAPH_DAYS = config_result
-        # Re-init measurements for new/removed nodes
-        for node in NODES:
-            if node not in measurements:
-                measurements[node] = []
-        for node in list(measurements.keys()):
-            if node not in NODES:
-                del measurements[node]
-        # Create new daily post with the just-generated graph
-        new_parent_post_hash = daily_post()
-        if new_parent_post_hash:
-            parent_post_hash = new_parent_post_hash
-            logging.info("🔄 Daily post created, measurements continue under new post...")
-
 if __name__ == "__main__":
     logging.info("🚀 DesoMonitor: Starting up...")
     logging.info(f"📊 Configuration: {len(NODES)} nodes, {SCHEDULE_INTERVAL}s interval")
     for i, node in enumerate(NODES, 1):
         logging.info(f"   Node {i}: {node}")
 
+    # Fork the render workers now, before any other thread is running
+    render_pool.warm()
+    config_service.start_background_refresh()
+    if METRICS_PORT:
+        metrics.start_metrics_server(METRICS_PORT, METRICS_HOST)
+
     # --- Create or find today's daily post (with graph of last GRAPH_DAYS measurements) ---
     logging.info("📋 Creating today's daily summary post (with graph)...")
 
@@ -623,30 +664,23 @@ if __name__ == "__main__":
     def measurement_thread():
         logging.info("[DesoMonitor] Measurement thread started.")
         measurement_count = 0
-        last_config = None
+        applied_version = None
         while True:
-            # Always reload config and parent hash before each cycle
+            # Cached config: no network round trip here, and state only changes when the config post does
             config_result = load_config()
-            if len(config_result) == 6:
+            if config_service.version != applied_version:
+                applied_version = config_service.version
                 nodes, schedule_interval, daily_post_time, post_tag, graph_days, mode = config_result
-            else:
-                nodes, schedule_interval, daily_post_time, post_tag, graph_days = config_result
-                mode = "DAILY-CYCLE"
-            # Update globals for this cycle
-            global NODES, SCHEDULE_INTERVAL, DAILY_POST_TIME, POST_TAG, GRAPH_DAYS, MODE
-            NODES = nodes
-            SCHEDULE_INTERVAL = schedule_interval
-            DAILY_POST_TIME = daily_post_time
-            POST_TAG = post_tag
-            GRAPH_DAYS = graph_days
-            MODE = mode
-            # Ensure measurements dict is up to date
-            for node in NODES:
-                if node not in measurements:
-                    measurements[node] = []
-            for node in list(measurements.keys()):
-                if node not in NODES:
-                    del measurements[node]
+                # Update globals for this cycle
+                global NODES, SCHEDULE_INTERVAL, DAILY_POST_TIME, POST_TAG, GRAPH_DAYS, MODE
+                NODES = nodes
+                SCHEDULE_INTERVAL = schedule_interval
+                DAILY_POST_TIME = daily_post_time
+                POST_TAG = post_tag
+                GRAPH_DAYS = graph_days
+                MODE = mode
+                # Ensure measurements dict is up to date
+                sync_measurement_nodes(NODES)
             current_hash = get_parent_post_hash()
             if not current_hash:
                 logging.warning("Waiting for parent_post_hash to be set...")
@@ -654,18 +688,16 @@ if __name__ == "__main__":
                 continue
             measurement_count += 1
             logging.info(f"[DesoMonitor] Starting measurement cycle #{measurement_count} with parent_post_hash={current_hash}")
-            for i, node in enumerate(NODES, 1):
-                logging.info(f"🔍 DesoMonitor: Processing node {i}/{len(NODES)}: {node} (parent_post_hash={current_hash})")
-                try:
-                    post_measurement(node, current_hash)
-                except Exception as e:
-                    logging.error(f"❌ ERROR: Exception during monitoring node {node}: {e}")
-                    print(f"[DesoMonitor] ERROR posting measurement for node {node}: {e}")
-                    measurements[node].append((datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"), None))
-            next_run = datetime.datetime.utcnow() + datetime.timedelta(seconds=SCHEDULE_INTERVAL)
+            cycle_time = run_measurement_cycle(list(NODES), current_hash, measurement_count)
+            if cycle_time > SCHEDULE_INTERVAL:
+                metrics.CYCLE_OVERRUNS.inc()
+                logging.warning(f"⚠️ Measurement cycle #{measurement_count} overran SCHEDULE_INTERVAL ({cycle_time:.1f}s > {SCHEDULE_INTERVAL}s)")
+            # Keep cycle start times on the SCHEDULE_INTERVAL grid regardless of how long probing took
+            sleep_time = max(0, SCHEDULE_INTERVAL - cycle_time)
+            next_run = datetime.datetime.utcnow() + datetime.timedelta(seconds=sleep_time)
             logging.info(f"💤 DesoMonitor: Measurement cycle #{measurement_count} complete. Next run at {next_run.strftime('%H:%M:%S UTC')}")
             print(f"[DesoMonitor] Measurement cycle #{measurement_count} complete. Next run at {next_run.strftime('%H:%M:%S UTC')}")
-            time.sleep(SCHEDULE_INTERVAL)
+            time.sleep(sleep_time)
 
     logging.info("📡 Starting scheduled measurements thread...")
     threading.Thread(target=measurement_thread, daemon=True).start()
@@ -684,28 +716,22 @@ if __name__ == "__main__":
             if sleep_time > 0:
                 logging.info(f"⏰ DesoMonitor: Next graph generation in {int(sleep_time//60)}m {int(sleep_time%60)}s at {graph_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
                 time.sleep(sleep_time)
-            generate_daily_graph(GRAPH_DAYS)
-            generate_gauge()
+            artifact = render_for_deadline(target)
             now = datetime.datetime.utcnow()
             sleep_to_post = (target - now).total_seconds()
             if sleep_to_post > 0:
                 logging.info(f"⏰ DesoMonitor: Waiting {int(sleep_to_post//60)}m {int(sleep_to_post%60)}s to post daily summary at {target.strftime('%Y-%m-%d %H:%M:%S UTC')}")
                 time.sleep(sleep_to_post)
             # Reload config and update all globals for the new day
-            config_result = load_config()
+            config_result = load_config(refresh=True)
             if len(config_result) == 6:
                 NODES, SCHEDULE_INTERVAL, DAILY_POST_TIME, POST_TAG, GRAPH_DAYS, MODE = config_result
             else:
                 NODES, SCHEDULE_INTERVAL, DAILY_POST_TIME, POST_TAG, GRAPH_DAYS = config_result
                 MODE = "DAILY-CYCLE"
-            for node in NODES:
-                if node not in measurements:
-                    measurements[node] = []
-            for node in list(measurements.keys()):
-                if node not in NODES:
-                    del measurements[node]
+            sync_measurement_nodes(NODES)
             # Create new daily post and update parent_post_hash
-            new_parent_post_hash = daily_post()
+            new_parent_post_hash = daily_post(artifact)
             if new_parent_post_hash:
                 set_parent_post_hash(new_parent_post_hash)
                 logging.info("🔄 Daily post created, measurements continue under new post...")
@@ -728,4 +754,7 @@ if __name__ == "__main__":
             time.sleep(60)
     except KeyboardInterrupt:
         logging.info("🛑 DesoMonitor: Shutting down gracefully...")
+        store.flush()
+        # Release the keep-alive connections held for every probed node
+        close_pooled_sessions()
         print("\nDesoMonitor stopped.")
@@ -0,0 +1,366 @@
+"""
+asyncio counterpart of DeSoDexClient, built on aiohttp.
+
+AsyncDeSoDexClient covers the calls a measurement probe needs (submit_post,
+sign_and_submit_txn, get_transaction, wait_for_commitment_with_timeout,
+upload_image) with the same arguments and return values as the synchronous
+client. Key derivation, transaction signing and JWT creation are shared
+with deso_sdk, so both clients sign identically and reuse the same cached
+key pairs. Requests go through an aiohttp connector with a per-host
+connection limit, so one event loop can keep hundreds of probes in flight
+without a thread per request.
+
+    async with AsyncDeSoDexClient(seed_phrase_or_hex=seed_hex, node_url=node) as client:
+        resp = await client.submit_post(public_key, "hello")
+        submitted = await client.sign_and_submit_txn(resp)
+        await client.wait_for_commitment_with_timeout(submitted["TxnHashHex"], 120.0)
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import mimetypes
+from typing import Optional, Dict, Any, List
+
+import aiohttp
+
+from deso_sdk_fork.deso_sdk import DeSoDexClient, get_cached_key_pair, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+
+
+def create_async_session(pool_size: int = DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                         keep_alive: bool = True) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session for DeSo nodes. Must be called with an event loop running.
+
+    One session can be shared by the clients of many nodes: `pool_size` caps the open
+    connections per node (host), not in total.
+
+    Args:
+        pool_size: Maximum number of connections kept open to each node.
+        timeout: Default timeout in seconds, either a float or a (connect, read) tuple.
+        keep_alive: If False, close the connection after every request.
+
+    Returns:
+        aiohttp.ClientSession
+    """
+    if isinstance(timeout, tuple):
+        connect_timeout, read_timeout = timeout
+        client_timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+    else:
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=pool_size, force_close=not keep_alive)
+    return aiohttp.ClientSession(connector=connector, timeout=client_timeout)
+
+
+class AsyncDeSoDexClient:
+    """
+    An asyncio client for the DeSo node endpoints used to post and confirm transactions.
+
+    Args mirror DeSoDexClient. Pass `session` (from create_async_session) to share one
+    connection pool between clients; otherwise the client creates its own on first
+    use and closes it in close() / on leaving `async with`.
+    """
+
+    def __init__(self, is_testnet: bool = False, seed_phrase_or_hex=None, passphrase=None, index=0, node_url=None,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, keep_alive: bool = True,
+                 session: Optional[aiohttp.ClientSession] = None):
+        self.is_testnet = is_testnet
+
+        desoKeyPair, err = get_cached_key_pair(
+            seed_phrase_or_hex, passphrase, index, is_testnet,
+        )
+        if desoKeyPair is None:
+            raise ValueError(err)
+        self.deso_keypair = desoKeyPair
+
+        if node_url is None:
+            if is_testnet:
+                node_url = "https://test.deso.org"
+            else:
+                node_url = "https://node.deso.org"
+        self.node_url = node_url.rstrip("/")
+        self._session = session
+        self._owns_session = session is None
+        self._session_args = (pool_size, timeout, keep_alive)
+
+    # Signing only needs self.deso_keypair, so the synchronous implementations are reused as-is
+    sign_single_txn = DeSoDexClient.sign_single_txn
+    create_jwt = DeSoDexClient.create_jwt
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = create_async_session(*self._session_args)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session if this client created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                         error_type=aiohttp.ClientResponseError) -> Dict[str, Any]:
+        """POST `payload` as JSON and return the decoded response; non-2xx raises `error_type` with the body."""
+        async with self.session.post(url, json=payload, headers=headers) as response:
+            text = await response.text()
+            if response.status >= 400:
+                message = f"Error status returned from {url}: {response.status}, {text}"
+                if error_type is aiohttp.ClientResponseError:
+                    raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                      status=response.status, message=message)
+                raise error_type(message)
+            return json.loads(text)
+
+    async def submit_txn(self, unsigned_txn_hex: str, signature_hex: str) -> dict:
+        """
+        Submit a transaction with signature.
+
+        Raises:
+            aiohttp.ClientError: If the request fails.
+            ValueError: If the server returns a non-200 status code.
+        """
+        submit_url = f"{self.node_url}/api/v0/submit-transaction"
+        payload = {
+            "UnsignedTransactionHex": unsigned_txn_hex,
+            "TransactionSignatureHex": signature_hex
+        }
+        headers = {"Origin": self.node_url}
+        return await self._post_json(submit_url, payload, headers, error_type=ValueError)
+
+    async def submit_atomic_txn(
+            self,
+            incomplete_atomic_txn_hex: str,
+            unsigned_inner_txn_hexes: List[str],
+            txn_signatures_hex: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Submit an atomic transaction using the designated endpoint.
+
+        Raises:
+            aiohttp.ClientError: If the request fails or returns a non-2xx status.
+        """
+        url = f"{self.node_url}/api/v0/submit-atomic-transaction"
+        payload = {
+            "IncompleteAtomicTransactionHex": incomplete_atomic_txn_hex,
+            "UnsignedInnerTransactionsHex": unsigned_inner_txn_hexes,
+            "TransactionSignaturesHex": txn_signatures_hex
+        }
+        return await self._post_json(url, payload)
+
+    async def sign_and_submit_txn(self, resp):
+        """Sign the unsigned txn in a construct response (e.g. from submit_post) and submit it."""
+        unsigned_txn_hex = resp.get('TransactionHex')
+        if unsigned_txn_hex is None:
+            raise ValueError("TransactionHex not found in response")
+        if 'InnerTransactionHexes' in resp:
+            unsigned_inner_txn_hexes = resp.get('InnerTransactionHexes')
+            signature_hexes = [self.sign_single_txn(inner_hex) for inner_hex in unsigned_inner_txn_hexes]
+            return await self.submit_atomic_txn(unsigned_txn_hex, unsigned_inner_txn_hexes, signature_hexes)
+        signature_hex = self.sign_single_txn(unsigned_txn_hex)
+        return await self.submit_txn(unsigned_txn_hex, signature_hex)
+
+    async def get_transaction(self, txn_hash_hex: str, committed_txns_only: bool) -> Dict[str, Any]:
+        """
+        Fetch a transaction by its hash, from committed txns only or including the mempool.
+
+        Raises:
+            aiohttp.ClientError: If the request fails or returns a non-2xx status.
+        """
+        url = f"{self.node_url}/api/v0/get-txn"
+        payload = {
+            "TxnHashHex": txn_hash_hex,
+            "TxnStatus": "Committed" if committed_txns_only else "InMempool",
+        }
+        headers = {"Origin": self.node_url}
+        return await self._post_json(url, payload, headers)
+
+    async def wait_for_commitment_with_timeout(
+            self,
+            txn_hash_hex: str,
+            timeout_seconds: float,
+            expected_commit_seconds: float = 3.0,
+            initial_interval: float = 0.25,
+            max_interval: float = 5.0,
+            backoff_factor: float = 1.6,
+            jitter: float = 0.2,
+            track_mempool: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Wait for a transaction to commit, polling like DeSoDexClient.wait_for_commitment_with_timeout
+        (tight polls for 2 * expected_commit_seconds, then jittered exponential backoff). With
+        `track_mempool`, poll the mempool first and time when the txn was first seen there.
+
+        Returns:
+            Dict[str, Any]: "started_at", "pending_before", "committed_by" (time.monotonic()
+            clock) and "polls"; the commit happened inside [pending_before, committed_by].
+            With track_mempool, "mempool_pending_before" and "mempool_seen_by" bracket the
+            first sighting the same way.
+
+        Raises:
+            TimeoutError: If the transaction does not confirm within the timeout period.
+            Exception: If there is an error fetching the transaction from the node.
+        """
+        start_time = time.monotonic()
+        pending_before = start_time
+        interval = initial_interval
+        polls = 0
+        result = {"started_at": start_time}
+        seen = not track_mempool  # in the mempool (or no need to look there)
+        mempool_pending_before = start_time
+
+        while True:
+            sent_at = time.monotonic()
+            try:
+                txn_response = await self.get_transaction(txn_hash_hex, committed_txns_only=seen)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise Exception(f"Error getting txn from node: {str(e)}")
+            received_at = time.monotonic()
+            polls += 1
+            if not seen:
+                if txn_response.get("TxnFound", False):
+                    # First seen in the mempool; poll for the commit right away
+                    result["mempool_pending_before"] = mempool_pending_before
+                    result["mempool_seen_by"] = received_at
+                    # An InMempool lookup also finds committed txns, so the commit may already have
+                    # happened; only the last poll that found nothing bounds it from below
+                    pending_before = mempool_pending_before
+                    seen = True
+                    continue
+                mempool_pending_before = sent_at
+            elif txn_response.get("TxnFound", False):
+                result.update(pending_before=pending_before, committed_by=received_at, polls=polls)
+                return result
+            else:
+                pending_before = sent_at
+
+            elapsed = received_at - start_time
+            if elapsed > timeout_seconds:
+                raise TimeoutError(f"Timeout waiting for txn to confirm: {txn_hash_hex}")
+
+            if elapsed >= 2 * expected_commit_seconds:
+                interval = min(interval * backoff_factor, max_interval)
+                sleep_time = interval * random.uniform(1 - jitter, 1 + jitter)
+            else:
+                sleep_time = interval
+            await asyncio.sleep(max(0.0, min(sleep_time, timeout_seconds - elapsed)))
+
+    async def submit_post(
+            self,
+            updater_public_key_base58check: str,
+            body: str,
+            parent_post_hash_hex: Optional[str] = None,
+            reposted_post_hash_hex: Optional[str] = None,
+            title: Optional[str] = "",
+            image_urls: Optional[List[str]] = None,
+            video_urls: Optional[List[str]] = None,
+            post_extra_data: Optional[Dict[str, Any]] = None,
+            min_fee_rate_nanos_per_kb: int = 1000,
+            is_hidden: bool = False,
+            in_tutorial: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Construct a post or repost; sign and submit the result with sign_and_submit_txn.
+
+        Raises:
+            ValueError: If the request fails.
+        """
+        url = f"{self.node_url}/api/v0/submit-post"
+        payload = {
+            "UpdaterPublicKeyBase58Check": updater_public_key_base58check,
+            "PostHashHexToModify": "",
+            "ParentStakeID": parent_post_hash_hex or "",
+            "RepostedPostHashHex": reposted_post_hash_hex or "",
+            "Title": title or "",
+            "BodyObj": {
+                "Body": body,
+                "ImageURLs": image_urls or [],
+                "VideoURLs": video_urls or [],
+            },
+            "PostExtraData": post_extra_data or {"Node": "1"},
+            "Sub": "",
+            "IsHidden": is_hidden,
+            "MinFeeRateNanosPerKB": min_fee_rate_nanos_per_kb,
+            "InTutorial": in_tutorial,
+        }
+        return await self._post_json(url, payload, error_type=ValueError)
+
+    async def upload_image(
+            self,
+            image_path: str,
+            user_public_key_base58check: str,
+            extra_headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Upload an image file to DeSo and return the image URL.
+
+        Raises:
+            FileNotFoundError: If the image file doesn't exist.
+            aiohttp.ClientError: If the upload request fails.
+            ValueError: If ImageURL is missing from the response.
+        """
+        try:
+            image_bytes = await asyncio.to_thread(_read_file, image_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+        return await self.upload_image_bytes(image_bytes, os.path.basename(image_path), user_public_key_base58check,
+                                             extra_headers=extra_headers)
+
+    async def upload_image_bytes(
+            self,
+            image_bytes: bytes,
+            filename: str,
+            user_public_key_base58check: str,
+            mime_type: Optional[str] = None,
+            extra_headers: Optional[Dict[str, str]] = None,
+            jwt: Optional[str] = None,
+            timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Upload an in-memory image to DeSo and return the image URL.
+
+        Args match DeSoDexClient.upload_image_bytes; pass `jwt` from create_jwt() to
+        share one token across concurrent uploads, and `timeout` (seconds) to override the
+        session's default for this request.
+
+        Raises:
+            aiohttp.ClientError: If the upload request fails or returns a non-2xx status.
+            ValueError: If ImageURL is missing from the response.
+        """
+        url = f"{self.node_url}/api/v0/upload-image"
+        if mime_type is None:
+            mime_type, _ = mimetypes.guess_type(filename)
+        if not mime_type or not mime_type.startswith('image/'):
+            mime_type = 'image/png'
+
+        form = aiohttp.FormData()
+        form.add_field('file', image_bytes, filename=filename, content_type=mime_type)
+        form.add_field('UserPublicKeyBase58Check', user_public_key_base58check)
+        form.add_field('JWT', jwt or self.create_jwt())
+        headers = {'Origin': self.node_url}
+        if extra_headers:
+            headers.update(extra_headers)
+
+        request_args = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout is not None else {}
+        async with self.session.post(url, data=form, headers=headers, **request_args) as response:
+            text = await response.text()
+            if response.status >= 400:
+                raise aiohttp.ClientResponseError(response.request_info, response.history, status=response.status,
+                                                  message=f"Upload failed: {response.status}, {text}")
+            image_url = json.loads(text).get('ImageURL')
+        if not image_url:
+            raise ValueError("ImageURL not found in response")
+        return image_url
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
@@ -16,21 +16,222 @@ from coincurve import PrivateKey
 
 import hashlib
 from typing import Optional
-from ecdsa import SigningKey, SECP256k1
-from ecdsa.util import sigencode_der, sigdecode_der
 
 import time
+import random
+import socket
+import threading
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family, create_connection
+
+# Defaults for the per-node pooled HTTP sessions
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (10.0, 60.0)  # (connect, read) seconds
+
+
+_phase_timers = threading.local()
+
+
+class PhaseTimer:
+    """
+    Per-phase durations of one operation (e.g. a measurement probe), in seconds on the time.monotonic() clock.
+
+    While activate()d, the calling thread's requests record their connection
+    setup as "dns", "connect" and "tls" (nothing when a pooled connection is
+    reused), and sign_and_submit_txn records "sign" and "submit". Phases are
+    exclusive: a measure() block does not count time recorded by phases nested
+    inside it, so the phases add up to the wall time spent in them.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.total = 0.0
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self.total += seconds
+
+    @contextmanager
+    def measure(self, phase):
+        """Record the time spent in the block as `phase`, minus phases recorded inside it."""
+        start = time.monotonic()
+        nested_before = self.total
+        try:
+            yield self
+        finally:
+            elapsed = time.monotonic() - start
+            self.add(phase, elapsed - (self.total - nested_before))
+
+    @contextmanager
+    def activate(self):
+        """Make this the current thread's timer for the duration of the block."""
+        previous = getattr(_phase_timers, "timer", None)
+        _phase_timers.timer = self
+        try:
+            yield self
+        finally:
+            _phase_timers.timer = previous
+
+
+def current_phase_timer() -> Optional[PhaseTimer]:
+    """The PhaseTimer active in this thread, or None."""
+    return getattr(_phase_timers, "timer", None)
+
+
+@contextmanager
+def timed_phase(phase):
+    """Record the block as `phase` on the current thread's PhaseTimer, if one is active."""
+    timer = current_phase_timer()
+    if timer is None:
+        yield
+        return
+    with timer.measure(phase):
+        yield
+
+
+class _TimedConnectionMixin:
+    """
+    Reports DNS resolution and TCP connect time of new connections to the active PhaseTimer.
+
+    Takes the same steps as urllib3's _new_conn (resolve, then try each address in turn
+    with the connect timeout) and raises the same errors, with the lookup done once up
+    front so the two phases can be timed apart. The host urllib3 connects and verifies
+    TLS against is left untouched.
+    """
+
+    def _new_conn(self):
+        timer = current_phase_timer()
+        if timer is None:
+            return super()._new_conn()
+        with timer.measure("dns"):
+            try:
+                addresses = socket.getaddrinfo(self._dns_host.strip("[]"), self.port, allowed_gai_family(),
+                                               socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                raise NameResolutionError(self.host, self, e) from e
+        error = OSError("getaddrinfo returns an empty list")
+        with timer.measure("connect"):
+            for *_, sockaddr in addresses:
+                try:
+                    sock = create_connection((sockaddr[0], self.port), self.timeout,
+                                             source_address=self.source_address, socket_options=self.socket_options)
+                except OSError as e:
+                    error = e
+                    continue
+                sys.audit("http.client.connect", self, self.host, self.port)
+                return sock
+        if isinstance(error, socket.timeout):
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})") from error
+        raise NewConnectionError(self, f"Failed to establish a new connection: {error}") from error
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        # Everything connect() does besides _new_conn() is the TLS handshake
+        with timed_phase("tls"):
+            super().connect()
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that applies a default timeout to requests that don't set one.
+
+    Its connections report their setup phases to the thread's active PhaseTimer.
+    """
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_pooled_session(
+    node_url: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    timeout=DEFAULT_TIMEOUT,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """
+    Return the process-wide keep-alive session for a node, creating it on first use.
+
+    Every client that targets the same node_url shares one session (and so one
+    connection pool), so repeated calls reuse established TCP/TLS connections.
+    The pool size, timeout and keep-alive settings of the first caller win.
+
+    Args:
+        node_url: Base URL of the node.
+        pool_size: Maximum number of connections kept open to the node.
+        timeout: Default timeout in seconds, either a float or a (connect, read) tuple.
+        keep_alive: If False, ask the node to close the connection after every request.
+
+    Returns:
+        requests.Session: The shared session for node_url.
+    """
+    node_url = node_url.rstrip("/")
+    with _sessions_lock:
+        session = _sessions.get(node_url)
+        if session is None:
+            session = requests.Session()
+            adapter = TimeoutHTTPAdapter(
+                timeout=timeout,
+                pool_connections=1,
+                pool_maxsize=pool_size,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+            _sessions[node_url] = session
+        return session
+
+
+def close_pooled_sessions() -> None:
+    """Close and forget all pooled sessions (e.g. on shutdown or in forked workers)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
 
 class DeSoDexClient:
     """
     A Python client for interacting with the DeSo DEX endpoints on a DeSo node.
     """
 
-    def __init__(self, is_testnet: bool=False, seed_phrase_or_hex=None, passphrase=None, index=0, node_url=None):
+    def __init__(self, is_testnet: bool=False, seed_phrase_or_hex=None, passphrase=None, index=0, node_url=None,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, keep_alive: bool = True):
         self.is_testnet = is_testnet
 
-        desoKeyPair, err = create_key_pair_from_seed_or_seed_hex(
+        desoKeyPair, err = get_cached_key_pair(
             seed_phrase_or_hex, passphrase, index, is_testnet,
         )
         if desoKeyPair is None:
@@ -43,6 +244,8 @@ class DeSoDexClient:
             else:
                 node_url = "https://node.deso.org"
         self.node_url = node_url.rstrip("/")
+        # Shared with every other client that talks to the same node
+        self.session = get_pooled_session(self.node_url, pool_size, timeout, keep_alive)
 
     def sign_single_txn(self, unsigned_txn_hex: str) -> str:
         try:
@@ -53,11 +256,8 @@ class DeSoDexClient:
             first_hash = hashlib.sha256(txn_bytes).digest()
             txn_hash = hashlib.sha256(first_hash).digest()
 
-            # Create signing key from private key bytes
-            signing_key = SigningKey.from_string(self.deso_keypair.private_key, curve=SECP256k1)
-
-            # Sign the hash
-            signature = signing_key.sign_digest(txn_hash, sigencode=sigencode_der)
+            # Sign the hash with the cached libsecp256k1 key (DER-encoded signature)
+            signature = self.deso_keypair.sign_digest_der(txn_hash)
 
             # Convert signature to hex
             signature_hex = signature.hex()
@@ -96,7 +296,7 @@ class DeSoDexClient:
             "Content-Type": "application/json"
         }
 
-        response = requests.post(
+        response = self.session.post(
             submit_url,
             data=json.dumps(payload),
             headers=headers
@@ -144,7 +344,7 @@ class DeSoDexClient:
             "TransactionSignaturesHex": txn_signatures_hex
         }
 
-        response = requests.post(url, json=payload)
+        response = self.session.post(url, json=payload)
 
         try:
             response.raise_for_status()
@@ -166,14 +366,18 @@ class DeSoDexClient:
         if 'InnerTransactionHexes' in resp:
             unsigned_inner_txn_hexes = resp.get('InnerTransactionHexes')
             signature_hexes = []
-            for unsigned_inner_txn_hex in unsigned_inner_txn_hexes:
-                signature_hex = self.sign_single_txn(unsigned_inner_txn_hex)
-                signature_hexes.append(signature_hex)
-            return self.submit_atomic_txn(
-                unsigned_txn_hex, unsigned_inner_txn_hexes, signature_hexes
-            )
-        signature_hex = self.sign_single_txn(unsigned_txn_hex)
-        return self.submit_txn(unsigned_txn_hex, signature_hex)
+            with timed_phase("sign"):
+                for unsigned_inner_txn_hex in unsigned_inner_txn_hexes:
+                    signature_hex = self.sign_single_txn(unsigned_inner_txn_hex)
+                    signature_hexes.append(signature_hex)
+            with timed_phase("submit"):
+                return self.submit_atomic_txn(
+                    unsigned_txn_hex, unsigned_inner_txn_hexes, signature_hexes
+                )
+        with timed_phase("sign"):
+            signature_hex = self.sign_single_txn(unsigned_txn_hex)
+        with timed_phase("submit"):
+            return self.submit_txn(unsigned_txn_hex, signature_hex)
 
     def create_unsigned_atomic_txn(self, unsigned_transaction_hexes: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -199,7 +403,7 @@ class DeSoDexClient:
             "Content-Type": "application/json"
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.session.post(url, json=payload, headers=headers)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -253,7 +457,7 @@ class DeSoDexClient:
             "Content-Type": "application/json",
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.session.post(url, json=payload, headers=headers)
 
         try:
             response.raise_for_status()
@@ -263,7 +467,17 @@ class DeSoDexClient:
 
         return response.json()
 
-    def wait_for_commitment_with_timeout(self, txn_hash_hex: str, timeout_seconds: float) -> None:
+    def wait_for_commitment_with_timeout(
+            self,
+            txn_hash_hex: str,
+            timeout_seconds: float,
+            expected_commit_seconds: float = 3.0,
+            initial_interval: float = 0.25,
+            max_interval: float = 5.0,
+            backoff_factor: float = 1.6,
+            jitter: float = 0.2,
+            track_mempool: bool = False,
+    ) -> Dict[str, Any]:
         """
         Waits for a transaction to commit within a specified timeout period. DeSo txns commit
         within two blocks, with 1s block times, so within 3s. Note you don't necessarily need
@@ -271,28 +485,80 @@ class DeSoDexClient:
         use get_transaction to check that it entered the mempool, which is sufficient for most
         use-cases (and mempool txns almost always commit within a few seconds).
 
+        Polling is tight (initial_interval) for the first 2 * expected_commit_seconds, then
+        backs off exponentially with +/- jitter up to max_interval, so a slow commit costs a
+        few dozen requests instead of one every 100 ms.
+
         Args:
             txn_hash_hex (str): The transaction hash in hex format.
             timeout_seconds (float): The maximum time to wait for confirmation, in seconds.
+            expected_commit_seconds (float): Typical commit latency the tight polling window is centred on.
+            initial_interval (float): Poll interval inside the tight window, in seconds.
+            max_interval (float): Upper bound on the backed-off poll interval, in seconds.
+            backoff_factor (float): Multiplier applied to the interval after the tight window.
+            jitter (float): Relative random jitter applied to each backed-off interval.
+            track_mempool (bool): Poll for the txn in the node's mempool first, and time when it was first seen there.
+
+        Returns:
+            Dict[str, Any]: Timing of the polls that bracket the commit, all on the
+            time.monotonic() clock:
+                "started_at": when waiting began,
+                "pending_before": send time of the last poll that did not see the txn
+                    committed (started_at if the first poll already saw it; with track_mempool,
+                    the mempool polls count too, as an InMempool lookup also finds committed txns),
+                "committed_by": receive time of the first poll that saw it committed,
+                "polls": number of get-txn requests made.
+            The commit happened inside [pending_before, committed_by]. With track_mempool,
+            "mempool_pending_before" and "mempool_seen_by" bracket the first sighting the same way.
 
         Raises:
             TimeoutError: If the transaction does not confirm within the timeout period.
             Exception: If there is an error fetching the transaction from the node.
         """
-        start_time = time.time()
+        start_time = time.monotonic()
+        pending_before = start_time
+        interval = initial_interval
+        polls = 0
+        result = {"started_at": start_time}
+        seen = not track_mempool  # in the mempool (or no need to look there)
+        mempool_pending_before = start_time
 
         while True:
+            sent_at = time.monotonic()
             try:
-                txn_response = self.get_transaction(txn_hash_hex, committed_txns_only=True)
-                if txn_response.get("TxnFound", False):
-                    return  # Transaction is confirmed
+                txn_response = self.get_transaction(txn_hash_hex, committed_txns_only=seen)
             except RequestException as e:
                 raise Exception(f"Error getting txn from node: {str(e)}")
+            received_at = time.monotonic()
+            polls += 1
+            if not seen:
+                if txn_response.get("TxnFound", False):
+                    # First seen in the mempool; poll for the commit right away
+                    result["mempool_pending_before"] = mempool_pending_before
+                    result["mempool_seen_by"] = received_at
+                    # An InMempool lookup also finds committed txns, so the commit may already have
+                    # happened; only the last poll that found nothing bounds it from below
+                    pending_before = mempool_pending_before
+                    seen = True
+                    continue
+                mempool_pending_before = sent_at
+            elif txn_response.get("TxnFound", False):
+                # Transaction is confirmed
+                result.update(pending_before=pending_before, committed_by=received_at, polls=polls)
+                return result
+            else:
+                pending_before = sent_at
 
-            if time.time() - start_time > timeout_seconds:
+            elapsed = received_at - start_time
+            if elapsed > timeout_seconds:
                 raise TimeoutError(f"Timeout waiting for txn to confirm: {txn_hash_hex}")
 
-            time.sleep(0.1)  # Sleep for 100 milliseconds before retrying
+            if elapsed >= 2 * expected_commit_seconds:
+                interval = min(interval * backoff_factor, max_interval)
+                sleep_time = interval * random.uniform(1 - jitter, 1 + jitter)
+            else:
+                sleep_time = interval
+            time.sleep(max(0.0, min(sleep_time, timeout_seconds - elapsed)))
 
     def coins_to_base_units(self, coin_amount: float, is_deso: bool, hex_encode: bool = False) -> str:
         if is_deso:
@@ -343,7 +609,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = requests.post(url, json=payload, headers=headers)
+        resp = self.session.post(url, json=payload, headers=headers)
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -386,7 +652,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.session.post(url, json=payload, headers=headers)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -418,7 +684,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = requests.post(url, json=payload, headers=headers)
+        resp = self.session.post(url, json=payload, headers=headers)
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -449,7 +715,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = requests.post(url, json=payload, headers=headers)
+        resp = self.session.post(url, json=payload, headers=headers)
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -494,7 +760,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = requests.post(url, json=payload, headers=headers)
+        resp = self.session.post(url, json=payload, headers=headers)
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -523,7 +789,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = requests.post(url, json=payload, headers=headers)
+        resp = self.session.post(url, json=payload, headers=headers)
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -570,7 +836,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.session.post(url, json=payload, headers=headers)
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -617,7 +883,7 @@ class DeSoDexClient:
             headers.update(extra_headers)
 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = self.session.post(url, json=payload, headers=headers)
             response.raise_for_status()
         except requests.exceptions.HTTPError as err:
             # Handle 404 gracefully.
@@ -650,7 +916,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = requests.post(url, json=payload, headers=headers)
+        resp = self.session.post(url, json=payload, headers=headers)
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -673,7 +939,7 @@ class DeSoDexClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = requests.post(url, json=payload, headers=headers)
+        resp = self.session.post(url, json=payload, headers=headers)
         try:
             resp.raise_for_status()
         except requests.exceptions.HTTPError as e:
@@ -681,6 +947,47 @@ class DeSoDexClient:
             raise requests.exceptions.HTTPError(f"HTTP Error: {e}, Response: {error_json}")
         return resp.json()
 
+    def create_jwt(self, expiry_seconds: int = 600) -> str:
+        """
+        Create an ES256 JWT signed with this client's key, as used by upload-image.
+
+        Args:
+            expiry_seconds (int): Token lifetime; DeSo accepts up to 10 minutes.
+
+        Returns:
+            str: The encoded JWT.
+        """
+        import base64
+
+        # JWT Header - DeSo uses ES256 algorithm with secp256k1 curve
+        header = {
+            "alg": "ES256",  # DeSo uses ES256 (not ES256K) as shown in docs
+            "typ": "JWT"
+        }
+
+        # JWT Payload - simplified to match DeSo format
+        current_time = int(time.time())
+        payload = {
+            "iat": current_time,
+            "exp": current_time + expiry_seconds
+        }
+
+        # Encode header and payload
+        header_b64 = base64.urlsafe_b64encode(json.dumps(header, separators=(',', ':')).encode()).decode().rstrip('=')
+        payload_b64 = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+        # Create message to sign
+        message = f"{header_b64}.{payload_b64}"
+
+        # Sign using the private key with secp256k1 curve for ES256
+        # For ES256, we sign the message hash and need raw signature format (r,s)
+        message_hash = hashlib.sha256(message.encode()).digest()
+        # ES256 expects 64 bytes: 32 bytes r + 32 bytes s
+        signature = self.deso_keypair.sign_digest_rs(message_hash)
+        signature_b64 = base64.urlsafe_b64encode(signature).decode().rstrip('=')
+
+        return f"{message}.{signature_b64}"
+
     def upload_image(
             self,
             image_path: str,
@@ -704,106 +1011,99 @@ class DeSoDexClient:
             ValueError: If the server returns a non-200 status code or ImageURL not found.
             FileNotFoundError: If the image file doesn't exist.
         """
+        try:
+            with open(image_path, 'rb') as image_file:
+                image_bytes = image_file.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+        return self.upload_image_bytes(image_bytes, os.path.basename(image_path), user_public_key_base58check,
+                                       extra_headers=extra_headers)
+
+    def upload_image_bytes(
+            self,
+            image_bytes: bytes,
+            filename: str,
+            user_public_key_base58check: str,
+            mime_type: Optional[str] = None,
+            extra_headers: Optional[Dict[str, str]] = None,
+            jwt: Optional[str] = None,
+            timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Upload an in-memory image to DeSo and return the image URL.
+
+        Args:
+            image_bytes (bytes): Encoded image (PNG, JPEG, GIF or WebP).
+            filename (str): File name sent with the upload; also used to guess the MIME type.
+            user_public_key_base58check (str): Public key of the user uploading the image.
+            mime_type (Optional[str]): MIME type; guessed from `filename` if None.
+            extra_headers (Optional[Dict[str, str]]): Additional headers for the HTTP request.
+            jwt (Optional[str]): JWT from create_jwt(), to share one token across several uploads;
+                a fresh one is created if None.
+            timeout (Optional[float]): Request timeout in seconds; the session default if None.
+
+        Returns:
+            str: The URL where the uploaded image can be accessed.
+
+        Raises:
+            requests.exceptions.RequestException: If the upload request fails.
+            json.JSONDecodeError: If the response parsing fails.
+            ValueError: If the server returns a non-200 status code or ImageURL not found.
+        """
         url = f"{self.node_url}/api/v0/upload-image"
         
         try:
-            # Generate JWT token for authentication
-            import time
-            import json
-            import base64
-            from ecdsa import SigningKey, SECP256k1
-            import hashlib
-            
-            # JWT Header - DeSo uses ES256 algorithm with secp256k1 curve  
-            header = {
-                "alg": "ES256",  # DeSo uses ES256 (not ES256K) as shown in docs
-                "typ": "JWT"
-            }
-            
-            # JWT Payload - simplified to match DeSo format
-            current_time = int(time.time())
-            payload = {
-                "iat": current_time,
-                "exp": current_time + 600  # 10 minutes expiry as per DeSo docs
-            }
-            
-            # Encode header and payload
-            header_b64 = base64.urlsafe_b64encode(json.dumps(header, separators=(',', ':')).encode()).decode().rstrip('=')
-            payload_b64 = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
-            
-            # Create message to sign
-            message = f"{header_b64}.{payload_b64}"
-            
-            # Sign using the private key with secp256k1 curve for ES256
-            signing_key = SigningKey.from_string(self.deso_keypair.private_key, curve=SECP256k1)
-            # For ES256, we sign the message hash and need raw signature format (r,s)
-            message_hash = hashlib.sha256(message.encode()).digest()
-            # Use the default sigencode which gives us (r,s) tuple, then concatenate
-            signature_raw = signing_key.sign_digest(message_hash)
-            # ES256 expects 64 bytes: 32 bytes r + 32 bytes s
-            if len(signature_raw) == 64:
-                signature = signature_raw
-            else:
-                # If we get DER format, extract r and s values and concatenate
-                from ecdsa.util import sigdecode_der
-                r, s = sigdecode_der(signature_raw, signing_key.curve.order)
-                signature = r.to_bytes(32, 'big') + s.to_bytes(32, 'big')
-            signature_b64 = base64.urlsafe_b64encode(signature).decode().rstrip('=')
-            
-            # Create final JWT
-            jwt_token = f"{message}.{signature_b64}"
+            # One JWT can authenticate a whole batch of uploads; create one per call otherwise
+            jwt_token = jwt or self.create_jwt()
             
             # Determine MIME type based on file extension
-            import mimetypes
-            mime_type, _ = mimetypes.guess_type(image_path)
+            if mime_type is None:
+                mime_type, _ = mimetypes.guess_type(filename)
             if not mime_type or not mime_type.startswith('image/'):
                 # Default to common image types
-                if image_path.lower().endswith('.png'):
+                if filename.lower().endswith('.png'):
                     mime_type = 'image/png'
-                elif image_path.lower().endswith('.jpg') or image_path.lower().endswith('.jpeg'):
+                elif filename.lower().endswith('.jpg') or filename.lower().endswith('.jpeg'):
                     mime_type = 'image/jpeg'
-                elif image_path.lower().endswith('.gif'):
+                elif filename.lower().endswith('.gif'):
                     mime_type = 'image/gif'
-                elif image_path.lower().endswith('.webp'):
+                elif filename.lower().endswith('.webp'):
                     mime_type = 'image/webp'
                 else:
                     mime_type = 'image/png'  # Default fallback
             
-            with open(image_path, 'rb') as image_file:
-                files = {'file': (os.path.basename(image_path), image_file, mime_type)}  # Include filename and MIME type
-                data = {
-                    'UserPublicKeyBase58Check': user_public_key_base58check,
-                    'JWT': jwt_token
-                }
-                headers = {'Origin': self.node_url}
-                
-                if extra_headers:
-                    headers.update(extra_headers)
-                
-                response = requests.post(url, files=files, data=data, headers=headers)
-                
-                try:
-                    response.raise_for_status()
-                except requests.exceptions.HTTPError as e:
-                    try:
-                        error_json = response.json()
-                    except ValueError:
-                        error_json = response.text
-                    raise requests.exceptions.HTTPError(f"HTTP Error: {e}, Response: {error_json}")
-                
+            files = {'file': (filename, image_bytes, mime_type)}  # Include filename and MIME type
+            data = {
+                'UserPublicKeyBase58Check': user_public_key_base58check,
+                'JWT': jwt_token
+            }
+            headers = {'Origin': self.node_url}
+            
+            if extra_headers:
+                headers.update(extra_headers)
+            
+            response = self.session.post(url, files=files, data=data, headers=headers, timeout=timeout)
+            
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
                 try:
-                    response_data = response.json()
-                except json.JSONDecodeError as e:
-                    raise json.JSONDecodeError(f"Error parsing upload response: {str(e)}")
-                
-                image_url = response_data.get('ImageURL')
-                if not image_url:
-                    raise ValueError("ImageURL not found in response")
-                
-                return image_url
+                    error_json = response.json()
+                except ValueError:
+                    error_json = response.text
+                raise requests.exceptions.HTTPError(f"HTTP Error: {e}, Response: {error_json}")
+            
+            try:
+                response_data = response.json()
+            except json.JSONDecodeError as e:
+                raise json.JSONDecodeError(f"Error parsing upload response: {str(e)}")
+            
+            image_url = response_data.get('ImageURL')
+            if not image_url:
+                raise ValueError("ImageURL not found in response")
+            
+            return image_url
                 
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Image file not found: {image_path}")
         except requests.exceptions.RequestException as e:
             raise requests.exceptions.RequestException(f"Upload request failed: {str(e)}")
 
@@ -866,7 +1166,7 @@ class DeSoDexClient:
             "Content-Type": "application/json",
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.session.post(url, json=payload, headers=headers)
 
         try:
             response.raise_for_status()
@@ -910,7 +1210,7 @@ class DeSoDexClient:
             "Content-Type": "application/json",
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self.session.post(url, json=payload, headers=headers)
 
         try:
             response.raise_for_status()
@@ -924,6 +1224,23 @@ class DeSoKeyPair:
     def __init__(self, public_key: bytes, private_key: bytes):
         self.public_key = public_key
         self.private_key = private_key
+        self._signing_key = None
+
+    @property
+    def signing_key(self) -> PrivateKey:
+        """Native libsecp256k1 signing key, built once and reused for every signature."""
+        if self._signing_key is None:
+            self._signing_key = PrivateKey(self.private_key)
+        return self._signing_key
+
+    def sign_digest_der(self, digest: bytes) -> bytes:
+        """Sign a 32-byte digest and return a DER-encoded signature (used for txns)."""
+        return self.signing_key.sign(digest, hasher=None)
+
+    def sign_digest_rs(self, digest: bytes) -> bytes:
+        """Sign a 32-byte digest and return the raw 64-byte r||s signature (used for ES256 JWTs)."""
+        # Recoverable signatures are r||s||v; drop the recovery id
+        return self.signing_key.sign_recoverable(digest, hasher=None)[:64]
 
 def create_key_pair_from_seed_or_seed_hex(
     seed: str,
@@ -986,6 +1303,79 @@ def create_key_pair_from_seed_or_seed_hex(
         except Exception as e:
             return None, f"Error converting seed to key pair: {str(e)}"
 
+_key_pairs: Dict[Tuple, DeSoKeyPair] = {}
+_key_pairs_lock = threading.Lock()
+
+
+def get_cached_key_pair(
+    seed: str,
+    passphrase: str,
+    index: int,
+    is_testnet: bool
+) -> Tuple[Optional[DeSoKeyPair], Optional[str]]:
+    """
+    Same as create_key_pair_from_seed_or_seed_hex, but derives each key pair only once per process.
+
+    Mnemonic seeds need a BIP39 PBKDF2 stretch plus a BIP32 derivation, so
+    clients created repeatedly for the same seed reuse the cached result.
+    Failed derivations are not cached.
+    """
+    key = (seed, passphrase or "", index, is_testnet)
+    with _key_pairs_lock:
+        key_pair = _key_pairs.get(key)
+        if key_pair is not None:
+            return key_pair, None
+        key_pair, err = create_key_pair_from_seed_or_seed_hex(seed, passphrase, index, is_testnet)
+        if key_pair is not None:
+            _key_pairs[key] = key_pair
+        return key_pair, err
+
+
+_clients: Dict[Tuple, DeSoDexClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(
+    node_url: Optional[str] = None,
+    seed_phrase_or_hex: Optional[str] = None,
+    passphrase: Optional[str] = None,
+    index: int = 0,
+    is_testnet: bool = False,
+    **session_kwargs
+) -> DeSoDexClient:
+    """
+    Return the process-wide DeSoDexClient for (node_url, seed), creating it on first use.
+
+    Args:
+        node_url: Base URL of the node, or None for the network default.
+        seed_phrase_or_hex: Seed phrase or seed hex used for signing.
+        passphrase: Optional BIP39 passphrase.
+        index: Account index for mnemonic derivation.
+        is_testnet: Whether to use testnet parameters.
+        **session_kwargs: pool_size / timeout / keep_alive, used only when the client is created.
+
+    Returns:
+        DeSoDexClient: The cached client.
+
+    Raises:
+        ValueError: If the seed cannot be converted to a key pair.
+    """
+    key = ((node_url or "").rstrip("/"), seed_phrase_or_hex, passphrase or "", index, is_testnet)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = DeSoDexClient(
+                is_testnet=is_testnet,
+                seed_phrase_or_hex=seed_phrase_or_hex,
+                passphrase=passphrase,
+                index=index,
+                node_url=node_url,
+                **session_kwargs
+            )
+            _clients[key] = client
+        return client
+
+
 def base58_check_encode(input_bytes: bytes, is_testnet: bool) -> str:
      """
      Encode input bytes using Base58Check encoding with a specific prefix.
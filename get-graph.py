@@ -1,15 +1,19 @@
 import os
 import json
+import calendar
 import datetime
 import matplotlib.pyplot as plt
 import requests
 from dotenv import load_dotenv
 from deso_sdk import DeSoDexClient
+from onchain_data import iter_post_comments
+from measurement_parser import parse_comment_posts
 
 # Load keys from .env
 load_dotenv()
 SEED_HEX = os.getenv("DESO_SEED_HEX", "").replace('"','').replace("'","").strip()
 PUBLIC_KEY = os.getenv("DESO_PUBLIC_KEY", "").replace('"','').replace("'","").strip()
+COMMENT_PAGE_SIZE = int(os.getenv("COMMENT_PAGE_SIZE", "200"))
 
 # Hardcoded config post hash
 CONFIG_POST_HASH = "91522722c35f6b38588f059723ae3a401a92ae7a09826c6a987bf511d02f21aa"
@@ -31,39 +35,23 @@ def fetch_config_from_post(post_hash):
 # Helper to fetch all measurement comments for a given parent post
 # (Assumes parent post is the daily summary post)
 def fetch_measurements_for_day(parent_post_hash):
-    # Fetch all comments (replies) to the daily post using /get-single-post
-    url = "https://node.deso.org/api/v0/get-single-post"
-    # Dynamically determine expected number of measurement comments
-    config = fetch_config_from_post(CONFIG_POST_HASH)
-    nodes = config.get("NODES", ["https://node.deso.org"])
-    if isinstance(nodes, str):
-        nodes = [n.strip() for n in nodes.split(",") if n.strip()]
-    schedule_interval = int(config.get("SCHEDULE_INTERVAL", 3600))
-    # Measurements per day per node
-    per_node_per_day = int(24 * 60 * 60 / schedule_interval)
-    expected_comments = len(nodes) * per_node_per_day
-    comment_limit = int(expected_comments * 1.2)  # 20% buffer
-    payload = {"PostHashHex": parent_post_hash, "CommentOffset": 0, "CommentLimit": comment_limit}
+    # Stream all comments (replies) to the daily post, page by page over CommentOffset
+    client = DeSoDexClient(is_testnet=False, seed_phrase_or_hex=SEED_HEX)
+    print(f"\n[DEBUG] Raw comments fetched from /get-single-post for post {parent_post_hash}:")
+    measurement_comments = []
     try:
-        resp = requests.post(url, json=payload)
-        resp.raise_for_status()
-        post_data = resp.json()
+        for idx, c in enumerate(iter_post_comments(client, parent_post_hash, COMMENT_PAGE_SIZE)):
+            body = c.get("Body", "")
+            poster = c.get("PosterPublicKeyBase58Check", "")
+            comment_hash = c.get("PostHashHex", "")
+            parent_hash = c.get("ParentPostHashHex", "")
+            print(f"  [{idx}] Poster: {poster}\n      PostHashHex: {comment_hash}\n      ParentPostHashHex: {parent_hash}\n      Body: {body}\n---")
+            # Filter by measurement tag
+            if "#desomonitormeasurement" in body:
+                measurement_comments.append(c)
     except Exception as e:
         print(f"Error fetching post: {e}")
         return []
-
-    # Print all raw comments for debug
-    comments = post_data.get("PostFound", {}).get("Comments", [])
-    print(f"\n[DEBUG] Raw comments fetched from /get-single-post for post {parent_post_hash}:")
-    for idx, c in enumerate(comments):
-        body = c.get("Body", "")
-        poster = c.get("PosterPublicKeyBase58Check", "")
-        comment_hash = c.get("PostHashHex", "")
-        parent_hash = c.get("ParentPostHashHex", "")
-        print(f"  [{idx}] Poster: {poster}\n      PostHashHex: {comment_hash}\n      ParentPostHashHex: {parent_hash}\n      Body: {body}\n---")
-
-    # Filter by measurement tag
-    measurement_comments = [c for c in comments if "#desomonitormeasurement" in c.get("Body", "")]
     print(f"[DEBUG] Found {len(measurement_comments)} measurement comments with tag '#desomonitormeasurement'.")
     return measurement_comments
 
@@ -135,20 +123,13 @@ if __name__ == "__main__":
         print(f"No measurement comments found for post hash {parent_post_hash}.")
         # Debug: Try to fetch and print the raw API response for diagnosis
         print("Debug: Fetching raw API response for comments...")
-        config = fetch_config_from_post(CONFIG_POST_HASH)
-        nodes = config.get("NODES", ["https://node.deso.org"])
-        if isinstance(nodes, str):
-            nodes = [n.strip() for n in nodes.split(",") if n.strip()]
-        schedule_interval = int(config.get("SCHEDULE_INTERVAL", 3600))
-        per_node_per_day = int(24 * 60 * 60 / schedule_interval)
-        comment_limit = int(len(nodes) * per_node_per_day * 1.2)
         client = DeSoDexClient(is_testnet=False, seed_phrase_or_hex=SEED_HEX)
         url = f"{client.node_url}/api/v0/get-posts-stateless"
         payload = {
             "PostHashHex": parent_post_hash,
             "FetchParents": False,
             "CommentOffset": 0,
-            "CommentLimit": comment_limit
+            "CommentLimit": COMMENT_PAGE_SIZE
         }
         try:
             resp = requests.post(url, json=payload)
@@ -168,48 +149,33 @@ if __name__ == "__main__":
         print(f"ParentStakeID: {comment.get('ParentStakeID','')}")
         print(f"-------------------")
 
-    # Parse measurement data for POST and CONFIRM
+    # Parse measurement data for POST and CONFIRM (timestamps as epoch seconds)
     node_post = {node: [] for node in NODES}
     node_confirm = {node: [] for node in NODES}
-    for comment in comments:
-        body = comment.get("Body", "")
-        node = comment.get("PostExtraData", {}).get("Node")
-        post_time = None
-        confirm_time = None
-        timestamp = None
-        # Try to parse POST, CONFIRM, and timestamp from body
-        for line in body.splitlines():
-            if line.startswith("POST:"):
-                try:
-                    post_time = float(line.split(":",1)[1].split()[0])
-                except:
-                    pass
-            if line.startswith("CONFIRM:"):
-                try:
-                    confirm_time = float(line.split(":",1)[1].split()[0])
-                except:
-                    pass
-            if line.startswith("Timestamp:"):
-                try:
-                    timestamp = line.split(":",1)[1].strip()
-                except:
-                    pass
-        if node and timestamp:
-            if post_time is not None:
-                node_post[node].append((timestamp, post_time))
-            if confirm_time is not None:
-                node_confirm[node].append((timestamp, confirm_time))
+    records = parse_comment_posts(comments)
+    for comment, record in zip(comments, records):
+        if record is None:
+            continue
+        node, timestamp, post_time, confirm_time, _ = record.sample()
+        node = comment.get("PostExtraData", {}).get("Node") or node
+        if node not in node_post:
+            continue
+        if post_time is not None:
+            node_post[node].append((timestamp, post_time))
+        if confirm_time is not None:
+            node_confirm[node].append((timestamp, confirm_time))
 
     # Plot POST and CONFIRM speeds in subplots, line+marker style
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
     cutoff = post_dt - datetime.timedelta(days=0)
     end_cutoff = post_dt + datetime.timedelta(days=GRAPH_DAYS)
+    cutoff_epoch = calendar.timegm(cutoff.timetuple())
+    end_cutoff_epoch = calendar.timegm(end_cutoff.timetuple())
 
     # POST Speed
     for node in NODES:
-        filtered = [(t, e) for t, e in node_post[node]
-                    if cutoff <= datetime.datetime.strptime(t, "%Y-%m-%d %H:%M:%S UTC") < end_cutoff]
-        times = [datetime.datetime.strptime(t, "%Y-%m-%d %H:%M:%S UTC") for t, e in filtered]
+        filtered = [(t, e) for t, e in node_post[node] if cutoff_epoch <= t < end_cutoff_epoch]
+        times = [datetime.datetime.utcfromtimestamp(t) for t, e in filtered]
         elapsed = [e for t, e in filtered]
         ax1.plot(times, elapsed, marker='o', markersize=3, linestyle='-', label=node)
         print(f"POST graph data for {node}: {len(elapsed)} measurements from {date_str} + {GRAPH_DAYS} days")
@@ -220,9 +186,8 @@ if __name__ == "__main__":
 
     # CONFIRM Speed
     for node in NODES:
-        filtered = [(t, e) for t, e in node_confirm[node]
-                    if cutoff <= datetime.datetime.strptime(t, "%Y-%m-%d %H:%M:%S UTC") < end_cutoff]
-        times = [datetime.datetime.strptime(t, "%Y-%m-%d %H:%M:%S UTC") for t, e in filtered]
+        filtered = [(t, e) for t, e in node_confirm[node] if cutoff_epoch <= t < end_cutoff_epoch]
+        times = [datetime.datetime.utcfromtimestamp(t) for t, e in filtered]
         elapsed = [e for t, e in filtered]
         ax2.plot(times, elapsed, marker='o', markersize=3, linestyle='-', label=node)
         print(f"CONFIRM graph data for {node}: {len(elapsed)} measurements from {date_str} + {GRAPH_DAYS} days")
@@ -0,0 +1,385 @@
+"""
+Chart renderers for the DesoMonitor daily summary.
+
+Every renderer is a side-effect-free module-level function: it takes the
+output path and pre-computed NumPy arrays (no dataset objects, no globals),
+draws one figure with the Agg backend and saves it. That keeps the inputs
+cheap to pickle and lets RenderPool run the charts in separate processes,
+so the daily summary takes as long as the slowest chart instead of the sum
+of all of them.
+
+How a chart is encoded is set by an OutputProfile: resolution, and plain
+PNG, palette-quantised PNG or WebP. Figures are encoded in memory (through
+Pillow for the compact formats) and written once, without temporary files.
+
+Rendered charts are recorded as an artifact in a small JSON manifest: the
+content key they were rendered for (the dataset digest) and the sha256 of
+every output file. load_artifact() hands them back only while both still
+match, so an unchanged dataset is never rendered twice.
+"""
+
+import io
+import os
+import json
+import time
+import hashlib
+import logging
+import multiprocessing
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import numpy as np
+from PIL import Image
+
+
+class OutputProfile(NamedTuple):
+    """How rendered charts are encoded."""
+    name: str
+    dpi: int
+    format: str  # "png", "png8" (palette-quantised PNG) or "webp"
+    quality: int = 90  # WebP quality, 100 = lossless
+
+    @property
+    def extension(self):
+        return "webp" if self.format == "webp" else "png"
+
+
+OUTPUT_PROFILES = {
+    "full": OutputProfile("full", 300, "png"),
+    "compact": OutputProfile("compact", 200, "png8"),
+    "webp": OutputProfile("webp", 200, "webp", 90),
+}
+DEFAULT_PROFILE = OUTPUT_PROFILES["full"]
+
+
+def output_profile(name, dpi=None, quality=None):
+    """
+    Named profile from OUTPUT_PROFILES, with optional DPI / WebP quality overrides.
+
+    Raises:
+        ValueError: If `name` is not a known profile.
+    """
+    if name not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown chart profile {name!r}, expected one of: {', '.join(OUTPUT_PROFILES)}")
+    profile = OUTPUT_PROFILES[name]
+    if dpi:
+        profile = profile._replace(dpi=dpi)
+    if quality:
+        profile = profile._replace(quality=quality)
+    return profile
+
+
+def encode_figure(fig, profile):
+    """`fig` encoded per `profile`, as bytes."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=profile.dpi, bbox_inches='tight')
+    if profile.format == "png":
+        return buf.getvalue()
+    buf.seek(0)
+    image = Image.open(buf).convert("RGB")
+    out = io.BytesIO()
+    if profile.format == "png8":
+        # Charts use few flat colors; a 256-color palette is visually lossless and several times smaller
+        image.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(out, format="PNG", optimize=True)
+    elif profile.format == "webp":
+        image.save(out, format="WEBP", quality=profile.quality, lossless=profile.quality >= 100, method=4)
+    else:
+        raise ValueError(f"Unknown chart format: {profile.format}")
+    return out.getvalue()
+
+
+def save_figure(fig, path, profile):
+    """Encode `fig` per `profile`, write it to `path` and close it."""
+    try:
+        data = encode_figure(fig, profile)
+    finally:
+        plt.close(fig)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def node_label(node):
+    """Node URL without the scheme, as shown on the charts."""
+    return node.replace('https://', '').replace('http://', '')
+
+
+def gauge_status(median):
+    """(color, status) for a median total time in seconds."""
+    if median < 15:
+        return '#28a745', 'EXCELLENT'
+    if median < 30:
+        return '#ffc107', 'GOOD'
+    return '#dc3545', 'SLOW'
+
+
+# Title suffix per time-series resolution
+RESOLUTION_TITLES = {"raw": "", "hour": " - hourly mean, min-max band", "day": " - daily mean, min-max band"}
+
+
+def render_timeseries(path, labels, post_series, confirm_series, profile=DEFAULT_PROFILE, resolution="raw"):
+    """
+    Stacked POST (top) / CONFIRM (bottom) line+marker chart.
+
+    Args:
+        labels: One legend label per node.
+        post_series, confirm_series: One entry per node, aligned with `labels`: (times, values)
+            for raw samples, or (times, mean, low, high) per bucket for the "hour" / "day"
+            resolutions, drawn as a mean line over a min-max band. Times are datetime64[s]
+            arrays, values float64 seconds.
+        resolution: "raw", "hour" or "day".
+    """
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), sharex=True)
+    colors = plt.cm.tab10(np.linspace(0, 1, len(labels)))
+    suffix = RESOLUTION_TITLES[resolution]
+    for ax, series, ylabel, title in (
+        (ax1, post_series, "POST Speed (seconds)", "DeSo Node POST Speed (Transaction Submission)"),
+        (ax2, confirm_series, "CONFIRMATION Speed (seconds)",
+         "DeSo Node CONFIRMATION Speed (Transaction Commitment - Full Nodes Only)"),
+    ):
+        for i, (label, (times, values, *band)) in enumerate(zip(labels, series)):
+            if band:
+                ax.fill_between(times, band[0], band[1], color=colors[i], alpha=0.15, linewidth=0)
+                ax.plot(times, values, marker='.', linestyle='-', label=label, color=colors[i])
+            else:
+                ax.plot(times, values, marker='o', linestyle='-', label=label, color=colors[i])
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.set_title(title + suffix, fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=10, ncol=2, loc='upper left', bbox_to_anchor=(1.02, 1))
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+    ax2.set_xlabel("Time (UTC)", fontsize=12)
+    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    plt.setp(ax2.get_xticklabels(), rotation=45)
+    fig.tight_layout()
+    return save_figure(fig, path, profile)
+
+
+def render_median_bars(path, labels, medians_post, medians_confirm, profile=DEFAULT_PROFILE):
+    """Horizontal bars of the median POST and CONFIRM time per node (0 where a node has none)."""
+    y_pos = np.arange(len(labels))
+    bar_height = 0.35
+    fig, ax = plt.subplots(figsize=(13, max(5, len(labels) * 0.8)))
+    bars1 = ax.barh(y_pos - bar_height/2, medians_post, bar_height, label='POST Speed', color='#3498db')
+    bars2 = ax.barh(y_pos + bar_height/2, medians_confirm, bar_height, label='CONFIRM Speed', color='#27ae60')
+    for bars, medians in ((bars1, medians_post), (bars2, medians_confirm)):
+        for bar, median in zip(bars, medians):
+            ax.text(bar.get_width() + 0.1, bar.get_y() + bar.get_height()/2, f'{median:.1f}s', ha='left', va='center', fontsize=10)
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(labels, fontsize=12)
+    ax.set_xlabel('Response Time (seconds)', fontsize=12)
+    ax.set_title('DeSo Node Performance - POST vs CONFIRMATION Speed (Median)', fontsize=15, fontweight='bold', pad=20)
+    ax.legend(fontsize=12)
+    ax.grid(True, axis='x', alpha=0.3)
+    fig.tight_layout()
+    return save_figure(fig, path, profile)
+
+
+def render_gauge(path, labels, medians, profile=DEFAULT_PROFILE, tails=None):
+    """
+    Node ranking by median total time, fastest first, colored by gauge_status().
+
+    `tails`, if given, is a (len(labels), 2) array of p90 / p99 total times shown next to each median.
+    """
+    title = 'DeSo Node Performance Ranking\nMedian Response Times (24h)'
+    order = np.argsort(medians, kind="stable")
+    labels = [labels[i] for i in order]
+    medians = [float(medians[i]) for i in order]
+    tail_text = [f' · p90 {tails[i][0]:.1f}s · p99 {tails[i][1]:.1f}s' if tails is not None else '' for i in order]
+    fig, ax = plt.subplots(figsize=(12, max(6, len(labels) * 0.8)))
+    if not labels:
+        ax.text(0.5, 0.5, 'No data available', ha='center', va='center', fontsize=18, color='gray', transform=ax.transAxes)
+        ax.set_axis_off()
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+    else:
+        colors, statuses = zip(*(gauge_status(median) for median in medians))
+        y_pos = np.arange(len(labels))
+        bars = ax.barh(y_pos, medians, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
+        for bar, median, status, tail in zip(bars, medians, statuses, tail_text):
+            ax.text(bar.get_width() + max(medians) * 0.01, bar.get_y() + bar.get_height()/2, f'{median:.1f}s ({status}){tail}',
+                    ha='left', va='center', fontweight='bold', fontsize=10)
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(labels, fontsize=11)
+        ax.set_xlabel('Median Response Time (seconds)', fontsize=12)
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+        ax.axvspan(0, 15, alpha=0.1, color='green', label='Excellent (< 15s)')
+        ax.axvspan(15, 30, alpha=0.1, color='yellow', label='Good (15-30s)')
+        ax.axvspan(30, max(medians) * 1.1, alpha=0.1, color='red', label='Slow (> 30s)')
+        ax.grid(True, axis='x', alpha=0.3)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.legend(loc='lower right', fontsize=10)
+    fig.tight_layout()
+    return save_figure(fig, path, profile)
+
+
+def render_phase_breakdown(path, labels, phases, medians, profile=DEFAULT_PROFILE):
+    """
+    Horizontal stacked bars of the median time per probe phase for each node.
+
+    Args:
+        labels: One label per node.
+        phases: Phase names, in probe order.
+        medians: (len(labels), len(phases)) float64 seconds, 0 where a node has no value for a phase.
+    """
+    title = 'DeSo Node Latency Breakdown per Probe Phase (Median)'
+    fig, ax = plt.subplots(figsize=(13, max(5, len(labels) * 0.8)))
+    if not labels:
+        ax.text(0.5, 0.5, 'No per-phase data available', ha='center', va='center', fontsize=18, color='gray', transform=ax.transAxes)
+        ax.set_axis_off()
+        ax.set_title(title, fontsize=15, fontweight='bold', pad=20)
+    else:
+        y_pos = np.arange(len(labels))
+        colors = plt.cm.tab10(np.arange(len(phases)) % 10)
+        left = np.zeros(len(labels))
+        for i, phase in enumerate(phases):
+            ax.barh(y_pos, medians[:, i], left=left, label=phase, color=colors[i], edgecolor='white', linewidth=1)
+            left += medians[:, i]
+        for y, total in zip(y_pos, left):
+            ax.text(total + left.max() * 0.01, y, f'{total:.2f}s', ha='left', va='center', fontsize=10)
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(labels, fontsize=12)
+        ax.set_xlabel('Median time per phase (seconds)', fontsize=12)
+        ax.set_title(title, fontsize=15, fontweight='bold', pad=20)
+        ax.legend(fontsize=10, loc='upper left', bbox_to_anchor=(1.02, 1))
+        ax.grid(True, axis='x', alpha=0.3)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+    fig.tight_layout()
+    return save_figure(fig, path, profile)
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def save_artifact(manifest_path, key, files):
+    """
+    Record `files` as the charts rendered for content `key`.
+
+    Returns:
+        artifact dict: {"key": key, "files": [paths], "rendered_at": epoch seconds}
+    """
+    artifact = {"key": key, "files": list(files), "rendered_at": time.time()}
+    manifest = dict(artifact, sha256={path: file_sha256(path) for path in files})
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+    return artifact
+
+
+def load_artifact(manifest_path, key):
+    """
+    The artifact recorded for content `key`, or None if there is none, it was
+    rendered for other content, or any of its files is missing or was overwritten.
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("key") != key:
+            return None
+        for path in manifest["files"]:
+            if file_sha256(path) != manifest["sha256"][path]:
+                return None
+        return {"key": key, "files": manifest["files"], "rendered_at": manifest["rendered_at"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _warm_up():
+    """Draw and save a tiny figure so fonts and the Agg renderer are loaded before real work arrives."""
+    fig, ax = plt.subplots(figsize=(1, 1))
+    ax.plot([0, 1], [0, 1], marker='o')
+    ax.set_title("warm-up")
+    fig.savefig(io.BytesIO(), format="png", dpi=10)
+    plt.close(fig)
+
+
+def _timed(func, args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+class RenderPool:
+    """
+    Process pool for chart renderers.
+
+    A job is a (func, args) pair, with `func` a module-level renderer from
+    this module. Workers are forked from the monitor process, so call warm()
+    at startup, before other threads run; the pool is then reused for every
+    render. With workers=0, or where fork is unavailable, or after the pool
+    broke, jobs are rendered inline in the calling process.
+
+    Args:
+        workers: Number of render processes.
+    """
+
+    def __init__(self, workers=3):
+        self.workers = workers
+        self._executor = None
+        self._context = None
+        if workers > 0:
+            if "fork" in multiprocessing.get_all_start_methods():
+                self._context = multiprocessing.get_context("fork")
+            else:
+                logging.warning("⚠️ Render pool needs the fork start method; rendering charts inline")
+
+    def _ensure_executor(self):
+        if self._executor is None and self._context is not None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context)
+        return self._executor
+
+    def warm(self):
+        """Start the worker processes and load matplotlib's fonts and renderer in each."""
+        executor = self._ensure_executor()
+        if executor is None:
+            return
+        start = time.perf_counter()
+        try:
+            for future in [executor.submit(_warm_up) for _ in range(self.workers)]:
+                future.result()
+            logging.info(f"🎨 Render pool warmed: {self.workers} workers in {time.perf_counter() - start:.2f}s")
+        except BrokenProcessPool as e:
+            logging.warning(f"⚠️ Render pool failed to start, rendering charts inline: {e}")
+            self._executor = None
+            self._context = None
+
+    def render(self, jobs):
+        """
+        Run all `jobs`, in parallel when the pool is available.
+
+        Returns:
+            list of render seconds per job, in job order.
+
+        Raises:
+            Whatever a renderer raised.
+        """
+        executor = self._ensure_executor()
+        if executor is not None:
+            futures = [executor.submit(_timed, func, args) for func, args in jobs]
+            try:
+                return [future.result() for future in futures]
+            except BrokenProcessPool as e:
+                # A worker died (e.g. OOM-killed). Forking a new pool now would copy a process that
+                # runs probe, metrics and config threads, so render inline from here on
+                logging.warning(f"⚠️ Render pool broke, rendering charts inline from now on: {e}")
+                self._executor = None
+                self._context = None
+        return [_timed(func, args) for func, args in jobs]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
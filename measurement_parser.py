@@ -0,0 +1,248 @@
+"""
+Single-pass parser for DesoMonitor measurement comments.
+
+A result comment written by post_measurement looks like:
+
+    🌐 Node check-in RESULT
+    POST: 0.41 sec
+    CONFIRM: 2.87 sec (±0.12)
+    Total: 3.28 sec
+    Timestamp: 2025-01-01 12:00:00 UTC
+    Node: https://node.deso.org
+    #desomonitormeasurement
+
+That layout is matched by one precompiled regex that also splits the
+timestamp into its minute and seconds; the epoch of each minute is cached,
+so most samples cost one int() instead of a strptime call. Older layouts
+(fields in a different order, or the legacy single "Elapsed:" value) fall
+back to one combined field regex.
+
+Result comments posted since schema 1 also carry their timings as
+PostExtraData fields (see measurement_extra_data); parse_comment_posts()
+reads those directly and only parses the body of older comments. Schema 2
+adds the per-phase breakdown of the probe (PHASES), which only exists in
+PostExtraData.
+"""
+
+import calendar
+import re
+from typing import NamedTuple, Optional
+
+# Current result layout, in write order
+_RESULT_RE = re.compile(
+    r"POST: ([0-9.]+) sec\n"
+    r"CONFIRM: ([0-9.]+) sec[^\n]*\n"
+    r"Total: ([0-9.]+) sec\n"
+    r"Timestamp: ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}):([0-5][0-9]) UTC\n"
+    r"Node: ([^\n]*)"
+)
+# Any "Field: value" line, for older layouts
+_FIELD_RE = re.compile(r"^(Node|Timestamp|POST|CONFIRM|Total|Elapsed): *([^\n]*)", re.M)
+_MINUTE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}\Z")
+
+# PostExtraData layout of result comments; bump when fields change meaning
+MEASUREMENT_SCHEMA_VERSION = 2
+MEASUREMENT_RESULT_TYPE = "measurement_result"
+
+# Probe phases, in order. dns/connect/tls are connection setup (0 on a reused
+# connection), construct/submit the create-post and submit-transaction round
+# trips, sign the local signing; mempool runs from submit until the node
+# first lists the txn in its mempool and commit from there until it committed.
+PHASES = ("dns", "connect", "tls", "construct", "sign", "submit", "mempool", "commit")
+PHASE_EXTRA_KEYS = {phase: f"{phase.capitalize()}Ms" for phase in PHASES}
+
+_minute_cache = {}
+_MINUTE_CACHE_LIMIT = 200_000
+
+
+class MeasurementRecord(NamedTuple):
+    """One parsed measurement comment. Timings are seconds, None when the comment did not carry them."""
+    node: str
+    ts: int  # epoch seconds, UTC
+    post: Optional[float]
+    confirm: Optional[float]
+    total: Optional[float]
+    elapsed: Optional[float] = None  # legacy single "Elapsed:" value
+    phases: Optional[tuple] = None  # seconds per PHASES entry (None where missing), schema 2+ only
+
+    def sample(self):
+        """
+        (node, ts, post, confirm, total) for graphing. Legacy "Elapsed:" comments
+        are split ~10% POST / ~90% CONFIRM (typical blockchain behavior).
+        """
+        if self.elapsed is not None and self.post is None and self.confirm is None:
+            return self.node, self.ts, self.elapsed * 0.1, self.elapsed * 0.9, self.total
+        return self.node, self.ts, self.post, self.confirm, self.total
+
+
+def decode_timestamp(timestamp):
+    """
+    Epoch seconds for a "YYYY-MM-DD HH:MM:SS UTC" string (the " UTC" suffix is optional).
+
+    Same result as calendar.timegm(time.strptime(timestamp, TIMESTAMP_FORMAT)),
+    but only the seconds are converted per call; the minute is cached.
+
+    Raises:
+        ValueError: If the string is not in that format.
+    """
+    if len(timestamp) not in (19, 23) or timestamp[16] != ":" or timestamp[19:] not in ("", " UTC"):
+        raise ValueError(f"Invalid timestamp: {timestamp!r}")
+    seconds = timestamp[17:19]
+    if not (seconds.isascii() and seconds.isdigit()) or seconds > "61":
+        raise ValueError(f"Invalid timestamp: {timestamp!r}")
+    minute = timestamp[:16]
+    base = _minute_cache.get(minute)
+    if base is None:
+        if not _MINUTE_RE.match(minute):
+            raise ValueError(f"Invalid timestamp: {timestamp!r}")
+        fields = (int(minute[0:4]), int(minute[5:7]), int(minute[8:10]), int(minute[11:13]), int(minute[14:16]))
+        if not (1 <= fields[1] <= 12 and 1 <= fields[2] <= calendar.monthrange(fields[0], fields[1])[1]
+                and fields[3] <= 23 and fields[4] <= 59):
+            raise ValueError(f"Invalid timestamp: {timestamp!r}")
+        base = calendar.timegm(fields + (0,))
+        if len(_minute_cache) >= _MINUTE_CACHE_LIMIT:
+            _minute_cache.clear()
+        _minute_cache[minute] = base
+    return base + int(seconds)
+
+
+def _number(value):
+    """Leading number of a "2.87 sec (±0.12)" style value, or None."""
+    try:
+        return float(value.split(" ", 1)[0]) if value else None
+    except ValueError:
+        return None
+
+
+def _parse_fields(body):
+    """Slow path for bodies not in the current result layout."""
+    fields = dict(_FIELD_RE.findall(body))
+    node = fields.get("Node", "").strip()
+    if not node:
+        return None
+    try:
+        ts = decode_timestamp(fields.get("Timestamp", "").strip())
+    except ValueError:
+        return None
+    post, confirm, total, elapsed = (_number(fields.get(k)) for k in ("POST", "CONFIRM", "Total", "Elapsed"))
+    if post is None and confirm is None and total is None and elapsed is None:
+        return None
+    return MeasurementRecord(node, ts, post, confirm, total, elapsed)
+
+
+def parse_comment(body):
+    """
+    Parse one comment body.
+
+    Returns:
+        MeasurementRecord, or None if the body has no node, no valid timestamp
+        or no timing at all (e.g. the "Testing connection..." check-in).
+    """
+    return parse_comments((body,))[0]
+
+
+def parse_comments(bodies):
+    """
+    Parse many comment bodies.
+
+    Returns:
+        list aligned with `bodies`: a MeasurementRecord or None for each body.
+    """
+    records = []
+    append = records.append
+    search = _RESULT_RE.search
+    minute_epoch = _minute_cache.get
+    new = tuple.__new__
+    for body in bodies:
+        m = search(body)
+        if m is not None:
+            post, confirm, total, minute, seconds, node = m.groups()
+            base = minute_epoch(minute)
+            if base is None:
+                try:
+                    base = decode_timestamp(minute + ":00")  # validates and caches the minute
+                except ValueError:
+                    append(None)
+                    continue
+            append(new(MeasurementRecord, (node.strip(), base + int(seconds), float(post), float(confirm), float(total), None, None)))
+        elif " sec" in body:
+            append(_parse_fields(body))
+        else:
+            append(None)
+    return records
+
+
+def measurement_extra_data(node, ts, post, confirm, confirm_err, total, phases=None):
+    """
+    PostExtraData for a result comment: Node and Type plus machine-readable timings.
+
+    DeSo extra data values are strings, so timings are whole milliseconds and
+    `ts` is epoch seconds, all as decimal strings. `phases` ({phase: seconds}
+    for PHASES) adds one "<Phase>Ms" field per phase given.
+    """
+    extra_data = {
+        "Node": node,
+        "Type": MEASUREMENT_RESULT_TYPE,
+        "SchemaVersion": str(MEASUREMENT_SCHEMA_VERSION),
+        "Ts": str(int(ts)),
+        "PostMs": str(round(post * 1000)),
+        "ConfirmMs": str(round(confirm * 1000)),
+        "ConfirmErrMs": str(round(confirm_err * 1000)),
+        "TotalMs": str(round(total * 1000)),
+    }
+    for phase, seconds in (phases or {}).items():
+        if phase in PHASE_EXTRA_KEYS and seconds is not None:
+            extra_data[PHASE_EXTRA_KEYS[phase]] = str(round(seconds * 1000))
+    return extra_data
+
+
+def _ms(value):
+    return None if value in (None, "") else int(value) / 1000
+
+
+def parse_extra_data(extra_data):
+    """
+    MeasurementRecord from a result comment's PostExtraData, or None if it has no
+    (valid) structured timings and the body has to be parsed instead.
+    """
+    if not extra_data or extra_data.get("Type") != MEASUREMENT_RESULT_TYPE or "SchemaVersion" not in extra_data:
+        return None
+    try:
+        if int(extra_data["SchemaVersion"]) < 1:
+            return None
+        node = extra_data.get("Node", "").strip()
+        if not node:
+            return None
+        post, confirm, total = (_ms(extra_data.get(k)) for k in ("PostMs", "ConfirmMs", "TotalMs"))
+        phases = tuple(_ms(extra_data.get(PHASE_EXTRA_KEYS[phase])) for phase in PHASES)
+        if all(seconds is None for seconds in phases):
+            phases = None
+        return MeasurementRecord(node, int(extra_data["Ts"]), post, confirm, total, None, phases)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def parse_comment_posts(comments, post_tag=None):
+    """
+    Records for comment post dicts (as returned by get-single-post).
+
+    Structured PostExtraData is used when present; otherwise the body is parsed,
+    in one parse_comments() batch. With `post_tag`, bodies without it are skipped.
+
+    Returns:
+        list aligned with `comments`: a MeasurementRecord or None for each comment.
+    """
+    records = []
+    fallback = []
+    for i, comment in enumerate(comments):
+        record = parse_extra_data(comment.get("PostExtraData"))
+        records.append(record)
+        if record is None:
+            body = comment.get("Body", "")
+            if post_tag is None or post_tag in body:
+                fallback.append((i, body))
+    if fallback:
+        parsed = parse_comments(body for _, body in fallback)
+        for (i, _), record in zip(fallback, parsed):
+            records[i] = record
+    return records
@@ -0,0 +1,136 @@
+"""
+Columnar in-memory storage for per-node measurements.
+
+Each node keeps a fixed-capacity ring buffer of NumPy columns: int64 epoch
+seconds, float32 timings and a uint8 status code. A sample costs ~25 bytes
+instead of a formatted timestamp string plus a dict, memory stays flat for a
+given GRAPH_DAYS / SCHEDULE_INTERVAL, and window slicing and medians are
+vectorised. Iterating a NodeSeries still yields the old
+(timestamp_str, {"post", "confirm", "total", ...} or None) tuples for
+existing callers.
+"""
+
+import time
+
+import numpy as np
+
+from measurement_parser import decode_timestamp
+from measurement_store import TIMESTAMP_FORMAT, STATUS_OK, default_status
+
+# Float32 timing columns; missing values are stored as NaN
+FIELDS = ("post", "confirm", "confirm_err", "total")
+
+
+def series_capacity(graph_days, schedule_interval, headroom=1.25):
+    """Ring buffer size that holds `graph_days` of samples at one sample per `schedule_interval` seconds."""
+    per_day = 86400 / max(1, schedule_interval)
+    return max(64, int(graph_days * per_day * headroom))
+
+
+def parse_timestamp(timestamp):
+    """Epoch seconds for a "YYYY-MM-DD HH:MM:SS UTC" string."""
+    return decode_timestamp(timestamp)
+
+
+def format_timestamp(epoch):
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(int(epoch)))
+
+
+class NodeSeries:
+    """Fixed-capacity ring buffer of one node's samples, stored column-wise."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.int64)
+        self.status = np.zeros(capacity, dtype=np.uint8)
+        self.values = {field: np.full(capacity, np.nan, dtype=np.float32) for field in FIELDS}
+        self._next = 0  # slot the next sample is written to
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp, measurement, status=None):
+        """
+        Add one sample, overwriting the oldest one when full.
+
+        `timestamp` is a "YYYY-MM-DD HH:MM:SS UTC" string or epoch seconds;
+        `measurement` is the timings dict, or None for a failed probe.
+        """
+        if status is None:
+            status = default_status(measurement)
+        i = self._next
+        self.ts[i] = parse_timestamp(timestamp) if isinstance(timestamp, str) else int(timestamp)
+        self.status[i] = status
+        for field in FIELDS:
+            value = measurement.get(field) if isinstance(measurement, dict) else None
+            self.values[field][i] = np.nan if value is None else value
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _ordered(self, column):
+        """Column in insertion order (oldest first)."""
+        if self._size < self.capacity:
+            return column[:self._size]
+        return np.concatenate((column[self._next:], column[:self._next]))
+
+    def columns(self):
+        """All columns in insertion order: {"ts", "status", *FIELDS} -> array."""
+        result = {"ts": self._ordered(self.ts), "status": self._ordered(self.status)}
+        for field in FIELDS:
+            result[field] = self._ordered(self.values[field])
+        return result
+
+    def window(self, since=None, until=None):
+        """Columns restricted to since <= ts < until (epoch seconds, either bound optional)."""
+        cols = self.columns()
+        mask = np.ones(len(cols["ts"]), dtype=bool)
+        if since is not None:
+            mask &= cols["ts"] >= since
+        if until is not None:
+            mask &= cols["ts"] < until
+        return {name: column[mask] for name, column in cols.items()}
+
+    def median(self, field, since=None, until=None):
+        """Median of `field` over successful samples in the window, or None if there are none."""
+        cols = self.window(since, until)
+        values = cols[field][(cols["status"] == STATUS_OK) & ~np.isnan(cols[field])]
+        if values.size == 0:
+            return None
+        return float(np.median(values))
+
+    def counts(self, since=None, until=None):
+        """Number of samples per status code in the window."""
+        cols = self.window(since, until)
+        codes, counts = np.unique(cols["status"], return_counts=True)
+        return {int(code): int(count) for code, count in zip(codes, counts)}
+
+    def resized(self, capacity):
+        """Copy of this series with a new capacity, keeping the most recent samples."""
+        series = NodeSeries(capacity)
+        cols = self.columns()
+        keep = slice(max(0, len(cols["ts"]) - capacity), None)
+        n = len(cols["ts"][keep])
+        series.ts[:n] = cols["ts"][keep]
+        series.status[:n] = cols["status"][keep]
+        for field in FIELDS:
+            series.values[field][:n] = cols[field][keep]
+        series._size = n
+        series._next = n % capacity
+        return series
+
+    # --- Compatibility view: behaves like the old list of (timestamp_str, dict-or-None) tuples ---
+
+    def _entry(self, ts, status, values):
+        if status != STATUS_OK:
+            return (format_timestamp(ts), None)
+        measurement = {field: float(v) for field, v in zip(FIELDS, values) if not np.isnan(v)}
+        return (format_timestamp(ts), measurement)
+
+    def __iter__(self):
+        cols = self.columns()
+        for i in range(len(cols["ts"])):
+            yield self._entry(cols["ts"][i], cols["status"][i], [cols[field][i] for field in FIELDS])
+
+    def __getitem__(self, index):
+        return list(self)[index]
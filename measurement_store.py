@@ -0,0 +1,373 @@
+"""
+Persistent storage for DesoMonitor measurements.
+
+Two interchangeable backends are available:
+
+- MeasurementJournal (default): samples are appended to a JSON Lines journal
+  instead of rewriting the whole measurements file on every save. Writes are
+  buffered and fsync'd in batches, so a crash loses at most one batch, and the
+  journal is periodically compacted to drop samples older than the retention window.
+- SQLiteMeasurementStore: samples live in a WAL-mode SQLite table indexed on
+  (node, epoch_ts), so loading the graph window and retention pruning only
+  touch the rows they need.
+
+Both expose exists/append/flush/replay/write_all/compact and hand samples
+around as (timestamp, measurement, status) tuples.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import calendar
+import threading
+
+from measurement_parser import decode_timestamp
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+
+# Sample status codes (stored alongside each sample; failed samples have no timings)
+STATUS_OK = 0
+STATUS_TIMEOUT = 1
+STATUS_ERROR = 2
+
+
+def default_status(measurement):
+    """Status for records written before status codes existed: None meant timeout or error."""
+    return STATUS_OK if measurement is not None else STATUS_ERROR
+
+
+def migrate_measurement(measurement):
+    """
+    Normalise one stored measurement to the current dict format.
+
+    Old files stored a bare elapsed float; it is split into an estimated
+    POST/CONFIRM pair. Returns None for timeouts/errors and for invalid entries,
+    plus a flag telling whether the entry is valid at all.
+    """
+    if measurement is None:
+        return None, True
+    if isinstance(measurement, (int, float)):
+        # OLD FORMAT: Convert elapsed to estimated POST/CONFIRM split
+        elapsed = float(measurement)
+        return {
+            "post": elapsed * 0.1,  # Estimate 10% for POST
+            "confirm": elapsed * 0.9,  # Estimate 90% for CONFIRM
+            "total": elapsed
+        }, True
+    if isinstance(measurement, dict):
+        # NEW FORMAT: Keep as-is
+        return measurement, True
+    return None, False
+
+
+def load_legacy_measurements(path):
+    """Read the old whole-file measurements.json format into {node: [(timestamp, measurement, status), ...]}."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    result = {}
+    for node, entries in data.items():
+        migrated_entries = []
+        for entry in entries:
+            timestamp, measurement = entry
+            measurement, valid = migrate_measurement(measurement)
+            # Skip invalid entries
+            if valid:
+                migrated_entries.append((timestamp, measurement, default_status(measurement)))
+        result[node] = migrated_entries
+    return result
+
+
+def timestamp_to_epoch(timestamp):
+    """Convert a "YYYY-MM-DD HH:MM:SS UTC" string to epoch seconds, or None if it can't be parsed."""
+    try:
+        return decode_timestamp(timestamp)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_expired(timestamp, cutoff):
+    """True if `timestamp` is older than `cutoff`; entries with unparseable timestamps are kept."""
+    try:
+        return decode_timestamp(timestamp) < calendar.timegm(cutoff.timetuple())
+    except (TypeError, ValueError):
+        return False
+
+
+class MeasurementJournal:
+    """
+    Append-only JSON Lines journal of measurement samples.
+
+    Each line is {"n": node, "t": timestamp, "m": measurement, "s": status}. Appends are
+    buffered in memory and written + fsync'd once `batch_size` records are
+    pending or `flush_interval` seconds have passed since the last flush.
+    """
+
+    def __init__(self, path, batch_size=20, flush_interval=5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._tail_checked = False
+        self._lock = threading.Lock()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    @staticmethod
+    def _line(node, timestamp, measurement, status):
+        return json.dumps({"n": node, "t": timestamp, "m": measurement, "s": status}, ensure_ascii=False, separators=(",", ":"))
+
+    def append(self, node, timestamp, measurement, status=STATUS_OK):
+        """Queue one sample; flushes to disk when the batch is full or old enough."""
+        line = self._line(node, timestamp, measurement, status)
+        with self._lock:
+            self._pending.append(line)
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if due:
+                self._flush_locked()
+
+    def flush(self):
+        """Write and fsync all pending samples."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        prefix = ""
+        if not self._tail_checked:
+            # A crash mid-write can leave a torn last line; start on a fresh line so it stays isolated
+            self._tail_checked = True
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        prefix = "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(prefix + "\n".join(self._pending) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = []
+
+    def replay(self, since=None):
+        """
+        Read the journal back into {node: [(timestamp, measurement, status), ...]} in append order.
+
+        If `since` (a naive UTC datetime) is given, older samples are left out.
+        """
+        result = {}
+        if not self.exists():
+            return result
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    node, timestamp = record["n"], record["t"]
+                except (ValueError, KeyError, TypeError):
+                    # A torn final line after a crash is expected; anything else is worth a log line
+                    logging.warning(f"⚠️ Skipping unreadable journal line {line_no} in {self.path}")
+                    continue
+                if since is not None and is_expired(timestamp, since):
+                    continue
+                measurement, valid = migrate_measurement(record.get("m"))
+                if valid:
+                    status = record.get("s", default_status(measurement))
+                    result.setdefault(node, []).append((timestamp, measurement, status))
+        return result
+
+    def write_all(self, data):
+        """Atomically replace the journal with `data` ({node: [(timestamp, measurement, status), ...]})."""
+        with self._lock:
+            self._pending = []
+            self._rewrite_locked(data)
+
+    def compact(self, cutoff):
+        """Atomically rewrite the journal without samples older than `cutoff` (a naive UTC datetime)."""
+        with self._lock:
+            self._flush_locked()
+            data = self.replay()
+            kept = {
+                node: [entry for entry in entries if not is_expired(entry[0], cutoff)]
+                for node, entries in data.items()
+            }
+            self._rewrite_locked({node: entries for node, entries in kept.items() if entries})
+        before = sum(len(e) for e in data.values())
+        after = sum(len(e) for e in kept.values())
+        return before - after
+
+    def _rewrite_locked(self, data):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for node, entries in data.items():
+                for timestamp, measurement, status in entries:
+                    f.write(self._line(node, timestamp, measurement, status) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_flush = time.monotonic()
+        self._tail_checked = True
+
+
+class SQLiteMeasurementStore:
+    """
+    Measurement store backed by SQLite in WAL mode.
+
+    Rows carry the original timestamp string plus its epoch seconds, and are
+    indexed on (node, epoch_ts) so per-node window queries and retention
+    pruning are index range scans. Appends are buffered and committed in
+    batches like MeasurementJournal.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS measurements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            node TEXT NOT NULL,
+            epoch_ts INTEGER,
+            timestamp TEXT NOT NULL,
+            post REAL,
+            confirm REAL,
+            total REAL,
+            status INTEGER NOT NULL DEFAULT 0,
+            data TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_measurements_node_ts ON measurements (node, epoch_ts);
+    """
+    # Fixed SQL strings, so sqlite3's statement cache keeps them prepared across calls
+    _INSERT_SQL = "INSERT INTO measurements (node, epoch_ts, timestamp, post, confirm, total, status, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    _ALL_SQL = "SELECT node, timestamp, data, status FROM measurements ORDER BY id"
+    _SINCE_SQL = "SELECT node, timestamp, data, status FROM measurements WHERE node = ? AND epoch_ts >= ? ORDER BY epoch_ts, id"
+    _NODES_SQL = "SELECT DISTINCT node FROM measurements"
+    _PRUNE_SQL = "DELETE FROM measurements WHERE node = ? AND epoch_ts < ?"
+
+    def __init__(self, path, batch_size=20, flush_interval=5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, cached_statements=32)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL is durable across application crashes; only an OS crash can lose the last commit
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self._conn.commit()
+
+    def exists(self):
+        """True if the store already holds any samples."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM measurements LIMIT 1").fetchone() is not None
+
+    @staticmethod
+    def _row(node, timestamp, measurement, status):
+        values = measurement if isinstance(measurement, dict) else {}
+        return (
+            node,
+            timestamp_to_epoch(timestamp),
+            timestamp,
+            values.get("post"),
+            values.get("confirm"),
+            values.get("total"),
+            status,
+            json.dumps(measurement, ensure_ascii=False, separators=(",", ":")),
+        )
+
+    def append(self, node, timestamp, measurement, status=STATUS_OK):
+        """Queue one sample; commits when the batch is full or old enough."""
+        with self._lock:
+            self._pending.append(self._row(node, timestamp, measurement, status))
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if due:
+                self._flush_locked()
+
+    def flush(self):
+        """Commit all pending samples."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(self._INSERT_SQL, self._pending)
+        self._pending = []
+
+    def replay(self, since=None):
+        """
+        Load samples into {node: [(timestamp, measurement, status), ...]}.
+
+        With `since` (a naive UTC datetime) only that window is read, via the
+        (node, epoch_ts) index; otherwise every row is returned in insert order.
+        """
+        result = {}
+        with self._lock:
+            self._flush_locked()
+            if since is None:
+                rows = self._conn.execute(self._ALL_SQL).fetchall()
+            else:
+                since_epoch = calendar.timegm(since.timetuple())
+                nodes = [row[0] for row in self._conn.execute(self._NODES_SQL)]
+                rows = []
+                for node in nodes:
+                    rows.extend(self._conn.execute(self._SINCE_SQL, (node, since_epoch)).fetchall())
+        for node, timestamp, data, status in rows:
+            measurement, valid = migrate_measurement(json.loads(data))
+            if valid:
+                result.setdefault(node, []).append((timestamp, measurement, status))
+        return result
+
+    def write_all(self, data):
+        """Replace the store contents with `data` ({node: [(timestamp, measurement, status), ...]}) in one transaction."""
+        with self._lock:
+            self._pending = []
+            with self._conn:
+                self._conn.execute("DELETE FROM measurements")
+                self._conn.executemany(
+                    self._INSERT_SQL,
+                    [self._row(node, t, m, status) for node, entries in data.items() for t, m, status in entries],
+                )
+
+    def compact(self, cutoff):
+        """Delete samples older than `cutoff` (a naive UTC datetime); rows without a parseable time are kept."""
+        cutoff_epoch = calendar.timegm(cutoff.timetuple())
+        dropped = 0
+        with self._lock:
+            self._flush_locked()
+            with self._conn:
+                nodes = [row[0] for row in self._conn.execute(self._NODES_SQL)]
+                for node in nodes:
+                    dropped += self._conn.execute(self._PRUNE_SQL, (node, cutoff_epoch)).rowcount
+        return dropped
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+def open_measurement_store(backend, journal_path, sqlite_path, batch_size=20, flush_interval=5.0):
+    """
+    Create the configured measurement store ("journal" or "sqlite").
+
+    A new SQLite store is seeded from an existing journal so switching
+    backends does not lose history.
+    """
+    if backend == "sqlite":
+        store = SQLiteMeasurementStore(sqlite_path, batch_size=batch_size, flush_interval=flush_interval)
+        if not store.exists() and os.path.exists(journal_path):
+            store.write_all(MeasurementJournal(journal_path).replay())
+            logging.info(f"📦 Migrated journal {journal_path} into SQLite store {sqlite_path}")
+        return store
+    if backend != "journal":
+        raise ValueError(f"Unknown MEASUREMENT_BACKEND: {backend!r} (expected 'journal' or 'sqlite')")
+    return MeasurementJournal(journal_path, batch_size=batch_size, flush_interval=flush_interval)
@@ -0,0 +1,241 @@
+"""
+In-process metrics for DesoMonitor, served in the Prometheus text format.
+
+Counters and histograms are aggregated as events happen (one bucket
+increment per observation), so a scrape only formats the current totals:
+its cost depends on the number of series, not on how many probes ran.
+Only the standard library is used; start_metrics_server() serves
+GET /metrics from a daemon thread.
+
+    PROBE_SECONDS.labels(node=node, phase="confirm").observe(2.87)
+    PROBE_RESULTS.labels(node=node, status="timeout").inc()
+"""
+
+import bisect
+import logging
+import threading
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket upper bounds in seconds (+Inf is implicit)
+PROBE_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60, 120)
+REQUEST_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+RENDER_BUCKETS = (0.25, 0.5, 1, 2, 3, 5, 10, 20, 60)
+CYCLE_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 1200)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base for a metric family: one child per label value combination."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        """The child for these label values, created on first use."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in sorted(children):
+            lines.extend(child.render(self.name, self.labelnames, key))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, labelnames, key):
+        return [f"{name}{_format_labels(labelnames, key)} {_format_value(self.value)}"]
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def render(self, name, labelnames, key):
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(labelnames, key, (("le", _format_value(float(bound))),))
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, key)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic count. Use .inc() directly when there are no labels, else .labels(...).inc()."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._children[()].inc(amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed `buckets` (ascending upper bounds)."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=PROBE_BUCKETS):
+        self.buckets = tuple(float(b) for b in buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._children[()].observe(value)
+
+
+class Registry:
+    """The metrics exposed by the endpoint, in registration order."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- Monitor metrics ---
+PROBE_SECONDS = REGISTRY.register(Histogram(
+    "desomonitor_probe_seconds", "Measured node latency by phase (post, confirm, total, and the probe phases dns, connect, tls, construct, sign, submit, mempool, commit).",
+    ("node", "phase"), PROBE_BUCKETS))
+PROBE_RESULTS = REGISTRY.register(Counter(
+    "desomonitor_probe_results_total", "Node probes by outcome (ok, timeout, error).", ("node", "status")))
+CYCLE_SECONDS = REGISTRY.register(Histogram(
+    "desomonitor_cycle_seconds", "Wall time of a measurement cycle over all nodes.", (), CYCLE_BUCKETS))
+CYCLE_OVERRUNS = REGISTRY.register(Counter(
+    "desomonitor_cycle_overruns_total", "Measurement cycles that took longer than SCHEDULE_INTERVAL."))
+SDK_REQUESTS = REGISTRY.register(Counter(
+    "desomonitor_sdk_requests_total", "HTTP requests made by the DeSo SDK, by API endpoint and status code.",
+    ("endpoint", "code")))
+SDK_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "desomonitor_sdk_request_seconds", "DeSo SDK request latency (until response headers), by API endpoint.",
+    ("endpoint",), REQUEST_BUCKETS))
+RENDER_SECONDS = REGISTRY.register(Histogram(
+    "desomonitor_render_seconds", "Time to render and encode one daily chart.", ("chart",), RENDER_BUCKETS))
+UPLOAD_SECONDS = REGISTRY.register(Histogram(
+    "desomonitor_upload_seconds", "Time to upload one daily chart image.", ("chart",), RENDER_BUCKETS))
+UPLOAD_BYTES = REGISTRY.register(Counter(
+    "desomonitor_upload_bytes_total", "Bytes of chart images uploaded.", ("chart",)))
+UPLOAD_FAILURES = REGISTRY.register(Counter(
+    "desomonitor_upload_failures_total", "Failed chart upload attempts (including retried ones).", ("chart",)))
+
+
+def observe_sdk_response(response, *args, **kwargs):
+    """requests response hook: count the request and record its latency by endpoint."""
+    endpoint = urlparse(response.url).path.rsplit("/", 1)[-1] or "/"
+    SDK_REQUESTS.labels(endpoint=endpoint, code=response.status_code).inc()
+    SDK_REQUEST_SECONDS.labels(endpoint=endpoint).observe(response.elapsed.total_seconds())
+    return response
+
+
+def instrument_session(session):
+    """Add observe_sdk_response to a requests.Session's response hooks (once)."""
+    hooks = session.hooks.setdefault("response", [])
+    if observe_sdk_response not in hooks:
+        hooks.append(observe_sdk_response)
+    return session
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes would flood desomonitor.log
+
+
+def start_metrics_server(port, host="0.0.0.0", registry=REGISTRY):
+    """
+    Serve `registry` at http://host:port/metrics from a daemon thread.
+
+    Returns:
+        ThreadingHTTPServer (call shutdown() to stop it).
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logging.info(f"📈 Metrics endpoint listening on http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for a DeSo node, for offline benchmarking and load testing.
+
+Implements the endpoints DesoMonitor and the SDK use (submit-post,
+submit-transaction, submit-atomic-transaction, get-txn, get-single-post,
+get-posts-for-public-key, upload-image, get-app-state) with configurable
+latency distributions, commit delays, error and drop rates, and a seeded
+history of daily posts with measurement comments. Transactions are not
+validated; a submitted post becomes visible once its commit delay elapses.
+
+    python mock_deso_node.py --port 18001 --latency lognormal:0.08:0.5 --commit-delay uniform:1:4
+
+Point the monitor at it with DESO_NODES=http://127.0.0.1:18001 and
+DESO_API_NODE=http://127.0.0.1:18001. GET /mock/stats returns request
+counters, POST /mock/reset clears them.
+"""
+
+import argparse
+import datetime
+import hashlib
+import heapq
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from measurement_parser import measurement_extra_data
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+DEFAULT_PUBLIC_KEY = "BC1YLmockDesoMonitorPublicKey"
+DEFAULT_POST_TAG = "#desomonitormeasurement"
+
+
+def parse_distribution(spec):
+    """
+    Sampler for a delay spec, in seconds:
+
+        fixed:S | uniform:A:B | normal:MU:SIGMA | lognormal:MEDIAN:SIGMA | exp:MEAN
+
+    A bare number is fixed. Samples are clamped at 0.
+    """
+    parts = str(spec).split(":")
+    kind, args = parts[0], [float(p) for p in parts[1:]]
+    if len(parts) == 1:
+        value = float(kind)
+        return lambda rng: value
+    if kind == "fixed":
+        return lambda rng: args[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == "lognormal":
+        mu = math.log(args[0]) if args[0] > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, args[1]) if args[0] > 0 else 0.0
+    if kind == "exp":
+        return lambda rng: rng.expovariate(1.0 / args[0]) if args[0] > 0 else 0.0
+    raise ValueError(f"Unknown distribution: {spec}")
+
+
+def measurement_body(node, timestamp, post, confirm, post_tag):
+    """A measurement comment body in the format post_measurement writes."""
+    return (f"\U0001F310 Node check-in RESULT\nPOST: {post:.2f} sec\nCONFIRM: {confirm:.2f} sec (±0.10)\n"
+            f"Total: {post + confirm:.2f} sec\nTimestamp: {timestamp}\nNode: {node}\n{post_tag}")
+
+
+class MockDeSoNode:
+    """
+    In-memory chain state plus the simulated node behaviour.
+
+    Args:
+        latency: Delay spec applied to every request (see parse_distribution).
+        endpoint_latency: {endpoint: spec} overrides, e.g. {"get-txn": "fixed:0.01"}.
+        commit_delay: Delay spec from submit-transaction to the txn being committed.
+        error_rate: Fraction of requests answered with HTTP 500.
+        drop_rate: Fraction of submitted transactions that never commit.
+        comment_order: "oldest" or "newest" first in get-single-post comment pages.
+        public_key: Account that owns the seeded daily posts.
+        config: Dict served as the body of the post `config_post_hash`.
+        seed: Random seed, for reproducible runs.
+    """
+
+    def __init__(self, latency="fixed:0", endpoint_latency=None, commit_delay="fixed:1", error_rate=0.0,
+                 drop_rate=0.0, comment_order="oldest", public_key=DEFAULT_PUBLIC_KEY, config=None,
+                 config_post_hash=None, seed=None):
+        self.rng = random.Random(seed)
+        self.latency = parse_distribution(latency)
+        self.endpoint_latency = {k: parse_distribution(v) for k, v in (endpoint_latency or {}).items()}
+        self.commit_delay = parse_distribution(commit_delay)
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.comment_order = comment_order
+        self.public_key = public_key
+        self.lock = threading.Lock()
+        self.unsigned = {}        # TransactionHex -> post dict awaiting signature
+        self.txns = {}            # TxnHashHex -> {"post", "submitted_at", "commit_at", "committed"}
+        self.pending = []         # heap of (commit_at, TxnHashHex) not yet committed
+        self.posts = {}           # PostHashHex -> committed post dict
+        self.comments = defaultdict(list)   # parent PostHashHex -> [comment PostHashHex], oldest first
+        self.top_level = defaultdict(list)  # public key -> [PostHashHex], oldest first
+        self.images = {}
+        self.requests = Counter()
+        self.errors = Counter()
+        self.bytes_out = 0
+        self.config_post_hash = None
+        if config is not None:
+            self.set_config(config, config_post_hash)
+
+    # --- Chain state ---
+
+    def _new_post(self, public_key, body, parent, extra_data, image_urls=None):
+        return {
+            "PosterPublicKeyBase58Check": public_key,
+            "Body": body,
+            "ParentStakeID": parent or "",
+            "ImageURLs": image_urls or [],
+            "PostExtraData": extra_data or {},
+        }
+
+    def _commit(self, post, post_hash, at, top_level=True):
+        post = dict(post, PostHashHex=post_hash, TimestampNanos=int(at * 1e9))
+        self.posts[post_hash] = post
+        if post["ParentStakeID"]:
+            self.comments[post["ParentStakeID"]].append(post_hash)
+        elif top_level:
+            self.top_level[post["PosterPublicKeyBase58Check"]].append(post_hash)
+
+    def _settle(self):
+        """Commit every submitted txn whose commit time has passed. Caller holds the lock."""
+        now = time.time()
+        while self.pending and self.pending[0][0] <= now:
+            commit_at, txn_hash = heapq.heappop(self.pending)
+            txn = self.txns[txn_hash]
+            txn["committed"] = True
+            if txn["post"] is not None:
+                self._commit(txn["post"], txn_hash, commit_at)
+
+    def set_config(self, config, post_hash=None):
+        """Serve `config` (a dict) as the body of the config post `post_hash`."""
+        post_hash = post_hash or hashlib.sha256(b"mock-config").hexdigest()
+        with self.lock:
+            self._commit(self._new_post(self.public_key, json.dumps(config), "", {}), post_hash, time.time(), False)
+        self.config_post_hash = post_hash
+        return post_hash
+
+    def seed_history(self, nodes, days, comments_per_day, post_tag=DEFAULT_POST_TAG, end=None, legacy=False):
+        """
+        Create one daily post per day for the last `days` days, each with measurement comments.
+
+        With `legacy`, comments only carry the timings in the body (no structured PostExtraData),
+        like result comments posted before schema 1.
+        """
+        end = end or time.time()
+        with self.lock:
+            for day in range(days - 1, -1, -1):
+                day_start = (end - (end % 86400)) - day * 86400
+                daily_hash = hashlib.sha256(f"daily-{day_start}".encode()).hexdigest()
+                self._commit(self._new_post(self.public_key, f"Daily DeSo node performance {post_tag}", "", {}),
+                             daily_hash, day_start + 1)
+                for i in range(comments_per_day):
+                    at = day_start + 60 + i * (86400 - 120) / max(1, comments_per_day)
+                    if at > end:
+                        break
+                    node = nodes[i % len(nodes)]
+                    timestamp = datetime.datetime.utcfromtimestamp(at).strftime(TIMESTAMP_FORMAT)
+                    post, confirm = self.rng.uniform(0.1, 1.5), self.rng.uniform(1.0, 6.0)
+                    body = measurement_body(node, timestamp, post, confirm, post_tag)
+                    if legacy:
+                        extra_data = {"Node": node}
+                    else:
+                        phases = {"construct": post * 0.4, "sign": 0.001, "submit": post * 0.6 - 0.001,
+                                  "mempool": confirm * 0.1, "commit": confirm * 0.9}
+                        extra_data = measurement_extra_data(node, int(at), post, confirm, 0.1, post + confirm, phases)
+                    comment_hash = hashlib.sha256(f"{daily_hash}-{i}".encode()).hexdigest()
+                    self._commit(self._new_post(self.public_key, body, daily_hash, extra_data), comment_hash, at)
+
+    # --- Endpoints: each takes the decoded request and returns (status, response dict) ---
+
+    def submit_post(self, req):
+        body_obj = req.get("BodyObj") or {}
+        post = self._new_post(req.get("UpdaterPublicKeyBase58Check", ""), body_obj.get("Body", ""),
+                              req.get("ParentStakeID", ""), req.get("PostExtraData"), body_obj.get("ImageURLs"))
+        txn_hex = os.urandom(120).hex()
+        with self.lock:
+            self.unsigned[txn_hex] = post
+        return 200, {"TransactionHex": txn_hex, "TstampNanos": time.time_ns(), "FeeNanos": 168}
+
+    def _submit(self, txn_hex):
+        txn_hash = hashlib.sha256(hashlib.sha256(bytes.fromhex(txn_hex)).digest()).hexdigest()
+        now = time.time()
+        with self.lock:
+            post = self.unsigned.pop(txn_hex, None)
+            dropped = self.rng.random() < self.drop_rate
+            commit_at = None if dropped else now + self.commit_delay(self.rng)
+            self.txns[txn_hash] = {"post": post, "submitted_at": now, "commit_at": commit_at, "committed": False}
+            if commit_at is not None:
+                heapq.heappush(self.pending, (commit_at, txn_hash))
+        return txn_hash
+
+    def submit_transaction(self, req):
+        txn_hex = req.get("UnsignedTransactionHex", "")
+        if not req.get("TransactionSignatureHex"):
+            return 400, {"error": "missing TransactionSignatureHex"}
+        return 200, {"TxnHashHex": self._submit(txn_hex), "Transaction": {}}
+
+    def submit_atomic_transaction(self, req):
+        txn_hex = req.get("IncompleteAtomicTransactionHex", "")
+        inner = req.get("UnsignedInnerTransactionsHex") or []
+        if len(inner) != len(req.get("TransactionSignaturesHex") or []):
+            return 400, {"error": "signature count does not match inner transactions"}
+        return 200, {"TxnHashHex": self._submit(txn_hex), "InnerTransactionHashHexes": [self._submit(h) for h in inner]}
+
+    def get_txn(self, req):
+        txn_hash = req.get("TxnHashHex", "")
+        with self.lock:
+            self._settle()
+            txn = self.txns.get(txn_hash)
+            if req.get("TxnStatus") == "Committed":
+                found = bool(txn and txn["committed"])
+            else:
+                found = txn is not None
+        return 200, {"TxnFound": found}
+
+    def get_single_post(self, req):
+        post_hash = req.get("PostHashHex", "")
+        offset = int(req.get("CommentOffset", 0) or 0)
+        limit = int(req.get("CommentLimit", 20) or 0)
+        with self.lock:
+            self._settle()
+            post = self.posts.get(post_hash)
+            if post is None:
+                return 404, {"error": f"post {post_hash} not found"}
+            hashes = self.comments.get(post_hash, [])
+            if self.comment_order == "newest":
+                hashes = hashes[::-1]
+            comments = [self.posts[h] for h in hashes[offset:offset + limit]]
+            return 200, {"PostFound": dict(post, Comments=comments, CommentCount=len(hashes))}
+
+    def get_posts_for_public_key(self, req):
+        public_key = req.get("PublicKeyBase58Check", "")
+        num = int(req.get("NumToFetch", 10) or 10)
+        with self.lock:
+            self._settle()
+            hashes = self.top_level.get(public_key, [])[::-1][:num]
+            return 200, {"Posts": [self.posts[h] for h in hashes]}
+
+    def upload_image(self, raw_body):
+        digest = hashlib.sha256(raw_body).hexdigest()
+        with self.lock:
+            self.images[digest] = len(raw_body)
+        return 200, {"ImageURL": f"https://images.mock.local/{digest[:32]}.png"}
+
+    def get_app_state(self, req):
+        with self.lock:
+            height = len(self.txns)
+        return 200, {"BlockHeight": height, "MinSatoshisBurnedForProfileCreation": 0,
+                     "IsTestnet": False, "DefaultFeeRateNanosPerKB": 1000}
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": dict(self.requests),
+                "errors": dict(self.errors),
+                "total_requests": sum(self.requests.values()),
+                "bytes_out": self.bytes_out,
+                "txns": len(self.txns),
+                "posts": len(self.posts),
+                "images": len(self.images),
+            }
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.errors.clear()
+            self.bytes_out = 0
+
+
+JSON_ENDPOINTS = {
+    "submit-post": MockDeSoNode.submit_post,
+    "submit-transaction": MockDeSoNode.submit_transaction,
+    "submit-atomic-transaction": MockDeSoNode.submit_atomic_transaction,
+    "get-txn": MockDeSoNode.get_txn,
+    "get-single-post": MockDeSoNode.get_single_post,
+    "get-posts-for-public-key": MockDeSoNode.get_posts_for_public_key,
+    "get-app-state": MockDeSoNode.get_app_state,
+}
+
+
+def make_handler(node):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like a real node behind a proxy
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            with node.lock:
+                node.bytes_out += len(data)
+
+        def do_GET(self):
+            if self.path == "/mock/stats":
+                self._send(200, node.stats())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+            if self.path == "/mock/reset":
+                node.reset_stats()
+                self._send(200, {"ok": True})
+                return
+            endpoint = self.path.rsplit("/", 1)[-1]
+            if not self.path.startswith("/api/v0/") or (endpoint not in JSON_ENDPOINTS and endpoint != "upload-image"):
+                self._send(404, {"error": f"unknown endpoint {self.path}"})
+                return
+            with node.lock:
+                node.requests[endpoint] += 1
+                delay = node.endpoint_latency.get(endpoint, node.latency)(node.rng)
+                fail = node.rng.random() < node.error_rate
+            time.sleep(delay)
+            if fail:
+                with node.lock:
+                    node.errors[endpoint] += 1
+                self._send(500, {"error": "mock node injected failure"})
+                return
+            if endpoint == "upload-image":
+                status, payload = node.upload_image(raw)
+            else:
+                try:
+                    req = json.loads(raw or b"{}")
+                except ValueError:
+                    self._send(400, {"error": "invalid JSON"})
+                    return
+                status, payload = JSON_ENDPOINTS[endpoint](node, req)
+            if status != 200:
+                with node.lock:
+                    node.errors[endpoint] += 1
+            self._send(status, payload)
+
+    return Handler
+
+
+def start_mock_node(host="127.0.0.1", port=0, **kwargs):
+    """
+    Start a MockDeSoNode in a background thread.
+
+    Returns:
+        (node, server, url): call server.shutdown() to stop it.
+    """
+    node = MockDeSoNode(**kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(node))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return node, server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock DeSo node")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18001)
+    parser.add_argument("--latency", default="fixed:0", help="per-request delay spec, e.g. lognormal:0.08:0.5")
+    parser.add_argument("--endpoint-latency", action="append", default=[], metavar="ENDPOINT=SPEC",
+                        help="per-endpoint delay override, repeatable")
+    parser.add_argument("--commit-delay", default="uniform:1:4", help="submit-to-commit delay spec")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with HTTP 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of txns that never commit")
+    parser.add_argument("--comment-order", choices=("oldest", "newest"), default="oldest")
+    parser.add_argument("--public-key", default=DEFAULT_PUBLIC_KEY)
+    parser.add_argument("--seed-days", type=int, default=0, help="days of daily posts to pre-populate")
+    parser.add_argument("--comments-per-day", type=int, default=432, help="measurement comments per seeded day")
+    parser.add_argument("--legacy-comments", action="store_true",
+                        help="seed comments without structured PostExtraData timings")
+    parser.add_argument("--nodes", default="", help="comma-separated node URLs for seeded comments and the config post")
+    parser.add_argument("--config-post-hash", default=os.getenv("CONFIG_POST_HASH"),
+                        help="serve a config post under this hash")
+    parser.add_argument("--schedule-interval", type=int, default=600, help="SCHEDULE_INTERVAL in the config post")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    url = f"http://{args.host}:{args.port}"
+    nodes = [n.strip() for n in args.nodes.split(",") if n.strip()] or [url]
+    config = None
+    if args.config_post_hash:
+        config = {"NODES": nodes, "SCHEDULE_INTERVAL": args.schedule_interval, "GRAPH_DAYS": max(1, args.seed_days or 7)}
+    node, server, url = start_mock_node(
+        args.host, args.port,
+        latency=args.latency,
+        endpoint_latency=dict(item.split("=", 1) for item in args.endpoint_latency),
+        commit_delay=args.commit_delay,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        comment_order=args.comment_order,
+        public_key=args.public_key,
+        config=config,
+        config_post_hash=args.config_post_hash,
+        seed=args.seed,
+    )
+    if args.seed_days:
+        node.seed_history(nodes, args.seed_days, args.comments_per_day, legacy=args.legacy_comments)
+    print(f"🧪 Mock DeSo node listening on {url} ({len(node.posts)} posts seeded)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+"""
+On-chain measurement ingestion for DesoMonitor graphs.
+
+The daily graph, the median bar chart and the gauge all need the same data:
+the measurement comments under the last GRAPH_DAYS daily posts. This module
+fetches and parses that window once into a MeasurementDataset that every
+renderer consumes, instead of each renderer scraping the chain on its own.
+
+Parsed comments are kept in a CommentCache, so later runs only download
+comments that are new since the last sync, and days whose daily post has
+rolled over are never fetched again. The cache also keeps hourly and
+daily rollups (with quantile sketches) per daily post, so window-wide
+percentiles and long-horizon charts come from merging a few rollups
+instead of a pass over every sample.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import datetime
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from measurement_parser import parse_comment_posts, PHASES
+from rollups import Rollup, RollupStore, RESOLUTIONS, bucket_start, pick_resolution
+
+# Comments per get-single-post request; large threads are paged through CommentOffset
+DEFAULT_COMMENT_PAGE_SIZE = 200
+
+
+class MeasurementDataset:
+    """
+    Parsed measurement comments for a time window, per node, as NumPy columns.
+
+    For every node, `series[node]` holds equally long arrays sorted by time:
+    "ts" (int64 epoch seconds), "post" / "confirm" / "total" and one column
+    per probe phase in PHASES (float64 seconds, NaN where the comment did
+    not carry that value).
+
+    `rollups` optionally holds hourly / daily rollups of "post" / "confirm" /
+    "total" over the window (only buckets starting at or after the cutoff),
+    and `sketches[node][field]` a DDSketch of exactly the samples at or after
+    the cutoff: the daily rollups from the first whole day on, plus the raw
+    samples between the cutoff and that day. quantile() prefers it over the
+    raw values.
+    """
+
+    FIELDS = ("post", "confirm", "total") + PHASES
+
+    def __init__(self, nodes, graph_days, cutoff, series, comment_count=0, rollups=None):
+        self.nodes = list(nodes)
+        self.graph_days = graph_days
+        self.cutoff = cutoff
+        self.series = series
+        self.comment_count = comment_count
+        self.rollups = rollups
+        self.sketches = {}
+        if rollups is not None:
+            cutoff_epoch = int(cutoff.replace(tzinfo=datetime.timezone.utc).timestamp())
+            first_day = bucket_start(cutoff_epoch + RESOLUTIONS["day"] - 1, "day")
+            for node in self.nodes:
+                merged = rollups.merged(node, "day", since=first_day) or Rollup()
+                # The partial day before the first whole one comes from the raw samples
+                columns = series.get(node)
+                if columns is not None:
+                    for i in np.flatnonzero((columns["ts"] >= cutoff_epoch) & (columns["ts"] < first_day)):
+                        merged.add({field: float(columns[field][i]) for field in ("post", "confirm", "total")})
+                if merged.fields:
+                    self.sketches[node] = merged.fields
+
+    @classmethod
+    def from_records(cls, nodes, graph_days, cutoff, records, comment_count=0, rollups=None):
+        """
+        Build a dataset from (node, epoch_ts, post, confirm, total[, phases]) tuples, None for missing
+        values; `phases` is a sequence of seconds aligned with PHASES.
+        """
+        grouped = {node: [] for node in nodes}
+        no_phases = (None,) * len(PHASES)
+        for node, ts, post, confirm, total, *rest in records:
+            if node in grouped:
+                phases = rest[0] if rest and rest[0] else no_phases
+                grouped[node].append([ts] + [np.nan if v is None else v for v in (post, confirm, total, *phases)])
+        series = {}
+        for node, rows in grouped.items():
+            rows.sort(key=lambda r: r[0])
+            columns = np.array(rows, dtype=np.float64).reshape(-1, len(cls.FIELDS) + 1)
+            series[node] = {"ts": columns[:, 0].astype(np.int64)}
+            for i, field in enumerate(cls.FIELDS, 1):
+                series[node][field] = columns[:, i]
+        return cls(nodes, graph_days, cutoff, series, comment_count, rollups)
+
+    def digest(self):
+        """
+        sha256 hex digest of the dataset contents (nodes, window length, every sample,
+        and the rollup buckets and sketches that bucketed charts and quantiles come from).
+
+        Two datasets with the same digest render identical charts, so it is used
+        as the content address of rendered graph artifacts.
+        """
+        h = hashlib.sha256(json.dumps([self.nodes, self.graph_days]).encode("utf-8"))
+        rollups = self.rollups.copy() if self.rollups is not None else None
+        for node in self.nodes:
+            columns = self.series.get(node)
+            h.update(node.encode("utf-8") + b"\0")
+            if columns is not None:
+                for field in ("ts",) + self.FIELDS:
+                    h.update(np.ascontiguousarray(columns[field]).tobytes())
+            if rollups is not None:
+                buckets = {resolution: [[start, rollup.to_dict()] for start, rollup in sorted(table.get(node, {}).items())]
+                           for resolution, table in rollups.tables.items()}
+                sketches = {field: sketch.to_dict() for field, sketch in self.sketches.get(node, {}).items()}
+                h.update(json.dumps([buckets, sketches], sort_keys=True).encode("utf-8"))
+            h.update(b"\1")
+        return h.hexdigest()
+
+    def values(self, node, field):
+        """(times, values) for `field` of `node`, skipping missing values; times are datetime64[s]."""
+        columns = self.series.get(node)
+        if columns is None:
+            return np.array([], dtype="datetime64[s]"), np.array([], dtype=np.float64)
+        mask = ~np.isnan(columns[field])
+        return columns["ts"][mask].astype("datetime64[s]"), columns[field][mask]
+
+    def median(self, node, field):
+        """Median of `field` for `node`, or None if the node has no such values."""
+        _, values = self.values(node, field)
+        return float(np.median(values)) if values.size else None
+
+    def resolution(self, min_points):
+        """
+        "raw", "hour" or "day" for charting the window: the coarsest rollup resolution
+        with at least `min_points` buckets (see rollups.pick_resolution), "raw" if there are no rollups.
+        """
+        if self.rollups is None:
+            return "raw"
+        return pick_resolution(self.graph_days * 86400, min_points)
+
+    def bucketed(self, node, field, resolution):
+        """
+        (times, mean, low, high) of `field` for `node` per `resolution` bucket, skipping
+        empty buckets; times are the bucket midpoints as datetime64[s], low/high the bucket min/max.
+        """
+        columns = self.rollups.columns(node, resolution, field)
+        mask = ~np.isnan(columns["mean"])
+        times = (columns["ts"][mask] + RESOLUTIONS[resolution] // 2).astype("datetime64[s]")
+        return times, columns["mean"][mask], columns["min"][mask], columns["max"][mask]
+
+    def quantile(self, node, field, q=0.5):
+        """`q`-quantile of `field` for `node` from its sketch if there is one, else from the raw values; None if no values."""
+        sketch = self.sketches.get(node, {}).get(field)
+        if sketch is not None:
+            return sketch.quantile(q)
+        _, values = self.values(node, field)
+        return float(np.quantile(values, q)) if values.size else None
+
+
+def fetch_comment_page(client, post_hash, offset, limit):
+    """One page of comments under `post_hash` (get-single-post with CommentOffset/CommentLimit)."""
+    url = f"{client.node_url}/api/v0/get-single-post"
+    payload = {"PostHashHex": post_hash, "CommentOffset": offset, "CommentLimit": limit}
+    resp = client.session.post(url, json=payload)
+    resp.raise_for_status()
+    return (resp.json().get("PostFound") or {}).get("Comments") or []
+
+
+def iter_post_comments(client, post_hash, page_size=DEFAULT_COMMENT_PAGE_SIZE, offset=0, prefetch=True):
+    """
+    Stream the comments under `post_hash`, page by page over CommentOffset.
+
+    With `prefetch`, the next page is requested in the background while the
+    caller works through the current one, so parsing overlaps network I/O.
+    At most two pages are held in memory however large the thread is. Stops
+    at the first short page.
+
+    Yields:
+        comment dicts as returned by get-single-post.
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        page = fetch_comment_page(client, post_hash, offset, page_size)
+        while True:
+            pending = None
+            if executor and len(page) >= page_size:
+                pending = executor.submit(fetch_comment_page, client, post_hash, offset + len(page), page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += len(page)
+            page = pending.result() if pending else fetch_comment_page(client, post_hash, offset, page_size)
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CommentCache:
+    """
+    Local cache of parsed measurement comments, keyed by PostHashHex, per daily post.
+
+    For every daily post it remembers which comment hashes were already seen
+    (non-measurement comments are stored as None) and whether the post is
+    frozen. A post is frozen once a newer daily post has existed for longer
+    than `freeze_grace` seconds, so late replies from in-flight probes still
+    land; frozen posts are never fetched again. With path=None the cache
+    lives in memory only.
+    """
+
+    def __init__(self, path=None, freeze_grace=3600):
+        self.path = path
+        self.freeze_grace = freeze_grace
+        self.posts = {}
+        self._rollups = {}  # post hash -> in-memory RollupStore, built from the cached records on first use
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.posts = json.load(f).get("posts", {})
+            except (OSError, ValueError) as e:
+                logging.warning(f"⚠️ Ignoring unreadable comment cache {path}: {e}")
+
+    def entry(self, post_hash):
+        return self.posts.setdefault(post_hash, {"comments": {}, "frozen": False})
+
+    def sync(self, client, post_hash, post_tag, page_size, freeze=False):
+        """
+        Fetch only comments under `post_hash` that are not cached yet, parse and store them.
+
+        Works whatever order the node returns comments in: a head scan from
+        offset 0 stops at the first known comment (newest-first order), then
+        a tail scan streams on from the number of known comments
+        (oldest-first order). Pages are fetched by offset, so a thread that
+        grows between two requests shifts comments into the next page; a
+        comment already known or queued is skipped. Returns the number of
+        comments seen.
+        """
+        with self._lock:
+            entry = self.entry(post_hash)
+            if entry["frozen"]:
+                return 0
+            known = entry["comments"]
+            queued = set()
+            seen = 0
+            # Head scan without prefetch: usually only part of one page is new
+            if known:
+                new = []
+                for c in iter_post_comments(client, post_hash, page_size, prefetch=False):
+                    seen += 1
+                    comment_hash = c.get("PostHashHex")
+                    if comment_hash in known:
+                        break
+                    if comment_hash not in queued:
+                        queued.add(comment_hash)
+                        new.append(c)
+                self._add(post_hash, new, post_tag)
+            # Tail scan, parsed a page at a time so memory stays bounded
+            new = []
+            for c in iter_post_comments(client, post_hash, page_size, offset=len(known)):
+                seen += 1
+                comment_hash = c.get("PostHashHex")
+                if comment_hash not in known and comment_hash not in queued:
+                    queued.add(comment_hash)
+                    new.append(c)
+                if len(new) >= page_size:
+                    self._add(post_hash, new, post_tag)
+                    new = []
+            self._add(post_hash, new, post_tag)
+            if freeze:
+                entry["frozen"] = True
+            return seen
+
+    def _add(self, post_hash, comments, post_tag):
+        """
+        Parse `comments` in one batch and store them; non-measurement comments are stored as None.
+        Comments already stored are skipped, so a sample is rolled up once however often it is fetched.
+        """
+        known = self.posts[post_hash]["comments"]
+        rollups = self._rollups.get(post_hash)
+        for c, record in zip(comments, parse_comment_posts(comments, post_tag)):
+            comment_hash = c.get("PostHashHex")
+            if comment_hash in known:
+                continue
+            if record is None:
+                known[comment_hash] = None
+                continue
+            known[comment_hash] = list(record.sample()) + ([list(record.phases)] if record.phases else [])
+            if rollups is not None:
+                self._roll_up(rollups, record.sample())
+
+    @staticmethod
+    def _roll_up(rollups, record):
+        node, ts, post, confirm, total = record[:5]
+        rollups.add(node, ts, {"post": post, "confirm": confirm, "total": total})
+
+    def rollups(self, post_hash):
+        """Per-node hourly / daily rollups (a RollupStore) of the measurements cached for `post_hash`."""
+        with self._lock:
+            rollups = self._rollups.get(post_hash)
+            if rollups is None:
+                rollups = self._rollups[post_hash] = RollupStore()
+                for record in self.records(post_hash):
+                    self._roll_up(rollups, record)
+            return rollups
+
+    def comment_count(self, post_hash):
+        return len(self.posts.get(post_hash, {}).get("comments", {}))
+
+    def records(self, post_hash):
+        """Parsed (node, ts, post, confirm, total[, phases]) records cached for `post_hash`."""
+        comments = self.posts.get(post_hash, {}).get("comments", {})
+        return [tuple(r) for r in comments.values() if r]
+
+    def prune(self, keep_hashes):
+        """Forget daily posts that fell out of the window."""
+        with self._lock:
+            for post_hash in list(self.posts):
+                if post_hash not in keep_hashes:
+                    del self.posts[post_hash]
+                    self._rollups.pop(post_hash, None)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"posts": self.posts}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+
+
+def select_daily_posts(client, public_key, post_tag, graph_days, page_size, cache):
+    """
+    Find the newest daily post with comments for each of the last `graph_days` days,
+    syncing each candidate's comments into `cache`.
+
+    Returns:
+        list of selected daily post hashes, newest day first.
+    """
+    url = f"{client.node_url}/api/v0/get-posts-for-public-key"
+    payload = {"PublicKeyBase58Check": public_key, "NumToFetch": graph_days * 3 + 20}
+    resp = client.session.post(url, json=payload)
+    resp.raise_for_status()
+    posts = resp.json().get("Posts", [])
+    daily_posts_by_date = defaultdict(list)
+    for post in posts:
+        if post_tag in post.get("Body", ""):
+            post_time = post.get("TimestampNanos")
+            if post_time:
+                t = datetime.datetime.utcfromtimestamp(int(post_time) / 1e9)
+                date_str = t.strftime("%Y-%m-%d")
+                daily_posts_by_date[date_str].append((t, post))
+    # The newest daily post still receives measurements; older ones freeze after a grace period
+    all_daily = sorted((t for entries in daily_posts_by_date.values() for t, _ in entries), reverse=True)
+    newest_time = all_daily[0] if all_daily else None
+    freeze_before = datetime.datetime.utcnow() - datetime.timedelta(seconds=cache.freeze_grace)
+    selected = []
+    comments_seen = 0
+    today = datetime.datetime.utcnow().date()
+    for i in range(graph_days):
+        day = today - datetime.timedelta(days=i)
+        date_str = day.strftime("%Y-%m-%d")
+        posts_for_day = sorted(daily_posts_by_date.get(date_str, []), key=lambda x: x[0], reverse=True)
+        for t, post in posts_for_day:
+            daily_post_hash = post.get("PostHashHex")
+            newer = [n for n in all_daily if n > t]
+            freeze = bool(newer) and min(newer) <= freeze_before
+            comments_seen += cache.sync(client, daily_post_hash, post_tag, page_size, freeze=freeze)
+            if cache.comment_count(daily_post_hash):
+                selected.append(daily_post_hash)
+                break
+    cache.prune({post.get("PostHashHex") for entries in daily_posts_by_date.values() for _, post in entries})
+    cache.save()
+    logging.info(f"🌐 Comment sync streamed {comments_seen} comments for {len(selected)} daily posts (newest: {newest_time})")
+    return selected
+
+
+def fetch_measurement_dataset(client, public_key, post_tag, nodes, graph_days, cache=None,
+                              page_size=DEFAULT_COMMENT_PAGE_SIZE):
+    """
+    Fetch and parse the measurement comments of the last `graph_days` days in one pass.
+
+    Args:
+        client: DeSoDexClient used for the read-only API calls.
+        public_key: Account that posts the daily summaries.
+        post_tag: Hashtag marking daily posts and measurement comments.
+        nodes: Nodes to keep; comments for other nodes are ignored.
+        graph_days: Window length in days.
+        cache: CommentCache to sync incrementally; a throwaway in-memory cache if None.
+        page_size: Comments requested per get-single-post call.
+
+    Returns:
+        MeasurementDataset
+    """
+    start = time.time()
+    if cache is None:
+        cache = CommentCache()
+    selected = select_daily_posts(client, public_key, post_tag, graph_days, page_size, cache)
+    measurement_records = [record for post_hash in selected for record in cache.records(post_hash)]
+    logging.info(f"🔎 Found {len(measurement_records)} on-chain measurement comments for last {graph_days} days.")
+
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=graph_days)
+    cutoff_epoch = int(cutoff.replace(tzinfo=datetime.timezone.utc).timestamp())
+    wanted = set(nodes)
+    records = [r for r in measurement_records if r[0] in wanted and r[1] >= cutoff_epoch]
+    # Window rollups: merge the daily posts' buckets that start inside the window instead of
+    # re-aggregating samples; the dataset fills in the partial day at the cutoff from the raw samples
+    rollups = RollupStore()
+    for post_hash in selected:
+        rollups.merge(cache.rollups(post_hash), since=cutoff_epoch)
+    rollups.prune(nodes=wanted)
+    dataset = MeasurementDataset.from_records(nodes, graph_days, cutoff, records, len(measurement_records), rollups)
+    logging.info(f"📦 On-chain dataset ready: {len(records)} samples for {len(nodes)} nodes in {time.time() - start:.2f}s")
+    return dataset
@@ -0,0 +1,137 @@
+"""
+Mergeable streaming quantile sketches for DesoMonitor latency summaries.
+
+DDSketch keeps a count per logarithmic bucket: with relative accuracy `a`,
+every quantile it returns is within a factor (1 ± a) of a true sample value
+at that rank. Memory is bounded by `max_bins` whatever the number of
+samples (latencies between 10 ms and 2 min need ~470 buckets at 1%), and
+two sketches of the same accuracy merge by adding their bucket counts, so
+a multi-day summary is the merge of the daily sketches instead of a pass
+over the raw samples. The per-bucket sketches live in rollups.Rollup.
+
+    sketch = DDSketch()
+    for value in (0.41, 2.87, 3.28):
+        sketch.add(value)
+    sketch.summary()  # {"count": 3, "p50": ..., "p90": ..., "p99": ..., "max": 3.28}
+"""
+
+import math
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+# Values at or below this are counted as zero (timings are never negative)
+MIN_INDEXABLE_VALUE = 1e-9
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative-error guarantees (Masson et al., "DDSketch", VLDB 2019).
+
+    Args:
+        relative_accuracy: Relative error bound of the returned quantiles.
+        max_bins: Bucket limit; past it the lowest buckets are collapsed, which
+            only loses accuracy at the low end and keeps the tail quantiles exact to `relative_accuracy`.
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, max_bins=DEFAULT_MAX_BINS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value, count=1):
+        """Add `value` (seconds, >= 0) `count` times."""
+        if value <= MIN_INDEXABLE_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self):
+        """Fold the lowest buckets into one until at most max_bins remain."""
+        indexes = sorted(self.bins)
+        excess = len(indexes) - self.max_bins
+        target = indexes[excess]
+        for index in indexes[:excess]:
+            self.bins[target] += self.bins.pop(index)
+
+    def merge(self, other):
+        """Add all samples of `other` (same relative accuracy) to this sketch; returns self."""
+        if other.gamma != self.gamma:
+            raise ValueError("Can only merge sketches with the same relative accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Estimated `q`-quantile (0 <= q <= 1), or None for an empty sketch."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # Bucket midpoint in the relative sense: within (1 ± a) of every value in the bucket
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def summary(self, quantiles=SUMMARY_QUANTILES):
+        """{"count", "p50", "p90", "p99", "max"} for the default quantiles (values None when empty)."""
+        result = {"count": self.count}
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.quantile(q)
+        result["max"] = self.max if self.count else None
+        return result
+
+    def to_dict(self):
+        return {
+            "a": self.relative_accuracy,
+            "bins": {str(index): count for index, count in self.bins.items()},
+            "zero": self.zero_count,
+            "n": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data, max_bins=DEFAULT_MAX_BINS):
+        sketch = cls(data["a"], max_bins)
+        sketch.bins = {int(index): count for index, count in data["bins"].items()}
+        sketch.zero_count = data["zero"]
+        sketch.count = data["n"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
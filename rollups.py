@@ -0,0 +1,279 @@
+"""
+Per-node rollups of DesoMonitor measurements in fixed UTC time buckets.
+
+A Rollup summarises one node's samples in one bucket: number of probes,
+timeouts and errors, and a DDSketch per timing field (which also tracks
+its min, max and mean). RollupStore keeps an hourly and a daily table per
+node and updates both as each sample arrives, so p50/p90/p99/max over
+many days is a merge of a few daily sketches, and a chart over a long
+horizon reads a few hundred buckets instead of every raw sample.
+
+    rollups = RollupStore("measurement_rollups.json", retention={"hour": 35 * 86400, "day": 400 * 86400})
+    rollups.add(node, epoch_ts, {"post": 0.41, "confirm": 2.87, "total": 3.28})
+    rollups.add(node, epoch_ts, None, STATUS_TIMEOUT)
+    rollups.merged(node, "day", since=epoch_ts - 86400).summary("total")  # {"p50", "p90", "p99", "max", ...}
+    rollups.columns(node, "hour", "total")  # {"ts", "count", "timeouts", "min", "max", "mean"} arrays
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+import numpy as np
+
+from measurement_store import STATUS_OK, STATUS_TIMEOUT
+from quantile_sketch import DDSketch
+
+# Bucket width in seconds per resolution, finest first
+RESOLUTIONS = {"hour": 3600, "day": 86400}
+ROLLUP_FIELDS = ("post", "confirm", "total")
+
+
+def bucket_start(epoch_ts, resolution):
+    """Start (epoch seconds, UTC-aligned) of the `resolution` bucket containing `epoch_ts`."""
+    width = RESOLUTIONS[resolution]
+    return int(epoch_ts) // width * width
+
+
+def pick_resolution(span_seconds, min_points):
+    """
+    The coarsest resolution that still splits `span_seconds` into at least
+    `min_points` buckets, or "raw" if even hourly buckets would be fewer.
+
+    Coarsest-first keeps a chart's point count bounded as the range grows
+    (a 90-day range is 90 daily points, not 2160 hourly ones), while
+    `min_points` keeps short ranges from collapsing into a handful of buckets.
+    """
+    for resolution, width in reversed(RESOLUTIONS.items()):
+        if span_seconds // width >= min_points:
+            return resolution
+    return "raw"
+
+
+class Rollup:
+    """All samples of one node in one bucket: probe / timeout / error counts plus a DDSketch per timing field."""
+
+    __slots__ = ("count", "timeouts", "errors", "fields")
+
+    def __init__(self):
+        self.count = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.fields = {}
+
+    def add(self, measurement, status=STATUS_OK):
+        self.count += 1
+        if status == STATUS_TIMEOUT:
+            self.timeouts += 1
+        elif status != STATUS_OK:
+            self.errors += 1
+        if status != STATUS_OK or not measurement:
+            return
+        for field in ROLLUP_FIELDS:
+            value = measurement.get(field)
+            if value is None or value != value:  # missing or NaN
+                continue
+            sketch = self.fields.get(field)
+            if sketch is None:
+                sketch = self.fields[field] = DDSketch()
+            sketch.add(value)
+
+    def merge(self, other):
+        """Add `other`'s samples to this rollup; returns self."""
+        self.count += other.count
+        self.timeouts += other.timeouts
+        self.errors += other.errors
+        for field, sketch in other.fields.items():
+            if field not in self.fields:
+                self.fields[field] = DDSketch(sketch.relative_accuracy)
+            self.fields[field].merge(sketch)
+        return self
+
+    def summary(self, field):
+        """
+        {"count", "p50", "p90", "p99", "max", "mean", "probes", "timeouts"} of `field` ("count" is the
+        samples with a value, "probes" all probes in the bucket), or None if the bucket has no value for it.
+        """
+        sketch = self.fields.get(field)
+        if sketch is None:
+            return None
+        summary = sketch.summary()
+        summary.update(mean=sketch.mean, probes=self.count, timeouts=self.timeouts)
+        return summary
+
+    def to_dict(self):
+        return {"n": self.count, "t": self.timeouts, "e": self.errors,
+                "f": {field: sketch.to_dict() for field, sketch in self.fields.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        rollup = cls()
+        rollup.count = data["n"]
+        rollup.timeouts = data["t"]
+        rollup.errors = data["e"]
+        rollup.fields = {field: DDSketch.from_dict(sketch) for field, sketch in data["f"].items()}
+        return rollup
+
+
+class RollupStore:
+    """
+    Rollup tables per resolution and node, optionally persisted as a JSON file.
+
+    Thread-safe: samples are added from the probe worker threads, so every
+    read merges or copies buckets under the same lock. `latest` records the
+    newest sample time added per node, so samples that reached the
+    measurement store after the last save() can be replayed at startup.
+
+    Args:
+        path: JSON file, or None to keep the tables in memory only.
+        retention: {resolution: seconds} of buckets to keep on prune(); resolutions not listed are kept forever.
+    """
+
+    def __init__(self, path=None, retention=None):
+        self.path = path
+        self.retention = retention or {}
+        self.tables = {resolution: {} for resolution in RESOLUTIONS}  # resolution -> node -> bucket start -> Rollup
+        self.latest = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for resolution in RESOLUTIONS:
+                    self.tables[resolution] = {
+                        node: {int(start): Rollup.from_dict(rollup) for start, rollup in buckets.items()}
+                        for node, buckets in data.get("tables", {}).get(resolution, {}).items()
+                    }
+                self.latest = data.get("latest", {})
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logging.warning(f"⚠️ Ignoring unreadable rollup file {path}: {e}")
+                self.tables = {resolution: {} for resolution in RESOLUTIONS}
+                self.latest = {}
+
+    def add(self, node, epoch_ts, measurement, status=STATUS_OK):
+        """Add one sample (a timings dict, or None for a failed probe with `status`) to every resolution."""
+        with self._lock:
+            for resolution, table in self.tables.items():
+                buckets = table.setdefault(node, {})
+                start = bucket_start(epoch_ts, resolution)
+                rollup = buckets.get(start)
+                if rollup is None:
+                    rollup = buckets[start] = Rollup()
+                rollup.add(measurement, status)
+            self.latest[node] = max(self.latest.get(node, 0), int(epoch_ts))
+            self._dirty = True
+
+    def _window(self, node, resolution, since=None, until=None):
+        """[(bucket start, Rollup)] of `node` in time order overlapping [since, until); call with the lock held."""
+        first = bucket_start(since, resolution) if since is not None else None
+        return [
+            (start, rollup) for start, rollup in sorted(self.tables[resolution].get(node, {}).items())
+            if (first is None or start >= first) and (until is None or start < until)
+        ]
+
+    def copy(self, since=None):
+        """
+        A new in-memory store with copies of the buckets starting at or after `since` (all if None).
+        Unlike merged() and columns(), a bucket that only partly follows `since` is left out.
+        """
+        copy = RollupStore()
+        with self._lock:
+            for resolution, table in self.tables.items():
+                for node in table:
+                    copy.tables[resolution][node] = {start: Rollup().merge(rollup)
+                                                     for start, rollup in self._window(node, resolution, since)
+                                                     if since is None or start >= since}
+            copy.latest = dict(self.latest)
+        return copy
+
+    def merge(self, other, since=None):
+        """Add `other`'s buckets (those starting at or after `since`, if given) into this store."""
+        # Copy first so the two stores' locks are never held together
+        other = other.copy(since)
+        with self._lock:
+            for resolution, table in other.tables.items():
+                for node, buckets in table.items():
+                    mine = self.tables[resolution].setdefault(node, {})
+                    for start, rollup in buckets.items():
+                        if start in mine:
+                            mine[start].merge(rollup)
+                        else:
+                            mine[start] = rollup
+            self._dirty = True
+
+    def merged(self, node, resolution="day", since=None, until=None):
+        """One Rollup merging `node`'s buckets overlapping [since, until), or None if there are none."""
+        with self._lock:
+            items = self._window(node, resolution, since, until)
+            if not items:
+                return None
+            merged = Rollup()
+            for _, rollup in items:
+                merged.merge(rollup)
+        return merged
+
+    def columns(self, node, resolution, field, since=None, until=None):
+        """
+        Per-bucket arrays for charting `field`: "ts" (int64 bucket start), "count",
+        "timeouts" (int64) and "min", "max", "mean" (float64 seconds, NaN where the bucket has no value).
+        """
+        with self._lock:
+            rows = [
+                (start, rollup.count, rollup.timeouts) + ((sketch.min, sketch.max, sketch.mean) if sketch else (np.nan,) * 3)
+                for start, rollup in self._window(node, resolution, since, until)
+                for sketch in (rollup.fields.get(field),)
+            ]
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        return {
+            "ts": columns[:, 0].astype(np.int64),
+            "count": columns[:, 1].astype(np.int64),
+            "timeouts": columns[:, 2].astype(np.int64),
+            "min": columns[:, 3],
+            "max": columns[:, 4],
+            "mean": columns[:, 5],
+        }
+
+    def prune(self, now=None, nodes=None):
+        """Drop buckets older than their resolution's retention, and nodes not in `nodes` if given. Returns buckets dropped."""
+        now = time.time() if now is None else now
+        dropped = 0
+        with self._lock:
+            for resolution, table in self.tables.items():
+                for node in list(table):
+                    if nodes is not None and node not in nodes:
+                        dropped += len(table.pop(node))
+                        continue
+                    if resolution not in self.retention:
+                        continue
+                    cutoff = bucket_start(now - self.retention[resolution], resolution)
+                    for start in [start for start in table[node] if start < cutoff]:
+                        del table[node][start]
+                        dropped += 1
+            if nodes is not None:
+                self.latest = {node: ts for node, ts in self.latest.items() if node in nodes}
+            self._dirty = self._dirty or dropped > 0
+        return dropped
+
+    def save(self):
+        """Atomically write the tables to `path` if anything changed since the last save."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty and os.path.exists(self.path):
+                return
+            data = {
+                "tables": {
+                    resolution: {node: {str(start): rollup.to_dict() for start, rollup in buckets.items()}
+                                 for node, buckets in table.items()}
+                    for resolution, table in self.tables.items()
+                },
+                "latest": self.latest,
+            }
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from deso_sdk_fork.async_deso_sdk import AsyncDeSoDexClient, create_async_session
+from mock_deso_node import DEFAULT_PUBLIC_KEY, start_mock_node
+
+SEED_HEX = "33" * 32
+
+
+@pytest.fixture
+def mock_node():
+    node, server, url = start_mock_node(seed=1, commit_delay="fixed:0.3")
+    yield node, url
+    server.shutdown()
+
+
+def test_post_and_confirm(mock_node):
+    node, url = mock_node
+
+    async def probe(client, i):
+        resp = await client.submit_post(DEFAULT_PUBLIC_KEY, f"probe {i}")
+        submitted = await client.sign_and_submit_txn(resp)
+        timing = await client.wait_for_commitment_with_timeout(submitted["TxnHashHex"], 10.0,
+                                                               initial_interval=0.05, track_mempool=True)
+        return submitted["TxnHashHex"], timing
+
+    async def run():
+        async with create_async_session(pool_size=4) as session:
+            client = AsyncDeSoDexClient(seed_phrase_or_hex=SEED_HEX, node_url=url, session=session)
+            return await asyncio.gather(*(probe(client, i) for i in range(8)))
+
+    results = asyncio.run(run())
+    assert len({txn_hash for txn_hash, _ in results}) == 8
+    for txn_hash, timing in results:
+        assert node.txns[txn_hash]["committed"]
+        assert timing["started_at"] <= timing["pending_before"] < timing["committed_by"]
+        assert timing["mempool_pending_before"] < timing["mempool_seen_by"] <= timing["committed_by"]
+        assert timing["committed_by"] - timing["started_at"] >= 0.25
+    assert node.requests["submit-post"] == node.requests["submit-transaction"] == 8
+
+
+def test_dropped_txn_times_out(mock_node):
+    node, url = mock_node
+    node.drop_rate = 1.0
+
+    async def run():
+        async with AsyncDeSoDexClient(seed_phrase_or_hex=SEED_HEX, node_url=url) as client:
+            submitted = await client.sign_and_submit_txn(await client.submit_post(DEFAULT_PUBLIC_KEY, "lost"))
+            await client.wait_for_commitment_with_timeout(submitted["TxnHashHex"], 0.3, initial_interval=0.05)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+def test_upload_image_bytes(mock_node):
+    node, url = mock_node
+
+    async def run():
+        async with AsyncDeSoDexClient(seed_phrase_or_hex=SEED_HEX, node_url=url) as client:
+            return await client.upload_image_bytes(b"\x89PNG\r\n\x1a\n", "chart.png", DEFAULT_PUBLIC_KEY, timeout=5.0)
+
+    assert asyncio.run(run())
+    assert node.requests["upload-image"] == 1
@@ -0,0 +1,68 @@
+import json
+import threading
+
+from config_service import ConfigService
+
+
+def make_service(fetch_body, **kwargs):
+    return ConfigService(fetch_body, lambda config: config["NODES"], lambda: ["fallback"], **kwargs)
+
+
+def test_first_get_fetches_and_falls_back_on_failure():
+    def failing():
+        raise OSError("node down")
+
+    assert make_service(failing).get() == ["fallback"]
+    assert make_service(lambda: json.dumps({"NODES": ["a"]})).get() == ["a"]
+
+
+def test_version_only_changes_with_the_body(tmp_path):
+    body = {"NODES": ["a"]}
+    service = make_service(lambda: json.dumps(body), cache_path=str(tmp_path / "config_cache.json"))
+    service.get()
+    assert service.version == 1
+    assert service.refresh() is False
+    body["NODES"] = ["b"]
+    assert service.refresh() is True
+    assert service.version == 2
+    # A restart starts from the last-known-good body even if the node is down
+    def failing():
+        raise OSError("node down")
+
+    restarted = make_service(failing, cache_path=str(tmp_path / "config_cache.json"))
+    assert restarted._value == ["b"]
+
+
+def test_sync_refresh_does_not_allow_a_second_background_refresh():
+    release = threading.Event()
+
+    def slow_fetch():
+        if threading.current_thread() is not threading.main_thread():
+            release.wait(5)
+        return json.dumps({"NODES": ["a"]})
+
+    service = make_service(slow_fetch, ttl=0)
+    service.get()
+    service._refresh_in_background()  # blocks in slow_fetch until released
+    service.refresh()                  # a synchronous refresh meanwhile
+    started = threading.active_count()
+    service._refresh_in_background()  # must not start another thread
+    assert threading.active_count() == started
+    release.set()
+
+
+def test_background_refresh_waits_until_started():
+    fetched = threading.Semaphore(0)
+
+    def fetch():
+        fetched.release()
+        return json.dumps({"NODES": ["a"]})
+
+    service = make_service(fetch, ttl=0, background=False)
+    service.get()
+    assert fetched.acquire(timeout=1)
+    service.get()  # stale, but background refreshes are not enabled yet
+    assert not fetched.acquire(timeout=0.2)
+    service.start_background_refresh()
+    service.get()
+    assert fetched.acquire(timeout=5)
@@ -0,0 +1,90 @@
+import socket
+import time
+
+import pytest
+import requests
+
+from deso_sdk_fork import deso_sdk
+from deso_sdk_fork.deso_sdk import DeSoDexClient, PhaseTimer, get_pooled_session
+from mock_deso_node import start_mock_node
+
+SEED_HEX = "33" * 32
+
+
+def scripted_client(replies):
+    """A client whose get-txn answers come from `replies` ([(status, found)]); records each poll's send time."""
+    client = DeSoDexClient(seed_phrase_or_hex=SEED_HEX, node_url="http://127.0.0.1:9")
+    client.polls = []
+
+    def get_transaction(txn_hash_hex, committed_txns_only):
+        status, found = replies.pop(0)
+        assert status == ("Committed" if committed_txns_only else "InMempool")
+        client.polls.append(time.monotonic())
+        time.sleep(0.01)
+        return {"TxnFound": found}
+
+    client.get_transaction = get_transaction
+    return client
+
+
+def test_commit_bracket_starts_at_the_last_poll_that_found_nothing():
+    client = scripted_client([("InMempool", False), ("InMempool", False), ("InMempool", True), ("Committed", True)])
+    timing = client.wait_for_commitment_with_timeout("txn", 5.0, initial_interval=0.02, track_mempool=True)
+    assert timing["polls"] == 4
+    assert client.polls[0] < timing["mempool_pending_before"] <= client.polls[1] < timing["mempool_seen_by"]
+    # An InMempool hit may already be committed, so the commit bracket opens where the mempool one does
+    assert timing["pending_before"] == timing["mempool_pending_before"]
+    assert timing["mempool_seen_by"] < client.polls[3] < timing["committed_by"]
+
+
+def test_first_mempool_poll_finding_a_committed_txn():
+    client = scripted_client([("InMempool", True), ("Committed", True)])
+    timing = client.wait_for_commitment_with_timeout("txn", 5.0, initial_interval=0.02, track_mempool=True)
+    assert timing["polls"] == 2
+    assert timing["pending_before"] == timing["mempool_pending_before"] == timing["started_at"]
+    assert timing["started_at"] <= client.polls[0] < timing["mempool_seen_by"] < timing["committed_by"]
+
+
+def test_commit_polls_after_the_sighting_raise_the_lower_bound():
+    client = scripted_client([("InMempool", True), ("Committed", False), ("Committed", True)])
+    timing = client.wait_for_commitment_with_timeout("txn", 5.0, initial_interval=0.02, track_mempool=True)
+    assert timing["mempool_seen_by"] < timing["pending_before"] <= client.polls[1] < timing["committed_by"]
+
+
+def test_commit_bracket_follows_pending_polls():
+    client = scripted_client([("Committed", False), ("Committed", False), ("Committed", True)])
+    timing = client.wait_for_commitment_with_timeout("txn", 5.0, initial_interval=0.02)
+    assert timing["polls"] == 3
+    assert client.polls[0] < timing["pending_before"] <= client.polls[1] < timing["committed_by"]
+    assert "mempool_seen_by" not in timing
+
+
+def test_new_connections_report_dns_and_connect():
+    _, server, url = start_mock_node()
+    try:
+        timer = PhaseTimer()
+        with timer.activate():
+            response = get_pooled_session(url).post(f"{url}/api/v0/get-txn", json={"TxnHashHex": "00"})
+        assert response.json() == {"TxnFound": False}
+        assert set(timer.phases) == {"dns", "connect"}
+    finally:
+        server.shutdown()
+
+
+def test_refused_connection_is_attempted_once(monkeypatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]  # closed again before the request, so nothing listens there
+    attempts = []
+
+    def counting_create_connection(address, *args, **kwargs):
+        attempts.append(address)
+        return create_connection(address, *args, **kwargs)
+
+    create_connection = deso_sdk.create_connection
+    monkeypatch.setattr(deso_sdk, "create_connection", counting_create_connection)
+    timer = PhaseTimer()
+    with timer.activate(), pytest.raises(requests.exceptions.ConnectionError):
+        get_pooled_session(f"http://127.0.0.1:{port}").get(f"http://127.0.0.1:{port}/")
+    assert attempts == [("127.0.0.1", port)]
+    assert "connect" in timer.phases
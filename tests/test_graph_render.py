@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from graph_render import RenderPool
+
+PARENT_PID = os.getpid()
+
+
+def _die_in_worker():
+    if os.getpid() != PARENT_PID:
+        os._exit(1)
+
+
+def test_broken_pool_renders_inline_without_forking_again():
+    pool = RenderPool(workers=1)
+    if pool._context is None:
+        pytest.skip("fork start method not available")
+    pool.warm()
+    # The worker dies, so the job is re-run inline
+    assert len(pool.render([(_die_in_worker, ())])) == 1
+    assert pool._executor is None and pool._context is None
+    assert len(pool.render([(_die_in_worker, ())])) == 1
+    assert pool._executor is None
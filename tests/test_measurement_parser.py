@@ -0,0 +1,77 @@
+import calendar
+import time
+
+import pytest
+
+from measurement_parser import (
+    PHASES, MeasurementRecord, decode_timestamp, measurement_extra_data, parse_comment, parse_comments,
+    parse_comment_posts, parse_extra_data,
+)
+
+NODE = "https://node.deso.org"
+TS = calendar.timegm((2025, 1, 1, 12, 0, 7))
+RESULT_BODY = (
+    "\U0001F310 Node check-in RESULT\nPOST: 0.41 sec\nCONFIRM: 2.87 sec (±0.12)\nTotal: 3.28 sec\n"
+    f"Timestamp: 2025-01-01 12:00:07 UTC\nNode: {NODE}\n#desomonitormeasurement"
+)
+
+
+def test_decode_timestamp_matches_strptime():
+    for stamp in ("2025-01-01 12:00:07 UTC", "2024-02-29 23:59:59", "1999-12-31 00:00:00 UTC"):
+        expected = calendar.timegm(time.strptime(stamp.replace(" UTC", ""), "%Y-%m-%d %H:%M:%S"))
+        assert decode_timestamp(stamp) == expected
+
+
+@pytest.mark.parametrize("stamp", [
+    "2025-01-01 12:00 UTC", "2025-01-01T12:00:07 UTC", "2025-01-01 12:00:07 GMT", "2025-13-01 12:00:07 UTC",
+    "2025-02-29 12:00:07 UTC", "2025-01-01 24:00:07 UTC", "2025-01-01 12:60:07 UTC", "2025-01-01 12:00:7x UTC",
+    "2025-01-01 12:00:62 UTC", "abcd-01-01 12:00:07 UTC",
+])
+def test_decode_timestamp_rejects_invalid(stamp):
+    with pytest.raises(ValueError):
+        decode_timestamp(stamp)
+
+
+def test_fast_path_parses_current_layout():
+    assert parse_comment(RESULT_BODY) == MeasurementRecord(NODE, TS, 0.41, 2.87, 3.28)
+
+
+def test_fallback_parses_reordered_and_legacy_layouts():
+    reordered = f"Node: {NODE}\nTimestamp: 2025-01-01 12:00:07 UTC\nTotal: 3.28 sec\nPOST: 0.41 sec\nCONFIRM: 2.87 sec"
+    legacy = f"Node: {NODE}\nElapsed: 5.0 sec\nTimestamp: 2025-01-01 12:00:07 UTC"
+    fast, reordered_record, legacy_record = parse_comments([RESULT_BODY, reordered, legacy])
+    assert reordered_record == fast
+    assert legacy_record.elapsed == 5.0
+    assert legacy_record.sample() == (NODE, TS, 0.5, 4.5, None)
+
+
+def test_non_measurements_and_bad_timestamps_are_none():
+    check_in = f"\U0001F310 Node check-in\nTesting connection...\nTimestamp: 2025-01-01 12:00:07 UTC\nNode: {NODE}"
+    bad_time = RESULT_BODY.replace("2025-01-01 12:00:07", "2025-02-30 12:00:07")
+    no_node = "POST: 0.41 sec\nTimestamp: 2025-01-01 12:00:07 UTC"
+    assert parse_comments([check_in, bad_time, no_node, ""]) == [None, None, None, None]
+
+
+def test_extra_data_round_trip_with_phases():
+    phases = {phase: 0.001 * (i + 1) for i, phase in enumerate(PHASES)}
+    extra = measurement_extra_data(NODE, TS, 0.41, 2.87, 0.12, 3.28, phases)
+    assert all(isinstance(value, str) for value in extra.values())
+    record = parse_extra_data(extra)
+    assert record == MeasurementRecord(NODE, TS, 0.41, 2.87, 3.28, None, tuple(phases[p] for p in PHASES))
+
+
+def test_extra_data_without_phases_or_with_bad_fields():
+    assert parse_extra_data(measurement_extra_data(NODE, TS, 0.41, 2.87, 0.12, 3.28)).phases is None
+    assert parse_extra_data({"Node": NODE}) is None
+    assert parse_extra_data(dict(measurement_extra_data(NODE, TS, 0.41, 2.87, 0.12, 3.28), Ts="soon")) is None
+    assert parse_extra_data(dict(measurement_extra_data(NODE, TS, 0.41, 2.87, 0.12, 3.28), SchemaVersion="0")) is None
+
+
+def test_comment_posts_prefer_extra_data_and_filter_by_tag():
+    structured = {"Body": "edited body", "PostExtraData": measurement_extra_data(NODE, TS, 1.0, 2.0, 0.1, 3.0)}
+    plain = {"Body": RESULT_BODY, "PostExtraData": {"Node": NODE}}
+    untagged = {"Body": RESULT_BODY.replace("#desomonitormeasurement", "")}
+    records = parse_comment_posts([structured, plain, untagged], "#desomonitormeasurement")
+    assert records[0].post == 1.0
+    assert records[1] == MeasurementRecord(NODE, TS, 0.41, 2.87, 3.28)
+    assert records[2] is None
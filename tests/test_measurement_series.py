@@ -0,0 +1,61 @@
+import numpy as np
+
+from measurement_series import NodeSeries, series_capacity
+from measurement_store import STATUS_OK, STATUS_TIMEOUT
+
+BASE = 1767225600  # 2026-01-01 00:00:00 UTC
+
+
+def filled(capacity, count):
+    series = NodeSeries(capacity)
+    for i in range(count):
+        series.append(BASE + i * 60, {"post": float(i), "confirm": 2.0 * i, "total": 3.0 * i})
+    return series
+
+
+def test_wraparound_keeps_newest_in_insertion_order():
+    series = filled(4, 6)
+    assert len(series) == 4
+    cols = series.columns()
+    assert list(cols["ts"]) == [BASE + i * 60 for i in (2, 3, 4, 5)]
+    assert list(cols["post"]) == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_wraparound_at_exact_capacity():
+    series = filled(4, 8)
+    assert list(series.columns()["post"]) == [4.0, 5.0, 6.0, 7.0]
+
+
+def test_window_and_median_skip_failed_samples():
+    series = filled(8, 5)
+    series.append(BASE + 5 * 60, None, STATUS_TIMEOUT)
+    window = series.window(since=BASE + 60, until=BASE + 4 * 60)
+    assert list(window["post"]) == [1.0, 2.0, 3.0]
+    assert series.median("post") == 2.0
+    assert series.counts() == {STATUS_OK: 5, STATUS_TIMEOUT: 1}
+    assert series.median("post", since=BASE + 5 * 60) is None
+
+
+def test_resized_keeps_most_recent_samples_and_keeps_appending():
+    series = filled(4, 6)
+    smaller = series.resized(2)
+    assert list(smaller.columns()["post"]) == [4.0, 5.0]
+    larger = series.resized(8)
+    larger.append(BASE + 6 * 60, {"post": 6.0})
+    assert list(larger.columns()["post"]) == [2.0, 3.0, 4.0, 5.0, 6.0]
+
+
+def test_iteration_yields_legacy_tuples():
+    series = NodeSeries(4)
+    series.append("2026-01-01 00:00:00 UTC", {"post": 0.5, "total": 1.5})
+    series.append("2026-01-01 00:10:00 UTC", None, STATUS_TIMEOUT)
+    assert list(series) == [
+        ("2026-01-01 00:00:00 UTC", {"post": 0.5, "total": 1.5}),
+        ("2026-01-01 00:10:00 UTC", None),
+    ]
+    assert np.isnan(series.columns()["confirm"][0])
+
+
+def test_series_capacity_covers_graph_days_with_headroom():
+    assert series_capacity(7, 600) == int(7 * 144 * 1.25)
+    assert series_capacity(1, 86400) == 64
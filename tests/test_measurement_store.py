@@ -0,0 +1,103 @@
+import datetime
+
+from measurement_store import MeasurementJournal, SQLiteMeasurementStore, open_measurement_store, STATUS_OK, STATUS_TIMEOUT, STATUS_ERROR
+
+NODE = "https://node.example"
+SAMPLE = {"post": 0.4, "confirm": 2.9, "total": 3.3}
+
+
+def make_journal(tmp_path, **kwargs):
+    return MeasurementJournal(str(tmp_path / "measurements.jsonl"), **kwargs)
+
+
+def test_append_buffers_until_batch_is_full(tmp_path):
+    journal = make_journal(tmp_path, batch_size=3, flush_interval=3600)
+    journal.append(NODE, "2026-01-01 00:00:00 UTC", SAMPLE)
+    journal.append(NODE, "2026-01-01 00:10:00 UTC", None, STATUS_TIMEOUT)
+    assert not journal.exists()
+    journal.append(NODE, "2026-01-01 00:20:00 UTC", SAMPLE)
+    assert make_journal(tmp_path).replay() == {NODE: [
+        ("2026-01-01 00:00:00 UTC", SAMPLE, STATUS_OK),
+        ("2026-01-01 00:10:00 UTC", None, STATUS_TIMEOUT),
+        ("2026-01-01 00:20:00 UTC", SAMPLE, STATUS_OK),
+    ]}
+
+
+def test_replay_since_skips_older_samples(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.append(NODE, "2026-01-01 00:00:00 UTC", SAMPLE)
+    journal.append(NODE, "2026-01-03 00:00:00 UTC", SAMPLE)
+    journal.flush()
+    replayed = journal.replay(since=datetime.datetime(2026, 1, 2))
+    assert [entry[0] for entry in replayed[NODE]] == ["2026-01-03 00:00:00 UTC"]
+
+
+def test_compact_drops_expired_and_keeps_unparseable(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.append(NODE, "2026-01-01 00:00:00 UTC", SAMPLE)
+    journal.append(NODE, "not a timestamp", SAMPLE)
+    journal.append("https://other.example", "2026-01-01 12:00:00 UTC", None, STATUS_ERROR)
+    journal.append(NODE, "2026-01-05 00:00:00 UTC", SAMPLE)
+    dropped = journal.compact(datetime.datetime(2026, 1, 2))
+    assert dropped == 2
+    assert make_journal(tmp_path).replay() == {NODE: [
+        ("not a timestamp", SAMPLE, STATUS_OK),
+        ("2026-01-05 00:00:00 UTC", SAMPLE, STATUS_OK),
+    ]}
+
+
+def test_torn_last_line_is_skipped_and_isolated(tmp_path):
+    path = tmp_path / "measurements.jsonl"
+    journal = make_journal(tmp_path)
+    journal.append(NODE, "2026-01-01 00:00:00 UTC", SAMPLE)
+    journal.flush()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"n": "https://node.ex')  # crash mid-write
+    # A fresh process appends after the torn line without gluing onto it
+    journal = make_journal(tmp_path)
+    journal.append(NODE, "2026-01-01 00:10:00 UTC", SAMPLE)
+    journal.flush()
+    assert [entry[0] for entry in journal.replay()[NODE]] == ["2026-01-01 00:00:00 UTC", "2026-01-01 00:10:00 UTC"]
+
+
+def test_legacy_records_are_migrated(tmp_path):
+    path = tmp_path / "measurements.jsonl"
+    path.write_text(
+        '{"n":"%s","t":"2026-01-01 00:00:00 UTC","m":10.0}\n'
+        '{"n":"%s","t":"2026-01-01 00:10:00 UTC","m":null}\n' % (NODE, NODE),
+        encoding="utf-8",
+    )
+    entries = make_journal(tmp_path).replay()[NODE]
+    assert entries[0] == ("2026-01-01 00:00:00 UTC", {"post": 1.0, "confirm": 9.0, "total": 10.0}, STATUS_OK)
+    assert entries[1] == ("2026-01-01 00:10:00 UTC", None, STATUS_ERROR)
+
+
+def test_write_all_replaces_pending_and_existing(tmp_path):
+    journal = make_journal(tmp_path, batch_size=100, flush_interval=3600)
+    journal.append(NODE, "2026-01-01 00:00:00 UTC", SAMPLE)
+    journal.write_all({NODE: [("2026-01-02 00:00:00 UTC", SAMPLE, STATUS_OK)]})
+    journal.flush()
+    assert make_journal(tmp_path).replay() == {NODE: [("2026-01-02 00:00:00 UTC", SAMPLE, STATUS_OK)]}
+
+
+def test_sqlite_store_replays_window_and_compacts(tmp_path):
+    store = SQLiteMeasurementStore(str(tmp_path / "measurements.db"), batch_size=100)
+    store.append(NODE, "2026-01-01 00:00:00 UTC", SAMPLE)
+    store.append(NODE, "2026-01-03 00:00:00 UTC", None, STATUS_TIMEOUT)
+    store.append("https://other.example", "2026-01-04 00:00:00 UTC", SAMPLE)
+    assert store.replay(since=datetime.datetime(2026, 1, 2)) == {
+        NODE: [("2026-01-03 00:00:00 UTC", None, STATUS_TIMEOUT)],
+        "https://other.example": [("2026-01-04 00:00:00 UTC", SAMPLE, STATUS_OK)],
+    }
+    assert store.compact(datetime.datetime(2026, 1, 2)) == 1
+    assert [entry[0] for entry in store.replay()[NODE]] == ["2026-01-03 00:00:00 UTC"]
+    store.close()
+
+
+def test_sqlite_store_migrates_existing_journal(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.append(NODE, "2026-01-01 00:00:00 UTC", SAMPLE)
+    journal.flush()
+    store = open_measurement_store("sqlite", journal.path, str(tmp_path / "measurements.db"))
+    assert store.replay() == {NODE: [("2026-01-01 00:00:00 UTC", SAMPLE, STATUS_OK)]}
+    store.close()
@@ -0,0 +1,109 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import onchain_data
+from measurement_parser import measurement_extra_data
+from onchain_data import CommentCache, MeasurementDataset
+from rollups import RollupStore
+
+NODE = "https://node.example"
+POST = "daily"
+TAG = "#desomonitormeasurement"
+T0 = 1_700_006_400  # 2023-11-15 00:00 UTC
+
+
+def comment(i, total=1.0):
+    return {"PostHashHex": f"c{i}", "Body": TAG,
+            "PostExtraData": measurement_extra_data(NODE, T0 + i * 60, total / 4, total * 3 / 4, 0.1, total)}
+
+
+class GrowingThread:
+    """get-single-post pages of a newest-first thread; `grow` {request number: comments} posts replies between requests."""
+
+    def __init__(self, comments, grow=None):
+        self.newest_first = list(reversed(comments))
+        self.grow = grow or {}
+        self.requests = 0
+
+    def fetch(self, client, post_hash, offset, limit):
+        page = self.newest_first[offset:offset + limit]
+        self.requests += 1
+        for c in self.grow.pop(self.requests, []):
+            self.newest_first.insert(0, c)
+        return page
+
+
+def test_sync_does_not_double_count_comments_shifted_between_pages(monkeypatch):
+    thread = GrowingThread([comment(i) for i in range(3)])
+    monkeypatch.setattr(onchain_data, "fetch_comment_page", thread.fetch)
+    cache = CommentCache()
+    cache.sync(None, POST, TAG, page_size=2)
+    rollups = cache.rollups(POST)
+    assert rollups.merged(NODE).count == 3
+
+    # Two replies land, then a third between the head scan's first and second page,
+    # shifting c4 from the first page into the second
+    thread.newest_first[:0] = [comment(4), comment(3)]
+    thread.grow = {thread.requests + 1: [comment(5)]}
+    cache.sync(None, POST, TAG, page_size=2)
+    assert sorted(cache.posts[POST]["comments"]) == [f"c{i}" for i in range(5)]
+    assert rollups.merged(NODE).count == 5
+    assert rollups.merged(NODE).fields["total"].count == 5
+
+    cache.sync(None, POST, TAG, page_size=2)
+    assert len(cache.records(POST)) == 6
+    assert rollups.merged(NODE).count == 6
+
+
+def test_add_skips_comments_already_stored():
+    cache = CommentCache()
+    cache.entry(POST)
+    rollups = cache.rollups(POST)
+    cache._add(POST, [comment(1), comment(1)], TAG)
+    cache._add(POST, [comment(1, total=9.0)], TAG)
+    assert rollups.merged(NODE).count == 1
+    assert cache.records(POST)[0][4] == 1.0
+
+
+def window_dataset(records, cutoff_epoch, graph_days=2, rollups=None):
+    """MeasurementDataset the way fetch_measurement_dataset builds it from cached `records`."""
+    if rollups is None:
+        rollups = RollupStore()
+        for node, ts, post, confirm, total in records:
+            rollups.add(node, ts, {"post": post, "confirm": confirm, "total": total})
+    window = RollupStore()
+    window.merge(rollups, since=cutoff_epoch)
+    cutoff = datetime.datetime.utcfromtimestamp(cutoff_epoch)
+    return MeasurementDataset.from_records([NODE], graph_days, cutoff,
+                                           [r for r in records if r[1] >= cutoff_epoch], rollups=window)
+
+
+def test_quantiles_cover_exactly_the_window_when_the_cutoff_is_mid_day():
+    # Slow samples early on the first day, all before a cutoff at 12:00 that day
+    records = [(NODE, T0 + i * 600, 0.1, 90.0, 90.1) for i in range(36)]
+    records += [(NODE, T0 + 43200 + i * 600, 0.1, 1.0 + i % 5, 1.1 + i % 5) for i in range(2 * 144)]
+    dataset = window_dataset(records, cutoff_epoch=T0 + 43200)
+    window = [r for r in records if r[1] >= T0 + 43200]
+    assert dataset.sketches[NODE]["total"].count == len(window)
+    assert dataset.quantile(NODE, "total", 1.0) == pytest.approx(5.1, rel=0.01)
+    raw = np.array([r[4] for r in window])
+    for q in (0.5, 0.9, 0.99):
+        assert dataset.quantile(NODE, "total", q) == pytest.approx(np.quantile(raw, q, method="lower"), rel=0.01)
+    # Bucketed charts only see whole buckets inside the window too
+    assert min(dataset.rollups.tables["hour"][NODE]) == T0 + 43200
+    assert min(dataset.rollups.tables["day"][NODE]) == T0 + 86400
+
+
+def test_digest_covers_the_sketches():
+    records = [(NODE, T0 + 86400 + i * 600, 0.1, 1.0, 1.1) for i in range(10)]
+    dataset = window_dataset(records, cutoff_epoch=T0)
+    # Same raw samples, but rollups with an extra sample: quantiles and bucketed charts differ
+    rollups = RollupStore()
+    for node, ts, post, confirm, total in records + [(NODE, T0 + 86400, 0.1, 50.0, 50.1)]:
+        rollups.add(node, ts, {"post": post, "confirm": confirm, "total": total})
+    other = window_dataset(records, cutoff_epoch=T0, rollups=rollups)
+    assert dataset.quantile(NODE, "total", 1.0) != other.quantile(NODE, "total", 1.0)
+    assert dataset.digest() != other.digest()
+    assert dataset.digest() == window_dataset(records, cutoff_epoch=T0).digest()
@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pytest
+
+from quantile_sketch import DDSketch
+
+QUANTILES = (0.0, 0.1, 0.5, 0.9, 0.99, 0.999, 1.0)
+
+
+def latencies(seed, n=5000):
+    # Heavy-tailed like real confirm times: mostly a few seconds, some minutes-long outliers
+    return np.random.default_rng(seed).lognormal(mean=1.0, sigma=0.8, size=n)
+
+
+def sketch_of(values, **kwargs):
+    sketch = DDSketch(**kwargs)
+    for value in values:
+        sketch.add(float(value))
+    return sketch
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantiles_are_within_the_relative_accuracy(accuracy):
+    values = latencies(1)
+    sketch = sketch_of(values, relative_accuracy=accuracy)
+    for q in QUANTILES:
+        expected = np.quantile(values, q, method="lower")
+        assert abs(sketch.quantile(q) - expected) <= accuracy * expected
+    assert sketch.count == len(values)
+    assert sketch.min == values.min() and sketch.max == values.max()
+    assert sketch.mean == pytest.approx(values.mean())
+
+
+def test_merge_equals_one_sketch_of_all_samples():
+    a, b = latencies(2), latencies(3, n=1000)
+    merged = sketch_of(a).merge(sketch_of(b))
+    combined = sketch_of(np.concatenate([a, b]))
+    assert merged.bins == combined.bins
+    assert merged.summary() == combined.summary()
+    assert merged.sum == pytest.approx(combined.sum)
+
+
+def test_merge_rejects_a_different_accuracy():
+    with pytest.raises(ValueError):
+        DDSketch(0.01).merge(DDSketch(0.02))
+
+
+def test_zero_and_empty():
+    assert DDSketch().quantile(0.5) is None
+    assert DDSketch().summary() == {"count": 0, "p50": None, "p90": None, "p99": None, "max": None}
+    sketch = sketch_of([0.0, 0.0, 0.0, 2.0])
+    assert sketch.zero_count == 3
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(2.0, rel=0.01)
+
+
+def test_collapse_keeps_bins_bounded_and_the_tail_accurate():
+    values = np.geomspace(1e-3, 1e3, 20000)
+    sketch = sketch_of(values, max_bins=100)
+    assert len(sketch.bins) <= 100
+    assert sketch.count == len(values)
+    for q in (0.9, 0.99, 1.0):
+        expected = np.quantile(values, q, method="lower")
+        assert abs(sketch.quantile(q) - expected) <= 0.01 * expected
+
+
+def test_dict_round_trip_through_json():
+    sketch = sketch_of(latencies(4))
+    restored = DDSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.bins == sketch.bins
+    assert restored.summary() == sketch.summary()
+    assert (restored.min, restored.max, restored.mean) == (sketch.min, sketch.max, sketch.mean)
+    empty = DDSketch.from_dict(json.loads(json.dumps(DDSketch().to_dict())))
+    assert empty.count == 0 and empty.quantile(0.5) is None
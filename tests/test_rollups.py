@@ -0,0 +1,153 @@
+import threading
+
+import numpy as np
+import pytest
+
+from measurement_store import STATUS_ERROR, STATUS_TIMEOUT
+from rollups import RollupStore, bucket_start, pick_resolution
+
+DAY = 86400
+T0 = 1_700_006_400  # 2023-11-15 00:00 UTC
+
+
+def sample(total):
+    return {"post": total / 4, "confirm": total * 3 / 4, "total": total}
+
+
+def test_add_fills_hourly_and_daily_buckets():
+    store = RollupStore()
+    store.add("a", T0 + 10, sample(2.0))
+    store.add("a", T0 + 3600 + 10, sample(4.0))
+    store.add("a", T0 + 3600 + 20, None, STATUS_TIMEOUT)
+    store.add("a", T0 + 3600 + 30, None, STATUS_ERROR)
+    assert sorted(store.tables["hour"]["a"]) == [T0, T0 + 3600]
+    assert list(store.tables["day"]["a"]) == [T0]
+    day = store.tables["day"]["a"][T0]
+    assert (day.count, day.timeouts, day.errors) == (4, 1, 1)
+    summary = day.summary("total")
+    assert summary["count"] == 2 and summary["probes"] == 4 and summary["timeouts"] == 1
+    assert summary["mean"] == pytest.approx(3.0)
+    assert summary["max"] == 4.0
+    assert store.latest == {"a": T0 + 3600 + 30}
+
+
+def test_merged_and_columns_respect_the_window():
+    store = RollupStore()
+    for day in range(5):
+        store.add("a", T0 + day * DAY + 60, sample(1.0 + day))
+    merged = store.merged("a", "day", since=T0 + 2 * DAY + 5, until=T0 + 4 * DAY)
+    assert merged.count == 2
+    assert merged.summary("total")["max"] == 4.0
+    assert store.merged("a", "day", since=T0 + 10 * DAY) is None
+    assert store.merged("b") is None
+
+    columns = store.columns("a", "day", "total", since=T0 + DAY)
+    assert columns["ts"].tolist() == [T0 + day * DAY for day in range(1, 5)]
+    assert columns["mean"].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert columns["count"].dtype == np.int64
+    empty = store.columns("b", "hour", "total")
+    assert all(len(values) == 0 for values in empty.values())
+
+
+def test_columns_are_nan_for_buckets_without_values():
+    store = RollupStore()
+    store.add("a", T0, None, STATUS_TIMEOUT)
+    columns = store.columns("a", "hour", "total")
+    assert columns["timeouts"].tolist() == [1]
+    assert np.isnan(columns["mean"][0]) and np.isnan(columns["max"][0])
+
+
+def test_merge_combines_overlapping_buckets_without_sharing_them():
+    mine, other = RollupStore(), RollupStore()
+    mine.add("a", T0, sample(1.0))
+    other.add("a", T0 + 60, sample(3.0))
+    other.add("a", T0 - DAY, sample(9.0))
+    other.add("b", T0, sample(2.0))
+    mine.merge(other, since=T0)
+    assert mine.merged("a").count == 2
+    assert mine.merged("a").summary("total")["max"] == 3.0
+    assert mine.merged("b").count == 1
+    assert mine.merged("a", since=T0 - DAY, until=T0) is None
+    # Later samples in `other` must not leak into the merged store
+    other.add("a", T0 + 120, sample(5.0))
+    assert mine.merged("a").count == 2
+
+
+def test_merge_since_leaves_out_partial_buckets():
+    other = RollupStore()
+    other.add("a", T0 + 60, sample(9.0))  # before `since`, in the hour and day buckets holding it
+    other.add("a", T0 + 3 * 3600, sample(1.0))
+    other.add("a", T0 + DAY, sample(2.0))
+    mine = RollupStore()
+    mine.merge(other, since=T0 + 1800)
+    assert sorted(mine.tables["hour"]["a"]) == [T0 + 3 * 3600, T0 + DAY]
+    assert list(mine.tables["day"]["a"]) == [T0 + DAY]
+    assert mine.merged("a", "hour").summary("total")["max"] == 2.0
+
+
+def test_prune_applies_retention_and_drops_unknown_nodes():
+    store = RollupStore(retention={"hour": 2 * DAY, "day": 30 * DAY})
+    for day in range(40):
+        store.add("a", T0 + day * DAY, sample(1.0))
+    store.add("gone", T0, sample(1.0))
+    now = T0 + 40 * DAY
+    dropped = store.prune(now=now, nodes={"a"})
+    assert dropped > 0
+    assert min(store.tables["hour"]["a"]) >= bucket_start(now - 2 * DAY, "hour")
+    assert min(store.tables["day"]["a"]) == now - 30 * DAY
+    assert "gone" not in store.tables["day"] and "gone" not in store.latest
+    assert store.prune(now=now, nodes={"a"}) == 0
+
+
+def test_save_and_reload(tmp_path):
+    path = str(tmp_path / "measurement_rollups.json")
+    store = RollupStore(path)
+    store.add("a", T0, sample(2.0))
+    store.add("a", T0 + 5, None, STATUS_TIMEOUT)
+    store.save()
+    loaded = RollupStore(path)
+    assert loaded.latest == {"a": T0 + 5}
+    assert loaded.merged("a").summary("total") == store.merged("a").summary("total")
+    assert loaded.merged("a", "hour").timeouts == 1
+    # Nothing changed since the save, so the file is not rewritten
+    mtime = (tmp_path / "measurement_rollups.json").stat().st_mtime_ns
+    loaded.save()
+    assert (tmp_path / "measurement_rollups.json").stat().st_mtime_ns == mtime
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / "measurement_rollups.json"
+    path.write_text("{not json")
+    store = RollupStore(str(path))
+    assert store.merged("a") is None and store.latest == {}
+
+
+@pytest.mark.parametrize("days, expected", [(1, "raw"), (2, "raw"), (3, "hour"), (7, "hour"), (59, "hour"),
+                                            (60, "day"), (90, "day"), (365, "day")])
+def test_pick_resolution_is_the_coarsest_with_enough_points(days, expected):
+    assert pick_resolution(days * DAY, 60) == expected
+
+
+def test_reads_are_consistent_while_samples_arrive():
+    store = RollupStore()
+    done = threading.Event()
+
+    def writer():
+        i = 0
+        while not done.is_set():
+            store.add("a", T0 + i, sample(1.0))
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(200):
+            merged = store.merged("a", "hour")
+            copy = store.copy()
+            if merged is not None:
+                assert merged.count == merged.fields["total"].count
+            for rollup in copy.tables["hour"].get("a", {}).values():
+                assert rollup.count == rollup.fields["total"].count
+    finally:
+        done.set()
+        thread.join()